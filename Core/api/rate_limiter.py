@@ -0,0 +1,218 @@
+# Core/api/rate_limiter.py
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from Feedback.processors.pipeline import Result
+
+
+# ============================================================
+# 🪣 TOKEN BUCKET (anahtar başına: örn. supplier_id)
+# ============================================================
+# Her AsyncWorker ayrı bir event loop açtığı için kova durumu asyncio.Lock
+# yerine threading.Lock ile korunur; bekleme ise asyncio.sleep ile yapılır.
+# Böylece aynı supplier için farklı worker'lardan gelen istekler de aynı
+# limiti paylaşır.
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class _Bucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+        # istatistikler
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def try_take(self, now: float) -> float:
+        """
+        Token alınabildiyse 0 döner, aksi halde beklenmesi gereken süreyi (sn) döner.
+        """
+        if self.blocked_until > now:
+            return self.blocked_until - now
+
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimitScheduler:
+    """
+    Anahtar (supplier_id) başına token-bucket ile istekleri sıraya koyar,
+    429 / 5xx cevaplarında Retry-After'a uyarak jitter'lı backoff ile tekrar dener.
+
+    Kullanım:
+        res = await scheduler.run(supplier_id, lambda: async_make_request(...))
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float,
+        capacity: float,
+        max_retries: int = 4,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 30.0,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+
+    # --------------------------------------------------------
+
+    def _bucket(self, key: str) -> _Bucket:
+        b = self._buckets.get(key)
+        if b is None:
+            b = _Bucket(self.rate, self.capacity)
+            self._buckets[key] = b
+        return b
+
+    async def acquire(self, key: Any) -> float:
+        """
+        Anahtar için bir token bekler. Toplam bekleme süresini (sn) döner.
+        """
+        key = str(key)
+        started = time.monotonic()
+
+        with self._lock:
+            b = self._bucket(key)
+            b.queue_depth += 1
+            b.max_queue_depth = max(b.max_queue_depth, b.queue_depth)
+
+        try:
+            while True:
+                with self._lock:
+                    wait = b.try_take(time.monotonic())
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+        finally:
+            waited = time.monotonic() - started
+            with self._lock:
+                b.queue_depth -= 1
+                b.requests += 1
+                b.total_wait += waited
+                b.max_wait = max(b.max_wait, waited)
+
+        return waited
+
+    def block(self, key: Any, seconds: float) -> None:
+        """
+        Sunucu throttle ettiğinde (429) bu anahtar için tüm istekleri durdurur.
+        """
+        with self._lock:
+            b = self._bucket(str(key))
+            b.blocked_until = max(b.blocked_until, time.monotonic() + seconds)
+            b.tokens = 0.0
+
+    # --------------------------------------------------------
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            dt = parsedate_to_datetime(value)
+            return max(0.0, dt.timestamp() - time.time())
+        except Exception:
+            return None
+
+    def _backoff(self, attempt: int) -> float:
+        # full jitter: [0, min(cap, base * 2^attempt)]
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _is_retryable(res: Result) -> bool:
+        status = (res.data or {}).get("status_code")
+        if status in RETRYABLE_STATUS:
+            return True
+        return isinstance(res.error, httpx.TransportError)
+
+    async def run(self, key: Any, request_factory: Callable[[], Awaitable[Result]]) -> Result:
+        """
+        request_factory her denemede yeni bir coroutine üretmelidir.
+        """
+        res: Optional[Result] = None
+
+        for attempt in range(self.max_retries + 1):
+            await self.acquire(key)
+            res = await request_factory()
+
+            if res.success or not self._is_retryable(res) or attempt >= self.max_retries:
+                return res
+
+            delay = self._backoff(attempt)
+            data = res.data or {}
+            if data.get("status_code") == 429:
+                retry_after = self._parse_retry_after(data.get("retry_after"))
+                with self._lock:
+                    self._bucket(str(key)).throttled += 1
+                if retry_after is not None:
+                    delay = retry_after + random.uniform(0, self.backoff_base)
+                self.block(key, delay)
+
+            with self._lock:
+                self._bucket(str(key)).retries += 1
+
+            await asyncio.sleep(delay)
+
+        return res
+
+    # --------------------------------------------------------
+
+    def stats(self, key: Any = None) -> dict:
+        """
+        Kuyruk derinliği ve bekleme süresi istatistikleri.
+        key verilmezse tüm anahtarlar döner.
+        """
+        with self._lock:
+            keys = [str(key)] if key is not None else list(self._buckets)
+            out = {}
+            for k in keys:
+                b = self._buckets.get(k)
+                if b is None:
+                    continue
+                out[k] = {
+                    "requests": b.requests,
+                    "retries": b.retries,
+                    "throttled": b.throttled,
+                    "queue_depth": b.queue_depth,
+                    "max_queue_depth": b.max_queue_depth,
+                    "avg_wait": (b.total_wait / b.requests) if b.requests else 0.0,
+                    "max_wait": b.max_wait,
+                }
+            return out
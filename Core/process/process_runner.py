@@ -6,7 +6,7 @@ import sys
 import json
 from typing import Dict, Any, Optional
 
-from PyQt6.QtCore import QProcess, QObject, pyqtSignal, QProcessEnvironment
+from PyQt6.QtCore import QProcess, QObject, pyqtSignal, QProcessEnvironment, QCoreApplication, QTimer
 from Orders.signals.signals import order_signals
 
 def _is_frozen() -> bool:
@@ -16,10 +16,62 @@ def _is_frozen() -> bool:
 # Projenin kök dizini (Core/utils/ içinden 3 geri çıkıyoruz)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 
+# Tek chunk'ta worker'a gönderilecek en fazla sipariş (OrderData) sayısı
+DB_SAVE_CHUNK_ORDERS = 500
 
-class DBSaveProcess(QObject):
+
+def _encode_frame(obj: dict) -> bytes:
+    """
+    Uzunluk önekli NDJSON çerçevesi: b"<len>\\n" + JSON + b"\\n"
+    (db_save_worker.encode_frame ile aynı format)
+    """
+    body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    return str(len(body)).encode("ascii") + b"\n" + body + b"\n"
+
+
+def iter_payload_chunks(payload: Dict[str, Any], chunk_orders: int = DB_SAVE_CHUNK_ORDERS):
+    """
+    {"order_data_list", "order_item_list"} payload'ını chunk'lara böler.
+    Item'lar kendi siparişleriyle (orderNumber, api_account_id) aynı chunk'ta kalır;
+    save_orders_to_db header eşlemesini chunk içinde yaptığı için bu şarttır.
+    """
+    order_data_list = payload.get("order_data_list", []) or []
+    order_item_list = payload.get("order_item_list", []) or []
+
+    if len(order_data_list) <= chunk_orders:
+        yield {"order_data_list": order_data_list, "order_item_list": order_item_list}
+        return
+
+    items_by_key: Dict[tuple, list] = {}
+    for oi in order_item_list:
+        items_by_key.setdefault((oi.get("orderNumber"), oi.get("api_account_id")), []).append(oi)
+
+    for i in range(0, len(order_data_list), chunk_orders):
+        chunk_orders_list = order_data_list[i:i + chunk_orders]
+        chunk_items: list = []
+        for od in chunk_orders_list:
+            chunk_items.extend(items_by_key.pop((od.get("orderNumber"), od.get("api_account_id")), []))
+        yield {"order_data_list": chunk_orders_list, "order_item_list": chunk_items}
+
+    # siparişi payload'da olmayan item'lar (teorik) → son chunk
+    leftovers = [oi for items in items_by_key.values() for oi in items]
+    if leftovers:
+        yield {"order_data_list": [], "order_item_list": leftovers}
+
+
+class DBSaveWorkerClient(QObject):
     """
-    DB save işini ayrı process'te çalıştırır.
+    Kalıcı db_save_worker process'ini yönetir (process başına tek instance).
+
+    - İlk istekte lazy başlatılır, sonraki kayıtlar aynı process'e gider
+      (her kayıtta yeni interpreter + import maliyeti yok).
+    - Protokol: stdin/stdout üzerinden uzunluk önekli NDJSON çerçeveleri.
+        istek : {"id": int, "op": "save", "payload": {...chunk...}}
+        cevap : {"id": int, "success": bool, "message": str, "data": {...}}
+      Her chunk worker'da ayrı commit edilir; büyük kayıtlar DBSaveStream ile
+      parça parça gönderilir, hiçbir tarafta tek dev JSON string oluşmaz.
+    - Process çökerse yeniden başlatılır ve bekleyen istekler bir kez tekrar
+      gönderilir; ikinci çökmede hata ile sonlanır.
 
     DEV:
       python Orders/processors/db_save_worker.py
@@ -29,25 +81,34 @@ class DBSaveProcess(QObject):
       (GUI açmadan worker mode çalışacak şekilde main router şart!)
     """
 
-    finished = pyqtSignal(dict)   # {"success": bool, "message": str, "data": {...}}
-    error = pyqtSignal(str)       # STDERR logları
+    response = pyqtSignal(int, dict)   # (request_id, {"success", "message", "data"})
+    error = pyqtSignal(str)            # STDERR logları
 
-    def __init__(self, payload: Dict[str, Any], parent: Optional[QObject] = None) -> None:
+    _instance: Optional["DBSaveWorkerClient"] = None
+
+    @classmethod
+    def instance(cls) -> "DBSaveWorkerClient":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
         super().__init__(parent)
-        self.payload = payload
-        self.process = QProcess(self)
+        self.process: Optional[QProcess] = None
 
-        self._stdout_buf: bytes = b""
-        self._stderr_buf: bytes = b""
+        self._next_id = 0
+        self._pending: Dict[int, Dict[str, Any]] = {}  # id -> {"frame": bytes, "retried": bool}
+        self._stdout_buf = bytearray()
+        self._stopping = False
 
-        self.process.readyReadStandardOutput.connect(self._on_stdout)
-        self.process.readyReadStandardError.connect(self._on_stderr)
-        self.process.finished.connect(self._on_finished)
-        self.process.errorOccurred.connect(self._on_process_error)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
 
     # -------------------------------------------------
 
-    def _python_executable_dev(self) -> str:
+    @staticmethod
+    def _python_executable_dev() -> str:
         exe = sys.executable
 
         if "venv" in exe.replace("\\", "/"):
@@ -63,12 +124,16 @@ class DBSaveProcess(QObject):
 
         return exe
 
-    # -------------------------------------------------
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.state() != QProcess.ProcessState.NotRunning
 
-    def start(self) -> None:
+    def _ensure_started(self) -> Optional[str]:
         """
-        Process'i başlatır ve payload'ı JSON olarak STDIN'den gönderir.
+        Process çalışmıyorsa başlatır. Hata varsa mesajı döner.
         """
+        if self.is_running():
+            return None
+
         env = QProcessEnvironment.systemEnvironment()
         env.insert("PYTHONIOENCODING", "utf-8")
         env.insert("PYTHONUTF8", "1")
@@ -81,8 +146,6 @@ class DBSaveProcess(QObject):
             else:
                 env.insert("PYTHONPATH", BASE_DIR)
 
-        self.process.setProcessEnvironment(env)
-
         # --- Komut seçimi ---
         if _is_frozen():
             program = sys.executable  # OrderScout.exe
@@ -90,42 +153,136 @@ class DBSaveProcess(QObject):
         else:
             worker_path = os.path.join(BASE_DIR, "Orders", "processors", "db_save_worker.py")
             if not os.path.exists(worker_path):
-                msg = f"db_save_worker bulunamadı: {worker_path}"
-                self.error.emit(msg)
-                self.finished.emit({"success": False, "message": msg, "data": None})
-                return
+                return f"db_save_worker bulunamadı: {worker_path}"
 
             program = self._python_executable_dev()
             args = [worker_path]
 
-        self.process.start(program, args)
+        self._stdout_buf = bytearray()
+        self._stopping = False
 
-        if not self.process.waitForStarted(4000):
-            msg = f"db_save_worker process'i başlatılamadı. program={program} args={args}"
-            self.error.emit(msg)
-            self.finished.emit({"success": False, "message": msg, "data": None})
-            return
+        proc = QProcess(self)
+        proc.setProcessEnvironment(env)
+        proc.readyReadStandardOutput.connect(self._on_stdout)
+        proc.readyReadStandardError.connect(self._on_stderr)
+        proc.finished.connect(self._on_finished)
+        proc.errorOccurred.connect(self._on_process_error)
+        self.process = proc
+
+        proc.start(program, args)
+
+        if not proc.waitForStarted(4000):
+            self.process = None
+            proc.deleteLater()
+            return f"db_save_worker process'i başlatılamadı. program={program} args={args}"
+
+        return None
+
+    # -------------------------------------------------
+
+    def submit(self, payload: Dict[str, Any]) -> int:
+        """
+        Kayıt isteğini kuyruğa yazar, request_id döner.
+        Sonuç response(request_id, dict) sinyali ile gelir.
+        """
+        self._next_id += 1
+        req_id = self._next_id
+
+        err = self._ensure_started()
+        if err:
+            self.error.emit(err)
+            self._respond_later(req_id, {"success": False, "message": err, "data": None})
+            return req_id
 
-        # Payload'ı JSON olarak gönder
         try:
-            payload_json = json.dumps(self.payload, ensure_ascii=False)
+            frame = _encode_frame({"id": req_id, "op": "save", "payload": payload})
         except Exception as e:
             msg = f"Payload JSON'a çevrilemedi: {e}"
             self.error.emit(msg)
-            self.finished.emit({"success": False, "message": msg, "data": None})
-            return
+            self._respond_later(req_id, {"success": False, "message": msg, "data": None})
+            return req_id
+
+        self._pending[req_id] = {"frame": frame, "retried": False}
+        self.process.write(frame)
+        return req_id
 
-        self.process.write(payload_json.encode("utf-8"))
+    def _respond_later(self, req_id: int, result: dict) -> None:
+        # Çağıran taraf sinyale bağlanmadan önce emit etmemek için event loop'a bırak
+        QTimer.singleShot(0, lambda: self.response.emit(req_id, result))
+
+    def shutdown(self, timeout_ms: int = 3000) -> None:
+        """
+        stdin'i kapatır (worker EOF görüp çıkar), gerekirse öldürür.
+        """
+        if not self.is_running():
+            return
+        self._stopping = True
         self.process.closeWriteChannel()
+        if not self.process.waitForFinished(timeout_ms):
+            self.process.kill()
+            self.process.waitForFinished(1000)
 
     # -------------------------------------------------
 
     def _on_stdout(self) -> None:
-        self._stdout_buf += self.process.readAllStandardOutput().data()
+        proc = self.sender()
+        if proc is None:
+            return
+        buf = self._stdout_buf
+        buf += proc.readAllStandardOutput().data()
+
+        pos = 0
+        while True:
+            nl = buf.find(b"\n", pos)
+            if nl < 0:
+                break
+
+            header = bytes(buf[pos:nl]).strip()
+            if not header:
+                pos = nl + 1
+                continue
+
+            if not header.isdigit():
+                # çerçeve dışı satır (ör. worker'dan kaçan print) → log
+                self.error.emit(f"db_save_worker çerçeve dışı çıktı: {header[:200]!r}")
+                pos = nl + 1
+                continue
+
+            size = int(header)
+            end = nl + 1 + size
+            if len(buf) < end + 1:
+                break  # gövde henüz tamamlanmadı
+
+            self._handle_frame(bytes(buf[nl + 1:end]))
+            pos = end + 1
+
+        if pos:
+            del buf[:pos]
+
+    def _handle_frame(self, body: bytes) -> None:
+        try:
+            result = json.loads(body.decode("utf-8", errors="ignore"))
+        except Exception:
+            self.error.emit(f"db_save_worker geçersiz çıktı: {body[:200]!r}")
+            return
+
+        if not isinstance(result, dict):
+            self.error.emit("db_save_worker geçersiz çıktı formatı.")
+            return
+
+        req_id = result.pop("id", None)
+        if req_id not in self._pending:
+            self.error.emit(f"db_save_worker bilinmeyen id: {req_id}")
+            return
+
+        self._pending.pop(req_id, None)
+        self.response.emit(req_id, result)
 
     def _on_stderr(self) -> None:
-        chunk = self.process.readAllStandardError().data()
-        self._stderr_buf += chunk
+        proc = self.sender()
+        if proc is None:
+            return
+        chunk = proc.readAllStandardError().data()
         try:
             text = chunk.decode("utf-8", errors="ignore")
         except Exception:
@@ -142,67 +299,191 @@ class DBSaveProcess(QObject):
             pass
         self.error.emit(msg)
 
+    def _on_finished(self, *_args) -> None:
+        """
+        Process kapandı (normal çıkış veya çökme).
+        Bekleyen istekler varsa process yeniden başlatılıp bir kez tekrar gönderilir.
+        """
+        proc = self.sender()
+        if proc is not None and proc is not self.process:
+            return  # eski (zaten değiştirilmiş) process
+        if proc is not None:
+            self.process = None
+            proc.deleteLater()
+
+        if not self._pending or self._stopping:
+            self._fail_pending("db_save_worker çıktı üretmeden kapandı.")
+            return
+
+        self.error.emit("db_save_worker beklenmedik şekilde kapandı, yeniden başlatılıyor.")
+
+        retry = {k: v for k, v in self._pending.items() if not v["retried"]}
+        give_up = [k for k in self._pending if k not in retry]
+        for req_id in give_up:
+            self._fail_one(req_id, "db_save_worker bu istekte tekrar çöktü.")
+
+        if not retry:
+            return
+
+        err = self._ensure_started()
+        if err:
+            self.error.emit(err)
+            self._fail_pending(err)
+            return
+
+        for entry in retry.values():
+            entry["retried"] = True
+            self.process.write(entry["frame"])
+
+    def _fail_one(self, req_id: int, msg: str) -> None:
+        self._pending.pop(req_id, None)
+        self.response.emit(req_id, {"success": False, "message": msg, "data": None})
+
+    def _fail_pending(self, msg: str) -> None:
+        for req_id in list(self._pending):
+            self._fail_one(req_id, msg)
+
+
+class DBSaveStream(QObject):
+    """
+    Siparişleri chunk chunk kalıcı worker'a gönderir.
+    API sayfaları normalize edildikçe send() çağrılır; worker her chunk'ı
+    ayrı commit eder ve sayıları geri bildirir. close() sonrası tüm chunk'lar
+    cevaplanınca finished ile toplam sonuç döner.
+
+        progress(dict) : {"chunks_done", "chunks_sent", "counts": {...}} (kümülatif)
+        finished(dict) : {"success": bool, "message": str, "data": {"changed", "counts", "chunks", "changed_keys"}}
+
+    Değişen siparişler orders_changed ile anahtarlarıyla birlikte tek sefer yayınlanır.
+    """
+
+    progress = pyqtSignal(dict)
+    finished = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.client = DBSaveWorkerClient.instance()
+
+        self._pending_ids: set[int] = set()
+        self._closed = False
+        self._done = False
+        self._chunks_sent = 0
+        self._chunks_done = 0
+        self._changed = False
+        self._changed_keys: set[tuple] = set()
+        self._counts: Dict[str, int] = {}
+        self._failure: Optional[str] = None
+
+        self.client.response.connect(self._on_response)
+        self.client.error.connect(self.error)
+
     # -------------------------------------------------
 
-    @staticmethod
-    def _should_emit_orders_changed(result: dict) -> bool:
+    def send(self, payload: Dict[str, Any]) -> None:
         """
-        save_orders_to_db dönüşüne göre sadece DB gerçekten değiştiyse True.
-        Beklenen format:
-          {"success": True, "data": {"changed": bool, "counts": {...}}}
+        Bir payload'ı (gerekirse bölerek) worker'a gönderir. Boş payload atlanır.
         """
-        if result.get("success") is not True:
-            return False
-        data = result.get("data")
-        if not isinstance(data, dict):
-            return False
-        return bool(data.get("changed", False))
-
-    def _emit_orders_changed(self) -> None:
+        if self._closed:
+            return
+        for chunk in iter_payload_chunks(payload):
+            if not chunk["order_data_list"] and not chunk["order_item_list"]:
+                continue
+            self._chunks_sent += 1
+            self._pending_ids.add(self.client.submit(chunk))
+
+    def close(self) -> None:
         """
-        UI process içinde orders_changed emit eder.
+        Başka chunk gelmeyecek. Bekleyen chunk yoksa hemen biter.
         """
-        try:
+        self._closed = True
+        self._maybe_finish()
 
-            order_signals.orders_changed.emit()
-        except Exception:
-            pass
+    # -------------------------------------------------
 
-    def _on_finished(self) -> None:
-        """
-        Process tamamen bittiğinde STDOUT JSON parse edilir.
-        Sadece son dolu satırı JSON kabul eder.
-        """
-        if not self._stdout_buf:
-            msg = "db_save_worker çıktı üretmedi."
-            self.finished.emit({"success": False, "message": msg, "data": None})
+    def _on_response(self, req_id: int, result: dict) -> None:
+        if req_id not in self._pending_ids:
             return
+        self._pending_ids.discard(req_id)
+        self._chunks_done += 1
+
+        if result.get("success") is True:
+            data = result.get("data") if isinstance(result.get("data"), dict) else {}
+            if data.get("changed"):
+                self._changed = True
+            for no, acc in data.get("changed_keys") or []:
+                self._changed_keys.add((str(no), acc))
+            for k, v in (data.get("counts") or {}).items():
+                self._counts[k] = self._counts.get(k, 0) + int(v or 0)
+        elif self._failure is None:
+            self._failure = result.get("message") or "DB kayıt hatası."
+
+        self.progress.emit({
+            "chunks_done": self._chunks_done,
+            "chunks_sent": self._chunks_sent,
+            "counts": dict(self._counts),
+        })
+
+        self._maybe_finish()
+
+    def _maybe_finish(self) -> None:
+        if self._done or not self._closed or self._pending_ids:
+            return
+        self._done = True
 
         try:
-            out_str = self._stdout_buf.decode("utf-8", errors="ignore")
-            lines = [line for line in out_str.splitlines() if line.strip()]
-            if not lines:
-                msg = "db_save_worker: Boş satırlardan başka çıktı yok."
-                self.finished.emit({"success": False, "message": msg, "data": None})
-                return
-
-            json_str = lines[-1]
-            result = json.loads(json_str)
-
-            if not isinstance(result, dict):
-                result = {
-                    "success": False,
-                    "message": "db_save_worker geçersiz çıktı formatı.",
-                    "data": json_str,
-                }
-
-        except Exception as e:
-            msg = f"db_save_worker output parse hatası: {e}"
-            self.finished.emit({"success": False, "message": msg, "data": None})
-            return
+            self.client.response.disconnect(self._on_response)
+            self.client.error.disconnect(self.error)
+        except Exception:
+            pass
 
-        # ✅ SADECE DB değiştiyse tetikle (performans)
-        if self._should_emit_orders_changed(result):
-            self._emit_orders_changed()
+        changed_keys = [list(k) for k in sorted(self._changed_keys, key=lambda k: (k[1], k[0]))]
+        data = {
+            "changed": self._changed,
+            "counts": dict(self._counts),
+            "chunks": self._chunks_done,
+            "changed_keys": changed_keys,
+        }
+        if self._failure is not None:
+            result = {"success": False, "message": self._failure, "data": data}
+        else:
+            result = {
+                "success": True,
+                "message": "Siparişler başarıyla veritabanına kaydedildi.",
+                "data": data,
+            }
+
+        # ✅ SADECE DB değiştiyse tetikle (performans); boş liste = tam yenileme
+        if self._changed:
+            try:
+                order_signals.orders_changed.emit(changed_keys)
+            except Exception:
+                pass
 
         self.finished.emit(result)
+
+
+class DBSaveProcess(QObject):
+    """
+    Tek bir DB save işini kalıcı db_save_worker process'ine gönderir.
+    (Eski API korunur: DBSaveProcess(payload).start() → finished(dict))
+    Büyük payload'lar DBSaveStream ile chunk'lara bölünerek gönderilir.
+    """
+
+    finished = pyqtSignal(dict)   # {"success": bool, "message": str, "data": {...}}
+    error = pyqtSignal(str)       # STDERR logları
+
+    def __init__(self, payload: Dict[str, Any], parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.payload = payload
+        self.stream = DBSaveStream(self)
+        self.stream.finished.connect(self.finished)
+        self.stream.error.connect(self.error)
+
+    def start(self) -> None:
+        """
+        Payload'ı worker'a gönderir. Worker çalışmıyorsa başlatılır.
+        """
+        payload, self.payload = self.payload, None
+        self.stream.send(payload or {})
+        self.stream.close()
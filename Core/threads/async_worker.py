@@ -1,20 +1,24 @@
 from PyQt6.QtCore import QThread, pyqtSignal
 import asyncio
 from Feedback.processors.pipeline import Result, map_error_to_message
+from Core.utils.request_utils import close_async_clients
 
 
 class AsyncWorker(QThread):
     progress_changed = pyqtSignal(int, int)   # (current, total)
     result_ready = pyqtSignal(object)         # Result objesi
+    chunk_ready = pyqtSignal(object)          # ara veri parçası (emit_chunks=True ise)
     finished = pyqtSignal()                   # tamamlandı
 
-    def __init__(self, async_func, *args, parent=None, kwargs=None):
+    def __init__(self, async_func, *args, parent=None, kwargs=None, emit_chunks=False):
         super().__init__(parent)
         self.async_func = async_func
         self.args = args
         self.kwargs = kwargs or {}
+        self.emit_chunks = emit_chunks
 
     def run(self):
+        loop = None
         try:
             # Worker içinden progress emit edecek helper
             def progress_callback(current, total):
@@ -24,6 +28,10 @@ class AsyncWorker(QThread):
             # (Dışarıda lambda ile UI güncellemek yerine, sinyal kullansın)
             self.kwargs["progress_callback"] = progress_callback
 
+            # Ara sonuçlar (örn. normalize edilmiş API sayfaları) UI thread'e sinyalle gider
+            if self.emit_chunks:
+                self.kwargs["chunk_callback"] = self.chunk_ready.emit
+
             # Yeni event loop başlat
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
@@ -43,6 +51,15 @@ class AsyncWorker(QThread):
             self.result_ready.emit(err)
 
         finally:
+            # Paylaşımlı HTTP client'ı kapat, sonra loop'u kapat
+            if loop is not None:
+                try:
+                    loop.run_until_complete(close_async_clients())
+                except Exception:
+                    pass
+                finally:
+                    asyncio.set_event_loop(None)
+                    loop.close()
             self.finished.emit()
 
 
@@ -0,0 +1,191 @@
+# Core/utils/migration_utils.py
+from __future__ import annotations
+
+import time
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from sqlalchemy import Connection
+
+from settings import DB_NAME
+from Core.utils.model_utils import get_engine
+from Feedback.processors.pipeline import Result, map_error_to_message
+
+
+# ============================================================
+# 🧱 VERSİYONLU MİGRASYONLAR
+# ============================================================
+# create_all sadece eksik TABLOLARI oluşturur; mevcut müşteri DB'lerine yeni
+# index / kolon taşımaz. Migration'lar sırayla (version) ve bir kez uygulanır,
+# uygulananlar schema_migrations tablosunda tutulur.
+# Her migration kendi transaction'ında çalışır ve idempotent yazılmalıdır
+# (IF NOT EXISTS / add_column kontrolü) → yarıda kalan bir açılış tekrar güvenli.
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+
+
+_MIGRATIONS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at INTEGER NOT NULL
+)
+"""
+
+
+# ------------------------------------------------------------
+# 🔧 DDL yardımcıları
+# ------------------------------------------------------------
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def create_index(name: str, table: str, columns: Iterable[str], unique: bool = False) -> Callable[[Connection], None]:
+    cols = ", ".join(_quote(c) for c in columns)
+    sql = (
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS "
+        f"{_quote(name)} ON {_quote(table)} ({cols})"
+    )
+
+    def _apply(conn: Connection) -> None:
+        conn.exec_driver_sql(sql)
+
+    return _apply
+
+
+def table_columns(conn: Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({_quote(table)})")}
+
+
+def add_column(table: str, column: str, ddl: str) -> Callable[[Connection], None]:
+    """
+    ddl: kolon tipi + kısıtlar, örn. "INTEGER" / "BOOLEAN NOT NULL DEFAULT 0"
+    """
+    def _apply(conn: Connection) -> None:
+        if column not in table_columns(conn, table):
+            conn.exec_driver_sql(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)} {ddl}")
+
+    return _apply
+
+
+def run_sql(*statements: str) -> Callable[[Connection], None]:
+    def _apply(conn: Connection) -> None:
+        for stmt in statements:
+            conn.exec_driver_sql(stmt)
+
+    return _apply
+
+
+# ------------------------------------------------------------
+# ▶️ Runner
+# ------------------------------------------------------------
+
+def applied_versions(conn: Connection) -> set[int]:
+    conn.exec_driver_sql(_MIGRATIONS_TABLE_SQL)
+    return {row[0] for row in conn.exec_driver_sql("SELECT version FROM schema_migrations")}
+
+
+def run_migrations(migrations: Iterable[Migration], db_name: str = DB_NAME) -> Result:
+    """
+    Uygulanmamış migration'ları version sırasıyla çalıştırır.
+    Result.data = {"applied": [version, ...]}
+    """
+    try:
+        engine = get_engine(db_name)
+        migrations = sorted(migrations, key=lambda m: m.version)
+
+        with engine.begin() as conn:
+            done = applied_versions(conn)
+
+        applied: list[int] = []
+        for m in migrations:
+            if m.version in done:
+                continue
+
+            started = time.perf_counter()
+            with engine.begin() as conn:
+                m.apply(conn)
+                conn.exec_driver_sql(
+                    "INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)",
+                    (m.version, m.name, int(time.time() * 1000)),
+                )
+            applied.append(m.version)
+            print(f"[migration] {m.version:04d} {m.name} ({time.perf_counter() - started:.3f}s)")
+
+        return Result.ok(
+            f"{len(applied)} migration uygulandı.",
+            close_dialog=False,
+            data={"applied": applied},
+        )
+
+    except Exception as e:
+        return Result.fail(map_error_to_message(e), error=e, close_dialog=False)
+
+
+def get_user_version(conn: Connection) -> int:
+    return int(conn.exec_driver_sql("PRAGMA user_version").scalar() or 0)
+
+
+def ensure_schema(
+    metadata,
+    migrations: Iterable[Migration],
+    db_name: str = DB_NAME,
+) -> Result:
+    """
+    Açılış şeması: PRAGMA user_version, en yüksek migration version'ına
+    eşitse hiçbir DDL çalışmaz (create_all'ın tablo reflection'ı dahil).
+    Değilse create_all + run_migrations, ardından damga yazılır.
+
+    ⚠️ Şema değişikliği (yeni tablo / index / kolon) = yeni Migration.
+    Sadece tablo eklense bile bir migration (gerekirse no-op) eklenmeli ki
+    damga değişsin ve create_all tekrar çalışsın.
+
+    Result.data = {"skipped": bool, "version": int, "applied": [...]}
+    """
+    try:
+        migrations = list(migrations)
+        target = max((m.version for m in migrations), default=0)
+
+        engine = get_engine(db_name)
+        with engine.connect() as conn:
+            current = get_user_version(conn)
+
+        if current == target:
+            return Result.ok(
+                "Şema güncel.",
+                close_dialog=False,
+                data={"skipped": True, "version": current, "applied": []},
+            )
+
+        metadata.create_all(engine)
+
+        res = run_migrations(migrations, db_name)
+        if not res.success:
+            return res
+
+        with engine.begin() as conn:
+            # PRAGMA bind parametre almaz; target int olduğu için güvenli
+            conn.exec_driver_sql(f"PRAGMA user_version = {int(target)}")
+
+        return Result.ok(
+            f"Şema {current} → {target} güncellendi.",
+            close_dialog=False,
+            data={"skipped": False, "version": target, "applied": res.data.get("applied", [])},
+        )
+
+    except Exception as e:
+        return Result.fail(map_error_to_message(e), error=e, close_dialog=False)
+
+
+def explain_query_plan(sql: str, params: Optional[tuple] = None, db_name: str = DB_NAME) -> list[str]:
+    """
+    Geliştirme yardımcısı: EXPLAIN QUERY PLAN satırlarını (detail) döner.
+    Örn. index kullanımını doğrulamak için: any("USING INDEX ix_..." in d for d in plan)
+    """
+    engine = get_engine(db_name)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", params or ()).all()
+    return [row[-1] for row in rows]
@@ -2,30 +2,66 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import (
     Type, Iterable, Callable, Optional, Any, Dict, Tuple
 )
 
-import pandas as pd
 from sqlmodel import SQLModel, Session, select
 from sqlmodel import create_engine
 
-from sqlalchemy import Engine, event, text
+from sqlalchemy import Connection, Engine, event, update, delete
 from sqlalchemy.exc import IntegrityError, CompileError
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.sql.elements import BindParameter, ClauseElement
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.sqlite.pysqlite import SQLiteDialect_pysqlite
 
 from settings import DB_NAME, DEFAULT_DATABASE_DIR
 from Feedback.processors.pipeline import Result, map_error_to_message
 
 
 # ============================================================
-# 🔌 ENGINE (STABLE / MULTI-PROCESS SAFE)
+# 🔌 ENGINE (WAL / POOLED / MULTI-PROCESS SAFE)
 # ============================================================
+# - WAL: UI'daki okuyucular (OrdersListWidget reload) db_save_worker yazarken
+#   bloklanmaz. WAL dosya seviyesinde kalıcıdır, aynı makinedeki process'ler
+#   arasında güvenlidir; çakışan yazarlar busy_timeout ile bekler.
+# - QueuePool: her Session yeni sqlite3 bağlantısı açmaz; PRAGMA'lar sadece
+#   bağlantı ilk açıldığında çalışır. Havuz process başına (pid) tutulur.
+
+SQLITE_POOL_SIZE = 5
+SQLITE_MAX_OVERFLOW = 5
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA foreign_keys=ON;",
+    "PRAGMA busy_timeout=10000;",
+    "PRAGMA cache_size=-65536;",        # ~64 MB sayfa cache (bağlantı başına)
+    "PRAGMA mmap_size=268435456;",      # 256 MB memory-mapped I/O
+)
 
 _ENGINE_CACHE: Dict[str, Tuple[int, Engine]] = {}
+_TMP_DIR_READY: Optional[int] = None  # hazırlayan pid
+
+
+def _prepare_sqlite_tmp_dir(db_dir: Path) -> None:
+    """
+    SQLite temp dizinini sabitle (Windows + multi-process için kritik).
+    Process başına bir kez.
+    """
+    global _TMP_DIR_READY
+    if _TMP_DIR_READY == os.getpid():
+        return
+
+    tmp_dir = db_dir / "_tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    os.environ["TMP"] = str(tmp_dir)
+    os.environ["TEMP"] = str(tmp_dir)
+    _TMP_DIR_READY = os.getpid()
 
 
 def get_engine(db_name: str) -> Engine:
@@ -35,17 +71,11 @@ def get_engine(db_name: str) -> Engine:
     if cached is not None and cached[0] == pid:
         return cached[1]
 
-    db_dir = Path(DEFAULT_DATABASE_DIR).resolve()
-    db_dir.mkdir(parents=True, exist_ok=True)
-
-    db_path = (db_dir / db_name).resolve()
-    db_url = f"sqlite:///{db_path.as_posix()}"
+    # DEFAULT_DATABASE_DIR settings import'unda mutlak yol olarak oluşturulur
+    db_dir = Path(DEFAULT_DATABASE_DIR)
+    db_url = f"sqlite:///{(db_dir / db_name).as_posix()}"
 
-    # SQLite temp dizinini sabitle (Windows + multi-process için kritik)
-    tmp_dir = db_dir / "_tmp"
-    tmp_dir.mkdir(parents=True, exist_ok=True)
-    os.environ["TMP"] = str(tmp_dir)
-    os.environ["TEMP"] = str(tmp_dir)
+    _prepare_sqlite_tmp_dir(db_dir)
 
     engine = create_engine(
         db_url,
@@ -54,28 +84,45 @@ def get_engine(db_name: str) -> Engine:
             "check_same_thread": False,
             "timeout": 30,
         },
-        poolclass=NullPool,
-        pool_pre_ping=True,
+        poolclass=QueuePool,
+        pool_size=SQLITE_POOL_SIZE,
+        max_overflow=SQLITE_MAX_OVERFLOW,
+        pool_timeout=30,
     )
 
     @event.listens_for(engine, "connect")
     def _set_sqlite_pragmas(dbapi_connection, _):
         cur = dbapi_connection.cursor()
-        cur.execute("PRAGMA journal_mode=DELETE;")
-        cur.execute("PRAGMA temp_store=MEMORY;")
-        cur.execute("PRAGMA synchronous=NORMAL;")
-        cur.execute("PRAGMA foreign_keys=ON;")
-        cur.execute("PRAGMA busy_timeout=10000;")
+        for pragma in SQLITE_PRAGMAS:
+            cur.execute(pragma)
         cur.close()
 
-    # bağlantı testi
-    with engine.connect() as conn:
-        conn.execute(text("SELECT 1"))
-
+    # bağlantı testi yok: ilk gerçek sorgu hatayı zaten yüzeye çıkarır
     _ENGINE_CACHE[db_name] = (pid, engine)
     return engine
 
 
+def dispose_engines(checkpoint: bool = True) -> None:
+    """
+    Process kapanırken çağrılır: WAL'ı ana DB dosyasına aktarır (checkpoint)
+    ve havuzdaki bağlantıları kapatır.
+    """
+    pid = os.getpid()
+    for db_name, (owner_pid, engine) in list(_ENGINE_CACHE.items()):
+        if owner_pid != pid:
+            continue
+        try:
+            if checkpoint:
+                with engine.connect() as conn:
+                    conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE);")
+        except Exception as e:
+            # başka process yazıyor olabilir (SQLITE_BUSY) → bir sonraki açılışta checkpoint olur
+            print(f"[dispose_engines] checkpoint atlandı ({db_name}): {e}")
+        finally:
+            engine.dispose()
+            _ENGINE_CACHE.pop(db_name, None)
+
+
 # ============================================================
 # 🧩 HELPERS
 # ============================================================
@@ -141,6 +188,15 @@ def make_normalizer(
 
         return r
 
+    # RowProjector bu spec ile normalizasyonu tek geçişe derler
+    _norm.spec = {
+        "defaults": dict(defaults or {}),
+        "coalesce_none": dict(coalesce_none or {}),
+        "strip_strings": strip_strings,
+        "upper_keys": frozenset(upper_keys or ()),
+        "lower_keys": frozenset(lower_keys or ()),
+        "extra": extra,
+    }
     return _norm
 
 
@@ -148,16 +204,16 @@ def make_normalizer(
 # 🧽 SANITIZE (INSERT SAFETY)
 # ============================================================
 
+def _sanitize_value(v: Any) -> Any:
+    if isinstance(v, BindParameter):
+        return getattr(v, "value", None)
+    if isinstance(v, ClauseElement):
+        return None
+    return v
+
+
 def _sanitize_row(row: dict) -> dict:
-    safe = {}
-    for k, v in row.items():
-        if isinstance(v, BindParameter):
-            safe[k] = getattr(v, "value", None)
-        elif isinstance(v, ClauseElement):
-            safe[k] = None
-        else:
-            safe[k] = v
-    return safe
+    return {k: _sanitize_value(v) for k, v in row.items()}
 
 
 def _sanitize_chunk(chunk: list[dict]) -> list[dict]:
@@ -173,6 +229,223 @@ def _debug_find_problematic(rows: list[dict]) -> list[tuple]:
     return bad
 
 
+# ============================================================
+# 🎯 ROW PROJECTOR (rename + normalize + filtre → tuple)
+# ============================================================
+# create_records'a gelen dict'ler tek geçişte, ara dict üretmeden
+# (kolonlar, değerler) tuple çiftine çevrilir. Projector
+# (model, rename_map, normalizer, drop_unknown) başına bir kez derlenir.
+
+_MISSING = object()
+
+
+class RowProjector:
+    """
+    projector(rec) → ((kolon, ...), (değer, ...)) ya da boş kayıt için None.
+    Kolonlar tablo sırasındadır; kayıtta olmayan kolonlar dahil edilmez
+    (DB / Python default'u devreye girsin diye).
+    """
+
+    def __init__(
+        self,
+        model: Type[SQLModel],
+        rename_map: Optional[dict[str, str]],
+        normalizer: Optional[Callable[[dict], dict]],
+        drop_unknown: bool,
+    ) -> None:
+        self.model = model
+        self.rename_map = dict(rename_map or {})
+        self.drop_unknown = drop_unknown
+        self.table_order = tuple(c.name for c in model.__table__.c)
+
+        spec = getattr(normalizer, "spec", None) if normalizer else None
+        # spec'siz ya da extra'lı normalizer → eski yol (normalizer dict ister)
+        self.fallback_normalizer = normalizer if normalizer and (spec is None or spec["extra"]) else None
+        spec = None if self.fallback_normalizer else spec
+
+        # kolon → kaynak anahtarlar (rename edilen anahtar, hedef anahtardan önce gelir)
+        sources: Dict[str, list[str]] = {}
+        for old, new in self.rename_map.items():
+            sources.setdefault(new, []).append(old)
+
+        self.plan = []
+        for name in self.table_order:
+            self.plan.append((
+                name,
+                tuple(sources.get(name, ())) + (name,),
+                spec["defaults"].get(name, _MISSING) if spec else _MISSING,
+                bool(spec and spec["strip_strings"]),
+                spec["coalesce_none"].get(name, _MISSING) if spec else _MISSING,
+                "upper" if spec and name in spec["upper_keys"]
+                else "lower" if spec and name in spec["lower_keys"]
+                else None,
+            ))
+
+    def _renamed(self, rec: dict) -> dict:
+        r = dict(rec)
+        for old, new in self.rename_map.items():
+            if old in r:
+                r[new] = r.pop(old)
+        return r
+
+    def __call__(self, rec: dict) -> Optional[Tuple[Tuple[str, ...], Tuple[Any, ...]]]:
+        if self.fallback_normalizer:
+            rec = self.fallback_normalizer(self._renamed(rec))
+            renamed = True
+        else:
+            renamed = not self.rename_map
+
+        columns = []
+        values = []
+        for name, keys, default, strip, coalesce, case in self.plan:
+            v = _MISSING
+            for k in (keys[-1:] if renamed else keys):
+                v = rec.get(k, _MISSING)
+                if v is not _MISSING:
+                    break
+
+            if v is _MISSING:
+                if default is _MISSING:
+                    if coalesce is _MISSING:
+                        continue
+                    v = None
+                else:
+                    v = default
+
+            if strip and isinstance(v, str):
+                v = v.strip()
+            if coalesce is not _MISSING and v in (None, ""):
+                v = coalesce
+            if case and isinstance(v, str):
+                v = v.upper() if case == "upper" else v.lower()
+
+            columns.append(name)
+            values.append(_sanitize_value(v))
+
+        if not self.drop_unknown:
+            src = rec if renamed else self._renamed(rec)
+            for k, v in src.items():
+                if k not in self.table_order:
+                    columns.append(k)
+                    values.append(_sanitize_value(v))
+
+        if not columns:
+            return None
+        return tuple(columns), tuple(values)
+
+
+_PROJECTOR_CACHE: Dict[tuple, RowProjector] = {}
+
+
+def get_row_projector(
+    model: Type[SQLModel],
+    rename_map: Optional[dict[str, str]] = None,
+    normalizer: Optional[Callable[[dict], dict]] = None,
+    drop_unknown: bool = True,
+) -> RowProjector:
+    key = (model, tuple((rename_map or {}).items()), normalizer, drop_unknown)
+    proj = _PROJECTOR_CACHE.get(key)
+    if proj is None:
+        proj = RowProjector(model, rename_map, normalizer, drop_unknown)
+        _PROJECTOR_CACHE[key] = proj
+    return proj
+
+
+# ============================================================
+# 🚀 BULK INSERT (executemany)
+# ============================================================
+# Çoklu VALUES yerine: model + kolon seti başına TEK kez derlenen
+# "INSERT ... ON CONFLICT DO NOTHING" + sqlite3 executemany(tuple'lar).
+# Eklenen satır sayısı cursor.rowcount'tan gelir (her çalıştırmanın
+# changes() toplamı; ignore edilen satırlar 0 sayılır).
+
+_SQLITE_DIALECT = SQLiteDialect_pysqlite()
+
+
+@lru_cache(maxsize=256)
+def _compile_insert_ignore(
+    model: Type[SQLModel],
+    columns: Tuple[str, ...],
+    conflict_keys: Tuple[str, ...],
+) -> Tuple[str, Tuple[Tuple[str, bool, Any, Any], ...]]:
+    """
+    (sql, plan) döner. plan her parametre için (kolon, satırdan_mı, default, processor).
+    - Satırda olmayan ama Python tarafı default'u olan kolonlar (is_printed vb.)
+      SQLAlchemy'nin yaptığı gibi default ile doldurulur.
+    - Processor'lar SQLAlchemy tiplerinin (datetime, bool, JSON ...) DBAPI'ye
+      çevrimini executemany'de de korur.
+    """
+    tbl = model.__table__
+    stmt = sqlite_insert(tbl).on_conflict_do_nothing(index_elements=list(conflict_keys))
+    compiled = stmt.compile(dialect=_SQLITE_DIALECT, column_keys=list(columns))
+
+    plan = []
+    for name in compiled.positiontup or []:
+        col = tbl.c[name]
+        idx = columns.index(name) if name in columns else None
+        default = None
+        if idx is None:
+            if col.default is None or not (col.default.is_scalar or col.default.is_callable):
+                raise CompileError(f"{model.__name__}.{name}: desteklenmeyen default")
+            default = col.default
+        plan.append((idx, default, col.type._cached_bind_processor(_SQLITE_DIALECT)))
+
+    return str(compiled), tuple(plan)
+
+
+def _plan_is_passthrough(plan: tuple) -> bool:
+    # değerler zaten doğru sırada ve çevrim gerektirmiyor → tuple aynen gönderilir
+    return all(idx == i and proc is None for i, (idx, _, proc) in enumerate(plan))
+
+
+def _bulk_insert_ignore(
+    conn: Connection,
+    model: Type[SQLModel],
+    rows: list[Tuple[Tuple[str, ...], Tuple[Any, ...]]],
+    conflict_keys: list[str],
+    chunk_size: int,
+) -> int:
+    """
+    Projector çıktısını (kolonlar, değerler) kolon setine göre gruplar, her
+    grup için derlenmiş tek statement'ı executemany ile çalıştırır.
+    Verilen bağlantının transaction'ında çalışır; commit çağırana aittir.
+    Eklenen sayıyı döner.
+    """
+    groups: Dict[Tuple[str, ...], list[Tuple[Any, ...]]] = {}
+    for columns, values in rows:
+        groups.setdefault(columns, []).append(values)
+
+    inserted = 0
+    cursor = conn.connection.cursor()
+    try:
+        for columns, group in groups.items():
+            sql, plan = _compile_insert_ignore(model, columns, tuple(conflict_keys))
+
+            passthrough = _plan_is_passthrough(plan)
+
+            for chunk in batch_iter(group, chunk_size):
+                if passthrough:
+                    params = chunk
+                else:
+                    params = []
+                    for values in chunk:
+                        out = []
+                        for idx, default, proc in plan:
+                            if idx is None:
+                                v = default.arg if default.is_scalar else default.arg(None)
+                            else:
+                                v = values[idx]
+                            out.append(proc(v) if proc is not None else v)
+                        params.append(tuple(out))
+
+                cursor.executemany(sql, params)
+                inserted += max(cursor.rowcount or 0, 0)
+    finally:
+        cursor.close()
+
+    return inserted
+
+
 # ============================================================
 # ➕ CREATE / UPSERT
 # ============================================================
@@ -188,31 +461,19 @@ def create_records(
     chunk_size: int = 500,
     rename_map: Optional[dict[str, str]] = None,
     drop_unknown: bool = True,
+    conn: Optional[Connection] = None,
 ) -> Result:
+    """
+    conn verilirse (sadece mode="ignore") insert çağıranın transaction'ına
+    katılır; birden fazla tabloya yazan kayıtlar tek commit'te birleşir.
+    """
 
     try:
         engine = get_engine(db_name)
-        cols = get_model_columns(model) if drop_unknown else None
-
-        cleaned: list[dict] = []
-        for d in data_list or []:
-            r = dict(d)
-
-            if rename_map:
-                for old, new in rename_map.items():
-                    if old in r:
-                        r[new] = r.pop(old)
-
-            if normalizer:
-                r = normalizer(r)
+        projector = get_row_projector(model, rename_map, normalizer, drop_unknown)
 
-            if cols:
-                r = {k: v for k, v in r.items() if k in cols}
-
-            if r:
-                cleaned.append(r)
-
-        attempted = len(cleaned)
+        projected = [p for p in map(projector, data_list or ()) if p is not None]
+        attempted = len(projected)
         if attempted == 0:
             return Result.ok(
                 f"{model.__name__}: işlenecek kayıt yok.",
@@ -227,8 +488,8 @@ def create_records(
             # ----------------------------------------------------
             if mode == "plain" or not conflict_keys:
                 with session.begin():
-                    for r in cleaned:
-                        session.add(model(**r))
+                    for columns, values in projected:
+                        session.add(model(**dict(zip(columns, values))))
                 # ✅ IMPORTANT: inserted bilgisi geri döndürüldü
                 return Result.ok(
                     f"{model.__name__}: {attempted} kayıt eklendi.",
@@ -242,29 +503,11 @@ def create_records(
             # IGNORE ON CONFLICT
             # ----------------------------------------------------
             if mode == "ignore":
-                inserted = 0
-                for chunk in batch_iter(cleaned, chunk_size):
-                    safe = _sanitize_chunk(chunk)
-                    try:
-                        stmt = (
-                            sqlite_insert(tbl)
-                            .values(safe)
-                            .on_conflict_do_nothing(index_elements=conflict_keys)
-                        )
-                        res = session.exec(stmt)
-                        inserted += res.rowcount or 0
-                    except CompileError:
-                        # bazı sqlite/driver kombinasyonlarında toplu values compile patlayabilir
-                        for r in safe:
-                            stmt = (
-                                sqlite_insert(tbl)
-                                .values(r)
-                                .on_conflict_do_nothing(index_elements=conflict_keys)
-                            )
-                            res = session.exec(stmt)
-                            inserted += res.rowcount or 0
-
-                session.commit()
+                if conn is not None:
+                    inserted = _bulk_insert_ignore(conn, model, projected, conflict_keys, chunk_size)
+                else:
+                    with engine.begin() as own_conn:
+                        inserted = _bulk_insert_ignore(own_conn, model, projected, conflict_keys, chunk_size)
 
                 # ✅ IMPORTANT: inserted bilgisi geri döndürüldü
                 return Result.ok(
@@ -278,12 +521,12 @@ def create_records(
             # ----------------------------------------------------
             if mode == "update":
                 affected = 0
-                for chunk in batch_iter(cleaned, chunk_size):
-                    stmt = sqlite_insert(tbl).values(chunk)
+                for chunk in batch_iter(projected, chunk_size):
+                    stmt = sqlite_insert(tbl).values([dict(zip(c, v)) for c, v in chunk])
                     update_cols = {
                         c.name: stmt.excluded[c.name]
                         for c in tbl.c
-                        if c.name not in conflict_keys
+                        if c.name not in conflict_keys and not c.primary_key
                     }
                     stmt = stmt.on_conflict_do_update(
                         index_elements=conflict_keys,
@@ -324,6 +567,9 @@ def get_records(
     try:
         engine = db_engine or get_engine(db_name)
 
+        if custom_sql or to_dataframe:
+            import pandas as pd  # ağır: sadece DataFrame gerektiğinde
+
         if custom_sql:
             with engine.connect() as conn:
                 df = pd.read_sql_query(custom_sql, conn)
@@ -415,6 +661,117 @@ def update_records(
         return Result.fail(map_error_to_message(e), error=e, close_dialog=False)
 
 
+# ============================================================
+# 📦 SET-BASED BULK UPDATE / DELETE
+# ============================================================
+# Satır hydrate etmeden tek UPDATE/DELETE ... WHERE. Filtrede liste/tuple/set
+# verilen alan IN olarak uygulanır; en büyük IN listesi SQLite'ın bind
+# değişkeni limitini aşmayacak şekilde parçalanır. Tüm parçalar tek transaction.
+
+SQLITE_MAX_VARIABLES = 999  # eski SQLite derlemelerindeki alt sınır
+
+
+def _bulk_where_batches(
+    model: Type[SQLModel],
+    filters: dict,
+    reserved_vars: int,
+) -> Iterable[list]:
+    """
+    Her parça için WHERE koşulları listesi üretir. IN listesi boşsa hiç üretmez.
+    """
+    scalar_conds = []
+    in_filters: Dict[str, list] = {}
+    for k, v in (filters or {}).items():
+        if isinstance(v, (list, tuple, set, frozenset)):
+            in_filters[k] = list(dict.fromkeys(v))
+        else:
+            scalar_conds.append(getattr(model, k) == v)
+
+    if any(not vals for vals in in_filters.values()):
+        return
+
+    if not in_filters:
+        yield scalar_conds
+        return
+
+    # en büyük liste parçalanır, diğerleri her parçada aynen kalır
+    split_key = max(in_filters, key=lambda k: len(in_filters[k]))
+    fixed_conds = [getattr(model, k).in_(vals) for k, vals in in_filters.items() if k != split_key]
+    used = reserved_vars + len(scalar_conds) + sum(
+        len(vals) for k, vals in in_filters.items() if k != split_key
+    )
+    size = max(1, SQLITE_MAX_VARIABLES - used)
+
+    col = getattr(model, split_key)
+    for part in batch_iter(in_filters[split_key], size):
+        yield scalar_conds + fixed_conds + [col.in_(part)]
+
+
+def update_records_bulk(
+    model: Type[SQLModel],
+    filters: dict,
+    update_data: dict,
+    db_name: str = DB_NAME,
+    db_engine: Engine = None,
+) -> Result:
+    """
+    UPDATE model SET ... WHERE filters  (IN listeleri parçalı).
+    data = {"affected": int}
+    """
+    try:
+        if not update_data:
+            return Result.fail("Güncellenecek alan belirtilmedi.", close_dialog=False)
+
+        engine = db_engine or get_engine(db_name)
+        affected = 0
+
+        with engine.begin() as conn:
+            for conds in _bulk_where_batches(model, filters, reserved_vars=len(update_data)):
+                stmt = update(model).where(*conds).values(**update_data)
+                affected += conn.execute(stmt).rowcount or 0
+
+        return Result.ok(
+            f"{affected} kayıt güncellendi.",
+            close_dialog=False,
+            data={"affected": affected},
+        )
+
+    except Exception as e:
+        return Result.fail(map_error_to_message(e), error=e, close_dialog=False)
+
+
+def delete_records_bulk(
+    model: Type[SQLModel],
+    filters: dict,
+    db_name: str = DB_NAME,
+    db_engine: Engine = None,
+) -> Result:
+    """
+    DELETE FROM model WHERE filters  (IN listeleri parçalı).
+    Boş filtre tüm tabloyu sileceği için reddedilir.
+    data = {"deleted": int}
+    """
+    try:
+        if not filters:
+            return Result.fail("Silme için filtre belirtilmedi.", close_dialog=False)
+
+        engine = db_engine or get_engine(db_name)
+        deleted = 0
+
+        with engine.begin() as conn:
+            for conds in _bulk_where_batches(model, filters, reserved_vars=0):
+                deleted += conn.execute(delete(model).where(*conds)).rowcount or 0
+
+        return Result.ok(
+            f"{deleted} kayıt silindi.",
+            close_dialog=False,
+            data={"deleted": deleted},
+        )
+
+    except Exception as e:
+        return Result.fail(map_error_to_message(e), error=e, close_dialog=False)
+
+
 # ============================================================
 # 🗑 DELETE
 # ============================================================
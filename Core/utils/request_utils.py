@@ -1,7 +1,84 @@
+import asyncio
+import weakref
+from typing import Dict
+from urllib.parse import urlsplit
+
 import httpx
 from Feedback.processors.pipeline import Result, map_error_to_message
 
 
+# ============================================================
+# 🔌 PAYLAŞIMLI HTTP CLIENT (EVENT LOOP BAŞINA)
+# ============================================================
+# Her AsyncWorker kendi event loop'unu açar. httpx.AsyncClient bir loop'a
+# bağlı olduğundan client'lar loop başına tutulur; aynı loop içindeki tüm
+# istekler (find_orders / get_order_by_number) aynı keep-alive havuzunu kullanır.
+
+HTTP_MAX_CONNECTIONS = 40
+HTTP_MAX_KEEPALIVE = 20
+HTTP_KEEPALIVE_EXPIRY = 30.0
+HTTP_MAX_PER_HOST = 10
+
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+class _LoopHttpState:
+    def __init__(self) -> None:
+        self.client = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        self.host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        sem = self.host_limits.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(HTTP_MAX_PER_HOST)
+            self.host_limits[host] = sem
+        return sem
+
+
+_LOOP_STATES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopHttpState]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_loop_state() -> _LoopHttpState:
+    loop = asyncio.get_running_loop()
+    state = _LOOP_STATES.get(loop)
+    if state is None or state.client.is_closed:
+        state = _LoopHttpState()
+        _LOOP_STATES[loop] = state
+    return state
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Çalışan event loop'a ait paylaşımlı AsyncClient'ı döndürür (yoksa oluşturur).
+    """
+    return _get_loop_state().client
+
+
+async def close_async_clients() -> None:
+    """
+    Çalışan event loop'a ait client'ı kapatır.
+    AsyncWorker, loop'u kapatmadan önce bunu çağırır.
+    """
+    loop = asyncio.get_running_loop()
+    state = _LOOP_STATES.pop(loop, None)
+    if state is not None and not state.client.is_closed:
+        await state.client.aclose()
+
+
 async def async_make_request(
     method: str,
     url: str,
@@ -16,35 +93,48 @@ async def async_make_request(
     Genel amaçlı asenkron HTTP istek fonksiyonu.
     - Başarılı olursa Result.ok döner → data = {"json": ..., "status_code": ...}
     - Hata olursa Result.fail döner.
+    - Bağlantılar loop başına paylaşılan client üzerinden tekrar kullanılır.
     """
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.request(
+        state = _get_loop_state()
+        async with state.host_semaphore(url):
+            response = await state.client.request(
                 method=method,
                 url=url,
                 headers=headers,
                 auth=auth,
                 params=params,
                 data=data,
-                json=json
-            )
-            response.raise_for_status()
-
-            # ✅ Başarıyla sonuç döner
-            return Result.ok(
-                f"{method} {url} isteği başarılı.",
-                close_dialog=False,
-                data={
-                    "json": response.json(),
-                    "status_code": response.status_code
-                }
+                json=json,
+                timeout=timeout,
             )
+        response.raise_for_status()
+
+        # ✅ Başarıyla sonuç döner
+        return Result.ok(
+            f"{method} {url} isteği başarılı.",
+            close_dialog=False,
+            data={
+                "json": response.json(),
+                "status_code": response.status_code
+            }
+        )
 
     except Exception as e:
         # ✅ Hata feedback sistemine uyarlanır
         msg = map_error_to_message(e)
+
+        # HTTP hatalarında status + Retry-After bilgisi (rate limiter için)
+        err_data = None
+        if isinstance(e, httpx.HTTPStatusError):
+            err_data = {
+                "status_code": e.response.status_code,
+                "retry_after": e.response.headers.get("Retry-After"),
+            }
+
         return Result.fail(
             f"{method} {url} isteği başarısız: {msg}",
             error=e,
-            close_dialog=False
+            close_dialog=False,
+            data=err_data,
         )
@@ -0,0 +1,122 @@
+# Core/utils/startup_profiler.py
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from typing import List, NamedTuple, Optional
+
+
+# ============================================================
+# ⏱ AÇILIŞ PROFİLİ (--profile-startup)
+# ============================================================
+# İki parça:
+#   1) PhaseTimer: bootstrap / UI import / pencere kurulumu / ilk gösterim
+#      gibi aşamaların süresi (her ortamda, frozen EXE dahil).
+#   2) -X importtime: geliştirme ortamında aynı komut kendini
+#      "python -X importtime" ile yeniden çalıştırır, stderr'deki modül
+#      başına süreleri toplayıp en pahalı modülleri raporlar.
+
+IMPORTTIME_TOP_N = 25
+
+
+class PhaseTimer:
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases: List[tuple[str, float]] = []
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+
+    def report(self) -> str:
+        lines = ["", "⏱ Açılış aşamaları (ms):"]
+        for name, sec in self.phases:
+            lines.append(f"  {sec * 1000:9.1f}  {name}")
+        lines.append(f"  {(self._last - self.started) * 1000:9.1f}  TOPLAM (ilk pencereye kadar)")
+        return "\n".join(lines)
+
+
+class ImportCost(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr_text: str) -> List[ImportCost]:
+    """
+    "import time:      self [us] |  cumulative | imported package" satırlarını ayrıştırır.
+    """
+    costs: List[ImportCost] = []
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cum_us = int(parts[1].strip())
+        except ValueError:
+            continue  # başlık satırı
+        # "| " ayırıcısından sonraki girinti iç içe import derinliğidir, korunur
+        name = parts[2][1:] if parts[2].startswith(" ") else parts[2]
+        costs.append(ImportCost(name.rstrip(), self_us, cum_us))
+    return costs
+
+
+def format_importtime_report(costs: List[ImportCost], top_n: int = IMPORTTIME_TOP_N) -> str:
+    if not costs:
+        return "importtime verisi yok."
+
+    # en üst seviye importlar (girintisiz) toplam süreyi verir
+    total_us = sum(c.cumulative_us for c in costs if not c.module.startswith(" "))
+
+    lines = ["", f"📦 Import süresi toplam: {total_us / 1000:.1f} ms ({len(costs)} modül)"]
+
+    lines.append(f"\n  En pahalı {top_n} modül (kümülatif, ms):")
+    for c in sorted(costs, key=lambda c: c.cumulative_us, reverse=True)[:top_n]:
+        lines.append(f"  {c.cumulative_us / 1000:9.1f}  {c.module.strip()}")
+
+    lines.append(f"\n  En pahalı {top_n} modül (kendi süresi, ms):")
+    for c in sorted(costs, key=lambda c: c.self_us, reverse=True)[:top_n]:
+        lines.append(f"  {c.self_us / 1000:9.1f}  {c.module.strip()}")
+
+    return "\n".join(lines)
+
+
+def importtime_active() -> bool:
+    return "importtime" in getattr(sys, "_xoptions", {})
+
+
+def run_with_importtime(script_path: str, args: List[str]) -> Optional[int]:
+    """
+    Aynı script'i -X importtime ile çocuk process olarak çalıştırır ve raporu basar.
+    Frozen EXE'de (-X desteklenmez) veya zaten importtime altındaysak None döner.
+    """
+    if getattr(sys, "frozen", False) or importtime_active():
+        return None
+
+    env = dict(os.environ)
+    env["PYTHONIOENCODING"] = "utf-8"
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", script_path, *args],
+        stdout=None,  # çocuk aşama raporunu doğrudan konsola basar
+        stderr=subprocess.PIPE,
+        env=env,
+    )
+    stderr_text = proc.stderr.decode("utf-8", errors="replace")
+
+    costs = parse_importtime(stderr_text)
+    print(format_importtime_report(costs))
+
+    # importtime dışındaki stderr (traceback vb.) kaybolmasın
+    other = [l for l in stderr_text.splitlines() if not l.startswith("import time:")]
+    if other:
+        print("\n".join(other), file=sys.stderr)
+
+    return proc.returncode
@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QPushButton, QAbstractButton,
-    QLabel, QHBoxLayout, QSizePolicy, QGraphicsDropShadowEffect
+    QLabel, QHBoxLayout, QSizePolicy, QGraphicsDropShadowEffect,
+    QStyledItemDelegate, QStyle
 )
 from PyQt6.QtCore import Qt, QTimer, QRectF, QPointF, QPropertyAnimation, QEasingCurve, pyqtProperty, pyqtSignal, \
-    QAbstractAnimation,QSize
-from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QFontDatabase, QPixmap, QPalette
+    QAbstractAnimation, QSize, QRect, QEvent
+from PyQt6.QtGui import QPainter, QColor, QPen, QFont, QFontDatabase, QFontMetrics, QPixmap, QPalette
 from Feedback.processors.pipeline import Result, map_error_to_message
 
 
@@ -359,6 +360,202 @@ class ListSmartItemWidget(QWidget):
 
 
 
+# ========================
+# 📋 SmartListItemDelegate
+# ========================
+class SmartListItemDelegate(QStyledItemDelegate):
+    """
+    ListSmartItemWidget'in model/view karşılığı: satır başına widget yaratmadan
+    aynı kartı (logo, title, subtitle, extra, sağda toggle) boyar.
+    QListView + uniformItemSizes ile sadece görünen satırlar çizilir.
+
+    Roller:
+        DisplayRole       → title
+        SubtitleRole      → subtitle
+        ExtraRole         → extra
+        IconPathRole      → logo dosya yolu
+        CheckStateRole    → toggle (ItemIsUserCheckable ise çizilir)
+    Toggle tıklaması model.setData(index, state, CheckStateRole) ile yazılır.
+    """
+
+    SubtitleRole = Qt.ItemDataRole.UserRole + 101
+    ExtraRole = Qt.ItemDataRole.UserRole + 102
+    IconPathRole = Qt.ItemDataRole.UserRole + 103
+
+    # ListSmartItemWidget ile aynı ölçüler
+    MARGIN_H = 12
+    MARGIN_V = 8
+    SPACING = 12
+    LINE_SPACING = 2
+    ICON_SIZE = 28
+    SWITCH_W = 50
+    SWITCH_H = 28
+
+    def __init__(self, parent=None, checked_color="#1abc9c", unchecked_color="#cccccc", thumb_color="white"):
+        super().__init__(parent)
+        self._checked_color = QColor(checked_color)
+        self._unchecked_color = QColor(unchecked_color)
+        self._thumb_color = QColor(thumb_color)
+        self._pixmaps: dict[str, QPixmap] = {}
+
+    # ---------------------------------------------------------
+    # 🔤 Fontlar / ölçüler
+    # ---------------------------------------------------------
+    @staticmethod
+    def _fonts(base: QFont) -> tuple[QFont, QFont]:
+        title = QFont(base)
+        title.setPixelSize(14)
+        title.setBold(True)
+        small = QFont(base)
+        small.setPixelSize(12)
+        return title, small
+
+    @staticmethod
+    def is_checked(value) -> bool:
+        if isinstance(value, Qt.CheckState):
+            return value == Qt.CheckState.Checked
+        return value == Qt.CheckState.Checked.value
+
+    def _switch_rect(self, rect: QRect) -> QRect:
+        return QRect(
+            rect.right() - self.MARGIN_H - self.SWITCH_W + 1,
+            rect.top() + (rect.height() - self.SWITCH_H) // 2,
+            self.SWITCH_W,
+            self.SWITCH_H,
+        )
+
+    def _pixmap(self, path: str) -> QPixmap:
+        pm = self._pixmaps.get(path)
+        if pm is None:
+            pm = QPixmap(path)
+            if not pm.isNull():
+                pm = pm.scaled(
+                    self.ICON_SIZE, self.ICON_SIZE,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                )
+            self._pixmaps[path] = pm
+        return pm
+
+    def sizeHint(self, option, index):
+        title_font, small_font = self._fonts(option.font)
+        title_h = QFontMetrics(title_font).height()
+        small_h = QFontMetrics(small_font).height()
+        text_h = title_h + 2 * (self.LINE_SPACING + small_h)
+        height = max(text_h, self.ICON_SIZE, self.SWITCH_H) + 2 * self.MARGIN_V
+        # genişlik küçük → yatay taşma olmasın (ListSmartItemWidget.sizeHint ile aynı)
+        return QSize(10, height)
+
+    # ---------------------------------------------------------
+    # 🖌️ Paint
+    # ---------------------------------------------------------
+    def paint(self, painter, option, index):
+        try:
+            painter.save()
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+            rect = option.rect
+            selected = bool(option.state & QStyle.StateFlag.State_Selected)
+            hover = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+            if selected:
+                bg, border, border_width = QColor("#f0f6ff"), QColor("#3399ff"), 2
+            elif hover:
+                bg, border, border_width = QColor("#fafafa"), QColor("#cccccc"), 1
+            else:
+                bg, border, border_width = QColor("#ffffff"), QColor(Qt.GlobalColor.transparent), 0
+
+            painter.setBrush(bg)
+            painter.setPen(QPen(border, border_width) if border_width else Qt.PenStyle.NoPen)
+            painter.drawRoundedRect(QRectF(rect).adjusted(1, 1, -1, -1), 6, 6)
+
+            # ────────── Sol: Icon ──────────
+            x = rect.left() + self.MARGIN_H
+            top = rect.top() + self.MARGIN_V
+            icon_path = index.data(self.IconPathRole)
+            if icon_path:
+                pm = self._pixmap(icon_path)
+                if not pm.isNull():
+                    painter.drawPixmap(x, top, pm)
+                x += self.ICON_SIZE + self.SPACING
+
+            # ────────── Sağ: Toggle ──────────
+            right = rect.right() - self.MARGIN_H
+            if index.flags() & Qt.ItemFlag.ItemIsUserCheckable:
+                sw = self._switch_rect(rect)
+                checked = self.is_checked(index.data(Qt.ItemDataRole.CheckStateRole))
+                radius = sw.height() / 2
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(self._checked_color if checked else self._unchecked_color)
+                painter.drawRoundedRect(QRectF(sw), radius, radius)
+
+                r = sw.height() - 6
+                thumb_x = sw.left() + (sw.width() - sw.height() + 3 if checked else 3)
+                painter.setBrush(self._thumb_color)
+                painter.drawEllipse(QRectF(thumb_x, sw.top() + 3, r, r))
+                right = sw.left() - self.SPACING
+
+            # ────────── Orta: Metinler (ellipsis) ──────────
+            width = max(0, right - x)
+            title_font, small_font = self._fonts(option.font)
+            lines = (
+                (index.data(Qt.ItemDataRole.DisplayRole), title_font, "#222"),
+                (index.data(self.SubtitleRole), small_font, "#444"),
+                (index.data(self.ExtraRole), small_font, "#666"),
+            )
+            y = top
+            for text, font, color in lines:
+                if not text:
+                    continue
+                fm = QFontMetrics(font)
+                painter.setFont(font)
+                painter.setPen(QColor(color))
+                elided = fm.elidedText(str(text), Qt.TextElideMode.ElideRight, width)
+                painter.drawText(
+                    QRect(x, y, width, fm.height()),
+                    Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                    elided,
+                )
+                y += fm.height() + self.LINE_SPACING
+
+        except Exception as e:
+            print(Result.fail(map_error_to_message(e), error=e))
+        finally:
+            painter.restore()
+
+    # ---------------------------------------------------------
+    # 🖱️ Toggle tıklaması
+    # ---------------------------------------------------------
+    def editorEvent(self, event, model, option, index):
+        try:
+            if not (index.flags() & Qt.ItemFlag.ItemIsUserCheckable):
+                return False
+
+            etype = event.type()
+            if etype not in (
+                QEvent.Type.MouseButtonPress,
+                QEvent.Type.MouseButtonRelease,
+                QEvent.Type.MouseButtonDblClick,
+            ):
+                return False
+            if event.button() != Qt.MouseButton.LeftButton:
+                return False
+            if not self._switch_rect(option.rect).contains(event.position().toPoint()):
+                return False
+
+            # press / double click toggle alanında yutulur → satır seçimi değişmez
+            if etype != QEvent.Type.MouseButtonRelease:
+                return True
+
+            checked = self.is_checked(index.data(Qt.ItemDataRole.CheckStateRole))
+            new_state = Qt.CheckState.Unchecked if checked else Qt.CheckState.Checked
+            return model.setData(index, new_state, Qt.ItemDataRole.CheckStateRole)
+
+        except Exception as e:
+            print(Result.fail(map_error_to_message(e), error=e))
+            return False
+
+
 # ========================
 # ⭕ CircularProgressButton
 # ========================
@@ -11,13 +11,11 @@ from Feedback.processors.pipeline import Result, map_error_to_message
 from Orders.views.actions import collect_selected_orders
 from Orders.processors.trendyol_pipeline import get_order_full_details_by_numbers
 
-from docxtpl import DocxTemplate, InlineImage, RichText
-from docx.shared import Mm
-from docx import Document
+# ⚠️ docxtpl / docx / docxcompose / barcode AĞIR: sadece etiket üretilirken
+# (fonksiyon içinde) import edilir → uygulama açılışını yavaşlatmaz.
 import math
 from Orders.signals.signals import order_signals  # noqa: F401
 from io import BytesIO
-from docxcompose.composer import Composer
 from datetime import datetime
 # 🔴 Buraya dikkat: LABEL_ASSETS_DIR de import edildi
 from Labels.constants.constants import get_label_model_config, LABEL_ASSETS_DIR
@@ -154,7 +152,8 @@ def create_order_label_from_orders(
     DÖNEN Result.data:
         {
             "label_payload": {...},
-            "order_numbers": [ ... ]   # ⬅ OrderHeader güncellemesi için
+            "order_numbers": [ ... ],  # ⬅ OrderHeader güncellemesi için
+            "order_keys": [(orderNumber, api_account_id), ...]
         }
 
     ÖNEMLİ:
@@ -232,6 +231,8 @@ def create_order_label_from_orders(
         final_labels: List[Dict[str, Any]] = []
         label_index = 0  # debug için
 
+        order_keys: List[tuple] = []
+
         for pkg in orders:
             header = pkg.get("header")
             snapshots = pkg.get("data", []) or []
@@ -245,6 +246,7 @@ def create_order_label_from_orders(
                 continue
 
             order_no = str(getattr(header, "orderNumber", "")).strip()
+            order_keys.append((order_no, getattr(header, "api_account_id", None)))
 
             # 2.a) Fullname, address, cargoTrackingNumber, cargoProviderName
             fullname = ""
@@ -376,6 +378,7 @@ def create_order_label_from_orders(
             data={
                 "label_payload": payload,
                 "order_numbers": order_numbers,  # ⬅ OrderHeader update için
+                "order_keys": order_keys,
             },
             close_dialog=False,
         )
@@ -493,6 +496,8 @@ def _make_rich_text(
     if value in (None, ""):
         return ""
 
+    from docxtpl import RichText
+
     rt = RichText()
     kwargs = {}
 
@@ -526,6 +531,11 @@ def export_labels_to_word(
         progress_cb=None,
 ) -> Result:
     try:
+        from docxtpl import DocxTemplate, InlineImage
+        from docx.shared import Mm
+        from docx import Document
+        from docxcompose.composer import Composer
+
         # ---------------------------------
         # PROGRESS CB
         # ---------------------------------
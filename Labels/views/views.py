@@ -22,10 +22,7 @@ from datetime import datetime
 from Core.views.views import CircularProgressButton
 from Core.threads.sync_worker import SyncWorker
 
-from time import time
-
-from Orders.models.trendyol.trendyol_models import OrderHeader
-from Core.utils.model_utils import update_records
+from Orders.processors.trendyol_pipeline import mark_orders_processed
 from Orders.signals.signals import order_signals
 
 
@@ -50,6 +47,7 @@ class LabelPrintManagerWindow(QDialog):
 
             # worker ve geçici state
             self._worker: SyncWorker | None = None
+            self._mark_worker: SyncWorker | None = None
             self._current_payload: dict | None = None
             self._current_sort_mode: str = "none"
             self._current_output_path: Path | None = None
@@ -379,26 +377,8 @@ class LabelPrintManagerWindow(QDialog):
 
             self.progress_changed.emit(100)
 
-            # ⬇ OrderHeader flag update
-            try:
-                lr_data = (self.label_result.data or {}) if self.label_result else {}
-                order_numbers = lr_data.get("order_numbers", []) or []
-
-                if order_numbers:
-                    now_ts = int(time() * 1000)
-                    for ord_no in order_numbers:
-                        upd_res = update_records(
-                            model=OrderHeader,
-                            filters={"orderNumber": ord_no},
-                            update_data={
-                                "is_extracted": True,
-                                "extracted_at": now_ts,
-                            },
-                        )
-                        if not upd_res.success:
-                            print(f"[OrderHeader update error] {ord_no} → {upd_res.message}")
-            except Exception as e:
-                print("OrderHeader flag update error:", e)
+            # ⬇ OrderHeader flag update (tek transaction, arka planda)
+            self._start_mark_extracted_worker()
 
             # ✅ Preview popup kaldırıldı
 
@@ -411,7 +391,6 @@ class LabelPrintManagerWindow(QDialog):
                 only_errors=False
             )
 
-            order_signals.orders_changed.emit()
             self.accept()
 
         except Exception as e:
@@ -424,3 +403,27 @@ class LabelPrintManagerWindow(QDialog):
 
     def _on_export_worker_finished(self):
         self._worker = None
+
+    def _start_mark_extracted_worker(self):
+        """
+        Çıkarılan siparişleri OrderHeader'da toplu işaretler (SyncWorker).
+        Bitince tek bir orders_flags_changed sinyali atılır.
+        """
+        lr_data = (self.label_result.data or {}) if self.label_result else {}
+        order_keys = lr_data.get("order_keys", []) or []
+        if not order_keys:
+            return
+
+        def handle_mark_result(res: Result):
+            if not res.success:
+                print(f"[OrderHeader update error] → {res.message}")
+                return
+            data = res.data or {}
+            order_signals.orders_flags_changed.emit(
+                list(data.get("order_keys", [])),
+                dict(data.get("fields", {})),
+            )
+
+        self._mark_worker = SyncWorker(mark_orders_processed, order_keys, extracted=True)
+        self._mark_worker.result_ready.connect(handle_mark_result)
+        self._mark_worker.start()
@@ -2,12 +2,17 @@
 from __future__ import annotations
 
 from typing import Dict, Any
-import requests
 
 import settings
 from Feedback.processors.pipeline import Result
 
 
+def _post_json(url: str, payload: Dict[str, Any], timeout: int = 25):
+    # requests ağır bir import → sadece lisans isteği atılırken yüklenir
+    import requests
+    return requests.post(url, json=payload, timeout=timeout)
+
+
 class FreemiusLicenseApi:
     """
     EXE -> Worker -> Freemius
@@ -26,7 +31,7 @@ class FreemiusLicenseApi:
         url = f"{self.base}/v1/license/activate"
         payload = {"uid": uid, "license_key": license_key}
         try:
-            r = requests.post(url, json=payload, timeout=25)
+            r = _post_json(url, payload)
             if r.ok:
                 j = r.json() if r.text else {}
                 if j.get("ok") is True:
@@ -40,7 +45,7 @@ class FreemiusLicenseApi:
         url = f"{self.base}/v1/license/validate"
         payload = {"uid": uid, "license_key": license_key, "install_id": int(install_id)}
         try:
-            r = requests.post(url, json=payload, timeout=25)
+            r = _post_json(url, payload)
             if r.ok:
                 j = r.json() if r.text else {}
                 if j.get("ok") is True:
@@ -54,7 +59,7 @@ class FreemiusLicenseApi:
         url = f"{self.base}/v1/license/deactivate"
         payload = {"uid": uid, "license_key": license_key, "install_id": int(install_id)}
         try:
-            r = requests.post(url, json=payload, timeout=25)
+            r = _post_json(url, payload)
             if r.ok:
                 j = r.json() if r.text else {}
                 if j.get("ok") is True:
@@ -1,23 +1,28 @@
 # License/decorators/license_check.py
 from __future__ import annotations
 
+import asyncio
 from functools import wraps
 from typing import Callable, Any, Awaitable
 
 from Feedback.processors.pipeline import Result
-from License.processors.pipeline import ensure_license_valid
+from License.processors.pipeline import ensure_license_valid, get_cached_license_result
 
 
 def require_valid_license_async(*, force: bool = False):
     """
     async fonksiyonlar için lisans kontrol decorator'ı.
     API çağrılarından önce lisansı kontrol eder.
+    Geçerli cache varsa event loop'u bloklamadan anında döner; yoksa doğrulama
+    thread'e alınır (aynı anda tek doğrulama, bkz. ensure_license_valid).
     """
 
     def decorator(fn: Callable[..., Awaitable[Result]]):
         @wraps(fn)
         async def wrapper(*args: Any, **kwargs: Any) -> Result:
-            lic_res = ensure_license_valid(force=force)
+            lic_res = None if force else get_cached_license_result()
+            if lic_res is None:
+                lic_res = await asyncio.to_thread(ensure_license_valid, force=force)
             if not lic_res.success:
                 return lic_res
             return await fn(*args, **kwargs)
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import hashlib
 import os
+import threading
+import time
 import uuid
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, Any, Optional, Tuple
 
 from sqlmodel import Session, select
@@ -23,6 +26,44 @@ from License.models import (
 VERIFY_TTL_MINUTES = 30
 
 
+# ─────────────────────────────────────────
+# Process içi lisans cache'i
+# ─────────────────────────────────────────
+# Decorator her API sayfasında ensure_license_valid çağırır. Geçerli sonuç
+# TTL dolana kadar bellekte tutulur; böylece DB'ye / device_id hesabına gidilmez.
+# Aktivasyon / deaktivasyon / başarısız doğrulama cache'i temizler.
+# _LICENSE_LOCK aynı anda tek bir yeniden doğrulama yapılmasını sağlar.
+_LICENSE_LOCK = threading.Lock()
+_LICENSE_CACHE: Dict[str, Any] = {"entry": None}  # (Result, expires_at monotonic)
+
+# Başarısız sonuç kısa süre tutulur (lisanssız cihazda her sayfada DB'ye gitmesin)
+LICENSE_FAIL_CACHE_SECONDS = 10
+
+
+def get_cached_license_result() -> Optional[Result]:
+    """
+    Süresi dolmamış bir lisans sonucu varsa döner, yoksa None.
+    """
+    entry = _LICENSE_CACHE["entry"]
+    if entry is not None and time.monotonic() < entry[1]:
+        return entry[0]
+    return None
+
+
+def _store_license_cache(res: Result, ttl_seconds: float) -> None:
+    if not res.success:
+        ttl_seconds = LICENSE_FAIL_CACHE_SECONDS
+    if ttl_seconds > 0:
+        _LICENSE_CACHE["entry"] = (res, time.monotonic() + ttl_seconds)
+    else:
+        invalidate_license_cache()
+
+
+def invalidate_license_cache() -> None:
+    _LICENSE_CACHE["entry"] = None
+
+
+@lru_cache(maxsize=1)
 def get_device_id() -> str:
     raw = f"{uuid.getnode()}|{os.getlogin()}"
     return hashlib.sha256(raw.encode()).hexdigest()[:32]
@@ -88,20 +129,49 @@ def _ui_dict(state: LocalLicenseState) -> Dict[str, Any]:
 
 
 def ensure_license_valid(force: bool = False) -> Result:
+    """
+    Lisans geçerli mi? Önce process içi cache'e bakar (TTL: VERIFY_TTL_MINUTES).
+    Cache boşsa / süresi dolduysa aynı anda tek bir thread DB + API doğrulaması yapar,
+    bekleyen diğer çağrılar yenilenmiş cache'i kullanır.
+    """
+    if not force:
+        cached = get_cached_license_result()
+        if cached is not None:
+            return cached
+
+    with _LICENSE_LOCK:
+        if not force:
+            cached = get_cached_license_result()
+            if cached is not None:
+                return cached
+
+        res, ttl_seconds = _check_license_state(force=force)
+        _store_license_cache(res, ttl_seconds)
+        return res
+
+
+def _check_license_state(force: bool = False) -> Tuple[Result, float]:
+    """
+    DB'deki LocalLicenseState'e göre kontrol eder.
+    Dönüş: (Result, cache'te kalabileceği süre sn)
+    """
+    ttl = timedelta(minutes=VERIFY_TTL_MINUTES)
     engine = get_engine("orders.db")
 
     with Session(engine) as session:
         state = _find_state(session, get_device_id())
 
         if not state:
-            return Result.fail("Bu cihazda lisans yok.")
+            return Result.fail("Bu cihazda lisans yok."), 0.0
 
         if not force and state.last_verified_at:
-            if datetime.utcnow() - state.last_verified_at < timedelta(minutes=VERIFY_TTL_MINUTES):
+            age = datetime.utcnow() - state.last_verified_at
+            if age < ttl:
                 if state.last_verify_ok:
-                    return Result.ok("Lisans geçerli (cache).", data=_ui_dict(state))
+                    remaining = (ttl - age).total_seconds()
+                    return Result.ok("Lisans geçerli (cache).", data=_ui_dict(state)), remaining
 
-        return validate_current_license()
+        return validate_current_license(), ttl.total_seconds()
 
 
 def activate_and_validate_license(*, license_key: str, license_email: Optional[str] = None) -> Result:
@@ -109,6 +179,8 @@ def activate_and_validate_license(*, license_key: str, license_email: Optional[s
     if not license_key:
         return Result.fail("Lisans anahtarı boş olamaz.")
 
+    invalidate_license_cache()
+
     engine = get_engine("orders.db")
     device_id = get_device_id()
     uid32 = get_uid32(device_id)
@@ -195,6 +267,8 @@ def activate_and_validate_license(*, license_key: str, license_email: Optional[s
         session.add(log)
 
         session.commit()
+        # araya giren bir ensure_license_valid eski durumu cache'lemiş olabilir
+        invalidate_license_cache()
 
         return Result.ok(
             "Lisans doğrulandı ve kaydedildi.",
@@ -232,6 +306,7 @@ def validate_current_license() -> Result:
             state.last_error_message = val_res.message
             session.add(state)
             session.commit()
+            invalidate_license_cache()
             return val_res
 
         val_json = (val_res.data or {}).get("json") or {}
@@ -251,6 +326,7 @@ def validate_current_license() -> Result:
 
 
 def deactivate_current_license() -> Result:
+    invalidate_license_cache()
     engine = get_engine("orders.db")
 
     try:
@@ -274,5 +350,6 @@ def deactivate_current_license() -> Result:
 
         session.delete(state)
         session.commit()
+        invalidate_license_cache()
 
         return Result.ok("Lisans bu cihazdan kaldırıldı.", close_dialog=False)
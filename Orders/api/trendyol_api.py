@@ -1,7 +1,21 @@
 from Core.api.Api_engine import BaseTrendyolApi
+from Core.api.rate_limiter import RateLimitScheduler
 from Core.utils.request_utils import async_make_request
 from Feedback.processors.pipeline import Result, map_error_to_message
 from License.decorators.license_check import require_valid_license_async
+from Orders.constants.trendyol_constants import (
+    TRENDYOL_RATE_PER_SEC,
+    TRENDYOL_RATE_BURST,
+    TRENDYOL_MAX_RETRIES,
+)
+
+
+# Tüm hesaplar / statüler için ortak zamanlayıcı (supplier_id başına limit)
+trendyol_scheduler = RateLimitScheduler(
+    rate=TRENDYOL_RATE_PER_SEC,
+    capacity=TRENDYOL_RATE_BURST,
+    max_retries=TRENDYOL_MAX_RETRIES,
+)
 
 
 class TrendyolApi(BaseTrendyolApi):
@@ -10,8 +24,21 @@ class TrendyolApi(BaseTrendyolApi):
 
     Bu sınıf yalnızca **tek sayfalık** sipariş verisini çeker.
     Sayfalama pipeline tarafında yapılır.
+    Tüm istekler trendyol_scheduler üzerinden supplier_id limitine göre sıralanır.
     """
 
+    async def _get(self, url: str, params: dict) -> Result:
+        return await trendyol_scheduler.run(
+            self.supplier_id,
+            lambda: async_make_request(
+                method="GET",
+                url=url,
+                headers=self.header,
+                auth=self.auth,
+                params=params,
+            ),
+        )
+
     @require_valid_license_async(force=False)
     async def find_orders(
         self,
@@ -34,13 +61,7 @@ class TrendyolApi(BaseTrendyolApi):
                 "size": size,
             }
 
-            res = await async_make_request(
-                method="GET",
-                url=url,
-                headers=self.header,
-                auth=self.auth,
-                params=params,
-            )
+            res = await self._get(url, params)
 
             if not res.success:
                 return res
@@ -95,13 +116,7 @@ class TrendyolApi(BaseTrendyolApi):
                 "size": size,
             }
 
-            res = await async_make_request(
-                method="GET",
-                url=url,
-                headers=self.header,
-                auth=self.auth,
-                params=params,
-            )
+            res = await self._get(url, params)
 
             if not res.success:
                 return res
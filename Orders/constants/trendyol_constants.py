@@ -16,6 +16,33 @@ TRENDYOL_STATUS_LIST = [
     "Cancelled",
 ]
 
+# -------------------------------------------------
+# 📄 Sayfalama
+# -------------------------------------------------
+# totalPages öğrenildikten sonra aynı status için eşzamanlı çekilecek sayfa sayısı
+PAGE_FETCH_CONCURRENCY = 5
+
+# Tüm hesaplar × statüler için aynı anda çalışacak (hesap, statü) görevi sayısı
+FETCH_ALL_CONCURRENCY = 8
+
+# Non-final yenilemede aynı anda sorgulanacak sipariş sayısı
+NONFINAL_REFRESH_CONCURRENCY = 8
+
+# -------------------------------------------------
+# 🚦 Rate Limit (supplier_id başına token bucket)
+# -------------------------------------------------
+TRENDYOL_RATE_PER_SEC = 5.0     # sürekli hız (istek/sn)
+TRENDYOL_RATE_BURST = 10        # anlık izin verilen en fazla istek
+TRENDYOL_MAX_RETRIES = 4        # 429 / 5xx için tekrar deneme sayısı
+
+# -------------------------------------------------
+# 🔁 Artımlı Senkron (OrderSyncState)
+# -------------------------------------------------
+# Watermark'tan geriye doğru güvenlik payı (geç indekslenen paketler için)
+SYNC_SAFETY_OVERLAP_MS = 15 * 60 * 1000
+# Hiç senkron kaydı / last_used_at yoksa geriye bakılacak saat
+SYNC_DEFAULT_HOURS_BACK = 200
+
 # -------------------------------------------------
 # 🔑 Unique Key Tanımları
 # -------------------------------------------------
@@ -35,3 +62,18 @@ ORDERITEM_NORMALIZER = make_normalizer(
     strip_strings=True,
 )
 
+
+# -------------------------------------------------
+# 📦 ReadyToShip listesi
+# -------------------------------------------------
+# True → item'lar header'lar için tek toplu IN sorgusuyla yüklenip siparişe
+# düz liste olarak eklenir (arama / etiket tarafında lazy load olmaz)
+READY_TO_SHIP_EAGER_ITEMS = True
+
+# -------------------------------------------------
+# 🔎 Tam Metin Arama (order_search FTS5)
+# -------------------------------------------------
+# bm25 kolon ağırlıkları: order_no, customer, address, cargo, items
+ORDER_SEARCH_WEIGHTS = (10.0, 6.0, 1.0, 4.0, 3.0)
+# search_orders varsayılan sonuç sayısı
+ORDER_SEARCH_DEFAULT_LIMIT = 50
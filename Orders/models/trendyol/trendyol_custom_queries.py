@@ -1,6 +1,6 @@
 # Orders/custom_queries.py
-from sqlmodel import select, func
-from Orders.models.trendyol.trendyol_models import OrderData
+from sqlmodel import select
+from Orders.models.trendyol.trendyol_models import OrderData, OrderLatest
 from sqlalchemy.orm import aliased
 from sqlalchemy.orm import selectinload
 
@@ -13,30 +13,13 @@ def latest_ready_to_ship_query():
     Her api_account_id + orderNumber için en güncel ReadyToShip siparişleri döner.
     Bu sadece SQLModel query nesnesini üretir, çalıştırma işini get_records yapar.
     """
-    # Subquery → api_account_id + orderNumber için max(lastModifiedDate)
-    subq = (
-        select(
-            OrderData.api_account_id,
-            OrderData.orderNumber,
-            func.max(OrderData.lastModifiedDate).label("max_date")
-        )
-        .group_by(OrderData.api_account_id, OrderData.orderNumber)
-        .subquery()
-    )
-
-    # Ana query → subquery join + ReadyToShip filtrele
-
+    # En güncel snapshot → OrderLatest işaretçisi (save_orders_to_db günceller)
     OD = aliased(OrderData)
 
     stmt = (
         select(OD)
-        .join(
-            subq,
-            (OD.api_account_id == subq.c.api_account_id)
-            & (OD.orderNumber == subq.c.orderNumber)
-            & (OD.lastModifiedDate == subq.c.max_date)
-        )
-        .where(OD.shipmentPackageStatus == "ReadyToShip")
+        .join(OrderLatest, OrderLatest.order_data_id == OD.pk)
+        .where(OrderLatest.shipmentPackageStatus == "ReadyToShip")
         .options(selectinload(OD.api_account))  # 🔑 BURASI
     )
 
@@ -0,0 +1,59 @@
+# Orders/models/trendyol/trendyol_migrations.py
+from Core.utils.migration_utils import Migration, create_index, run_sql
+
+
+# -------------------------------------------------
+# 🧱 orders.db migration'ları (version sırası DEĞİŞTİRİLMEZ, sadece eklenir)
+# -------------------------------------------------
+# Index isimleri trendyol_models içindeki __table_args__ ile aynıdır; yeni
+# kurulumlarda create_all oluşturur, mevcut DB'lere buradan gelir.
+
+_ORDER_LATEST_BACKFILL_SQL = """
+INSERT INTO orderlatest (
+    order_header_id, order_data_id, "orderNumber", api_account_id,
+    "lastModifiedDate", status, "shipmentPackageStatus"
+)
+SELECT od.order_header_id, od.pk, od."orderNumber", od.api_account_id,
+       od."lastModifiedDate", od.status, od."shipmentPackageStatus"
+FROM orderdata AS od
+WHERE od.order_header_id IS NOT NULL
+  AND od.pk = (
+      SELECT x.pk FROM orderdata AS x
+      WHERE x.order_header_id = od.order_header_id
+      ORDER BY x."lastModifiedDate" DESC, x.pk DESC
+      LIMIT 1
+  )
+ON CONFLICT (order_header_id) DO UPDATE SET
+    order_data_id = excluded.order_data_id,
+    "orderNumber" = excluded."orderNumber",
+    api_account_id = excluded.api_account_id,
+    "lastModifiedDate" = excluded."lastModifiedDate",
+    status = excluded.status,
+    "shipmentPackageStatus" = excluded."shipmentPackageStatus"
+"""
+
+
+def _order_search_fts(conn) -> None:
+    # FTS5 tablosu SQLModel metadata'sında yok; kurulum + mevcut siparişlerin indekslenmesi
+    from Orders.processors.order_search import backfill_order_search
+    backfill_order_search(conn)
+
+
+ORDER_MIGRATIONS = [
+    Migration(
+        1,
+        "orderdata (order_header_id, lastModifiedDate) index",
+        create_index("ix_orderdata_header_lastmod", "orderdata",
+                     ["order_header_id", "lastModifiedDate"]),
+    ),
+    Migration(
+        2,
+        "orderlatest backfill",
+        run_sql(_ORDER_LATEST_BACKFILL_SQL),
+    ),
+    Migration(
+        3,
+        "order_search FTS5 tam metin arama tablosu",
+        _order_search_fts,
+    ),
+]
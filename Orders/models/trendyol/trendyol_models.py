@@ -97,6 +97,8 @@ class OrderData(SQLModel, table=True):
         UniqueConstraint("orderNumber", "lastModifiedDate", "api_account_id", name="uq_orderno_lastmod_accountid"),
         Index("ix_orderno_lastmod", "orderNumber", "lastModifiedDate"),
         Index("ix_orderno_status_lastmod", "orderNumber", "status", "lastModifiedDate"),
+        # ⬇ mevcut DB'lere trendyol_migrations ile gelir
+        Index("ix_orderdata_header_lastmod", "order_header_id", "lastModifiedDate"),
     )
 
 
@@ -146,3 +148,36 @@ class OrderItem(SQLModel, table=True):
         Index("ix_orderitem_orderno_productcode", "orderNumber", "productCode"),
     )
 
+
+
+# ---- SENKRON DURUMU: (hesap, statü) başına artımlı çekim watermark'ı ----
+class OrderSyncState(SQLModel, table=True):
+    pk: Optional[int] = Field(default=None, primary_key=True)
+
+    api_account_id: int = Field(foreign_key="apiaccount.pk", index=True, ondelete="CASCADE")
+    status: str = Field(index=True)
+
+    # Bu (hesap, statü) için görülen en yüksek PackageLastModifiedDate (epoch ms)
+    last_modified_date: Optional[int] = None
+    # Son başarılı çekim penceresinin bitişi (epoch ms)
+    synced_until: Optional[int] = None
+
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("api_account_id", "status", name="uq_syncstate_account_status"),
+    )
+
+
+# ---- GÜNCEL HAL: Her sipariş için en son snapshot'a işaretçi ----
+class OrderLatest(SQLModel, table=True):
+    # Header başına tek satır; save_orders_to_db yeni snapshot gelince günceller
+    order_header_id: int = Field(primary_key=True, foreign_key="orderheader.pk", ondelete="CASCADE")
+    order_data_id: int = Field(foreign_key="orderdata.pk", index=True, ondelete="CASCADE")
+
+    orderNumber: str = Field(index=True)
+    api_account_id: Optional[int] = Field(default=None, foreign_key="apiaccount.pk", index=True)
+
+    lastModifiedDate: int
+    status: Optional[str] = Field(default=None, index=True)
+    shipmentPackageStatus: Optional[str] = Field(default=None, index=True)
@@ -4,73 +4,144 @@ from __future__ import annotations
 import sys
 import json
 
+from Core.utils.model_utils import dispose_engines
 from Feedback.processors.pipeline import Result
 from Orders.processors.trendyol_pipeline import save_orders_to_db
 
 
-def _read_stdin_utf8() -> str:
+# Protokol çıktısı için gerçek stdout. save_orders_to_db içindeki print'ler
+# çerçeveleri bozmasın diye sys.stdout, main() içinde stderr'e yönlendirilir.
+_PROTO_OUT = sys.stdout.buffer
+
+
+# ─────────────────────────────────────────
+# Çerçeve formatı (uzunluk önekli NDJSON)
+# ─────────────────────────────────────────
+#   b"<byte uzunluğu>\n" + <UTF-8 JSON> + b"\n"
+# Okuyan taraf gövdeyi satır taramadan tam uzunlukta okur; büyük chunk'larda
+# kopya / birleştirme maliyeti olmaz. Sayı ile başlamayan satırlar eski
+# tek satır JSON formatı olarak kabul edilir.
+
+def encode_frame(obj: dict) -> bytes:
+    body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    return str(len(body)).encode("ascii") + b"\n" + body + b"\n"
+
+
+def _read_frame(stdin) -> bytes | None:
     """
-    QProcess'ten gelen input'u Windows codepage'e takılmadan garanti UTF-8 okur.
-    Kritik nokta: sys.stdin.read() DEĞİL, sys.stdin.buffer.read()
+    Bir sonraki çerçevenin JSON gövdesini döner. EOF'ta None.
     """
-    raw_bytes = sys.stdin.buffer.read()
-    if not raw_bytes:
-        return ""
-    # UTF-8 decode (bozulma burada çözülür)
-    return raw_bytes.decode("utf-8", errors="strict").strip()
+    while True:
+        header = stdin.readline()
+        if not header:
+            return None
+
+        header = header.strip()
+        if not header:
+            continue
+
+        if not header.isdigit():
+            return header  # eski format: tek satır JSON
+
+        size = int(header)
+        body = stdin.read(size)
+        if len(body) < size:
+            return None  # yarım çerçeve → karşı taraf kapandı
+        stdin.readline()  # gövde sonundaki \n
+        return body
+
+
+def _write_frame(obj: dict) -> None:
+    _PROTO_OUT.write(encode_frame(obj))
+    _PROTO_OUT.flush()
+
+
+def _handle_save(payload: dict) -> dict:
+    # payload = {"order_data_list": [...], "order_item_list": [...]}
+    fake_result = Result.ok(
+        "Process içi payload",
+        close_dialog=False,
+        data=payload,
+    )
+
+    res = save_orders_to_db(fake_result)
 
+    return {
+        "success": bool(res.success),
+        "message": res.message,
+        "data": res.data,
+    }
 
-def _write_stdout_json(obj: dict) -> None:
+
+def _handle_request(req: dict) -> dict:
     """
-    Worker output'u tek satır JSON olacak şekilde basar.
-    (process_runner son dolu satırı JSON parse ediyor)
+    İstek formatı:
+        {"id": int, "op": "save", "payload": {...}}   # payload tek bir chunk'tır
+        {"id": int, "op": "ping"}
+    Her chunk kendi transaction'ında commit edilir ve sayıları hemen geri döner.
+    Eski tek seferlik format (op'suz, direkt payload) da desteklenir.
     """
-    sys.stdout.write(json.dumps(obj, ensure_ascii=False))
-    sys.stdout.flush()
+    op = req.get("op")
+
+    if op is None:
+        return _handle_save(req)
+
+    if op == "save":
+        return _handle_save(req.get("payload") or {})
+
+    if op == "ping":
+        return {"success": True, "message": "pong", "data": None}
+
+    return {
+        "success": False,
+        "message": f"db_save_worker: bilinmeyen op '{op}'",
+        "data": None,
+    }
 
 
 def main():
-    try:
-        raw = _read_stdin_utf8()
-        if not raw:
-            _write_stdout_json({
+    """
+    Kalıcı worker döngüsü: stdin'den çerçeve çerçeve istek okur, her isteğe
+    aynı id ile tek çerçeve cevap yazar. stdin kapanınca (EOF) çıkar.
+    """
+    sys.stdout = sys.stderr
+
+    stdin = sys.stdin.buffer
+    while True:
+        body = _read_frame(stdin)
+        if body is None:
+            break  # EOF → UI process kapandı / worker durduruldu
+
+        req_id = None
+        try:
+            # QProcess'ten gelen input garanti UTF-8 (Windows codepage'e takılmadan)
+            req = json.loads(body.decode("utf-8", errors="strict"))
+            del body
+            if not isinstance(req, dict):
+                raise ValueError("İstek JSON objesi olmalı.")
+            req_id = req.get("id")
+
+            resp = _handle_request(req)
+
+        except UnicodeDecodeError as e:
+            resp = {
+                "success": False,
+                "message": f"db_save_worker unicode decode error: {e}",
+                "data": None,
+            }
+
+        except Exception as e:
+            resp = {
                 "success": False,
-                "message": "db_save_worker: Boş input alındı.",
+                "message": f"db_save_worker exception: {e}",
                 "data": None,
-            })
-            return
-
-        payload = json.loads(raw)
-        # payload = {"order_data_list": [...], "order_item_list": [...]}
-
-        fake_result = Result.ok(
-            "Process içi payload",
-            close_dialog=False,
-            data=payload,
-        )
-
-        res = save_orders_to_db(fake_result)
-
-        _write_stdout_json({
-            "success": bool(res.success),
-            "message": res.message,
-            "data": res.data,
-        })
-
-    except UnicodeDecodeError as e:
-        # Eğer input UTF-8 değilse burada patlar (ki biz zaten utf-8 gönderiyoruz)
-        _write_stdout_json({
-            "success": False,
-            "message": f"db_save_worker unicode decode error: {e}",
-            "data": None,
-        })
-
-    except Exception as e:
-        _write_stdout_json({
-            "success": False,
-            "message": f"db_save_worker exception: {e}",
-            "data": None,
-        })
+            }
+
+        resp["id"] = req_id
+        _write_frame(resp)
+
+    # EOF → WAL checkpoint + bağlantıları kapat
+    dispose_engines()
 
 
 if __name__ == "__main__":
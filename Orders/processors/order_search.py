@@ -0,0 +1,302 @@
+# Orders/processors/order_search.py
+from __future__ import annotations
+
+import json
+import re
+import unicodedata
+from typing import Iterable, Optional
+
+from sqlalchemy import Connection
+
+from settings import DB_NAME
+from Core.utils.model_utils import get_engine, batch_iter, SQLITE_MAX_VARIABLES
+from Feedback.processors.pipeline import Result, map_error_to_message, logger
+from Orders.constants.trendyol_constants import ORDER_SEARCH_WEIGHTS, ORDER_SEARCH_DEFAULT_LIMIT
+
+
+# ============================================================
+# 🔎 SİPARİŞ TAM METİN ARAMA (SQLite FTS5)
+# ============================================================
+# Sipariş (OrderHeader) başına tek satır, rowid = orderheader.pk:
+#   order_no  : sipariş no
+#   customer  : müşteri adı / soyadı
+#   address   : teslimat + fatura adresindeki tüm metinler
+#   cargo     : kargo firması + tüm snapshot'lardaki takip numaraları
+#   items     : ürün adı, sku, merchantSku, barkod, ürün kodu
+# Metin hem yazarken hem sorgularken fold_search_text'ten geçer: Türkçe
+# büyük/küçük harf (I→ı, İ→i) + aksan/şapka atma → "IŞIK", "ışık", "isik"
+# aynı token'a düşer, önek araması Türkçe karakterlerden bağımsız çalışır.
+# Tablo migration (v3) ile kurulur; save_orders_to_db dokunduğu siparişleri yeniler.
+
+ORDER_SEARCH_TABLE = "order_search"
+
+_CREATE_SQL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {ORDER_SEARCH_TABLE} USING fts5(
+    order_no, customer, address, cargo, items,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+_TR_CASE = str.maketrans({"I": "ı", "İ": "i"})
+_TR_FOLD = str.maketrans({"ı": "i"})
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fold_search_text(value) -> str:
+    """
+    Türkçe duyarlı küçük harf + aksansız hale getirir.
+    "İSTANBUL Çiçek IŞIK" → "istanbul cicek isik"
+    """
+    if value is None:
+        return ""
+    s = str(value).translate(_TR_CASE).lower()
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return s.translate(_TR_FOLD)
+
+
+def _collect_text(value, out: list[str]) -> None:
+    """JSON adres vb. iç içe yapılardaki metin / sayı yapraklarını toplar."""
+    if value is None or isinstance(value, bool):
+        return
+    if isinstance(value, dict):
+        for v in value.values():
+            _collect_text(v, out)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            _collect_text(v, out)
+    elif isinstance(value, str):
+        # JSON kolonu ham string olarak gelebilir
+        if value[:1] in ("{", "["):
+            try:
+                _collect_text(json.loads(value), out)
+                return
+            except ValueError:
+                pass
+        out.append(value)
+    else:
+        out.append(str(value))
+
+
+def _joined(values: Iterable) -> str:
+    parts: list[str] = []
+    for v in values:
+        _collect_text(v, parts)
+    # aynı metin (ör. aynı ürünün farklı statü satırları) bir kez yazılır
+    return fold_search_text(" ".join(dict.fromkeys(p for p in parts if p)))
+
+
+# ------------------------------------------------------------
+# 🧱 Kurulum / bakım
+# ------------------------------------------------------------
+
+def create_order_search_table(conn: Connection) -> bool:
+    """
+    FTS5 tablosunu oluşturur. SQLite FTS5'siz derlenmişse False döner
+    (arama devre dışı kalır, kayıt akışı etkilenmez).
+    """
+    try:
+        conn.exec_driver_sql(_CREATE_SQL)
+        return True
+    except Exception as e:
+        if "fts5" not in str(e).lower():
+            raise
+        logger.warning(f"[order_search] FTS5 desteklenmiyor, arama kapalı: {e}")
+        return False
+
+
+def order_search_available(conn: Connection) -> bool:
+    row = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (ORDER_SEARCH_TABLE,),
+    ).first()
+    return row is not None
+
+
+def _placeholders(n: int) -> str:
+    return ", ".join("?" * n)
+
+
+def _refresh_rows(conn: Connection, header_ids: list[int]) -> int:
+    """
+    Verilen header'ların arama satırlarını son snapshot + tüm item'lardan yeniden yazar.
+    header_ids tek parça (≤ SQLITE_MAX_VARIABLES) olmalı.
+    """
+    ph = _placeholders(len(header_ids))
+    params = tuple(header_ids)
+
+    docs: dict[int, dict] = {}
+    for hid, order_no, first, last, ship, inv, cargo in conn.exec_driver_sql(
+        f"""
+        SELECT ol.order_header_id, od."orderNumber", od."customerFirstName", od."customerLastName",
+               od."shipmentAddress", od."invoiceAddress", od."cargoProviderName"
+        FROM orderlatest AS ol
+        JOIN orderdata AS od ON od.pk = ol.order_data_id
+        WHERE ol.order_header_id IN ({ph})
+        """,
+        params,
+    ):
+        docs[hid] = {
+            "order_no": [order_no],
+            "customer": [first, last],
+            "address": [ship, inv],
+            "cargo": [cargo],
+            "items": [],
+        }
+
+    for hid, tracking in conn.exec_driver_sql(
+        f"""
+        SELECT DISTINCT order_header_id, "cargoTrackingNumber"
+        FROM orderdata
+        WHERE order_header_id IN ({ph}) AND "cargoTrackingNumber" IS NOT NULL
+        """,
+        params,
+    ):
+        if hid in docs:
+            docs[hid]["cargo"].append(tracking)
+
+    for hid, name, sku, merchant_sku, barcode, code in conn.exec_driver_sql(
+        f"""
+        SELECT order_header_id, "productName", sku, "merchantSku", barcode, "productCode"
+        FROM orderitem
+        WHERE order_header_id IN ({ph})
+        """,
+        params,
+    ):
+        if hid in docs:
+            docs[hid]["items"].extend((name, sku, merchant_sku, barcode, code or None))
+
+    conn.exec_driver_sql(f"DELETE FROM {ORDER_SEARCH_TABLE} WHERE rowid IN ({ph})", params)
+    if docs:
+        conn.exec_driver_sql(
+            f"INSERT INTO {ORDER_SEARCH_TABLE} (rowid, order_no, customer, address, cargo, items) "
+            f"VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    hid,
+                    _joined(d["order_no"]),
+                    _joined(d["customer"]),
+                    _joined(d["address"]),
+                    _joined(d["cargo"]),
+                    _joined(d["items"]),
+                )
+                for hid, d in docs.items()
+            ],
+        )
+    return len(docs)
+
+
+def backfill_order_search(conn: Connection) -> None:
+    """Migration: tabloyu kurar ve mevcut tüm siparişleri indeksler."""
+    if not create_order_search_table(conn):
+        return
+    ids = [r[0] for r in conn.exec_driver_sql("SELECT order_header_id FROM orderlatest ORDER BY 1")]
+    total = 0
+    for part in batch_iter(ids, SQLITE_MAX_VARIABLES):
+        total += _refresh_rows(conn, part)
+    logger.info(f"[order_search] {total} sipariş indekslendi.")
+
+
+def index_order_search(conn: Connection, header_ids) -> int:
+    """
+    Çağıranın transaction'ında arama satırlarını yeniler (save_orders_to_db
+    snapshot'larla birlikte yazar). FTS5 tablosu yoksa 0 döner.
+    """
+    ids = sorted({int(h) for h in header_ids or [] if h is not None})
+    if not ids or not order_search_available(conn):
+        return 0
+    indexed = 0
+    for part in batch_iter(ids, SQLITE_MAX_VARIABLES):
+        indexed += _refresh_rows(conn, part)
+    return indexed
+
+
+# ------------------------------------------------------------
+# 🔍 Sorgu
+# ------------------------------------------------------------
+
+def build_match_query(query: str) -> str:
+    """
+    Kullanıcı metni → FTS5 MATCH ifadesi. Her kelime önek olarak aranır ve
+    hepsi eşleşmeli (AND): "ayşe kad" → "ayse"* "kad"*
+    """
+    tokens = _TOKEN_RE.findall(fold_search_text(query))
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def search_orders(
+    query: str,
+    limit: Optional[int] = ORDER_SEARCH_DEFAULT_LIMIT,
+    shipment_status: Optional[str] = None,
+    account_ids: Optional[Iterable[int]] = None,
+    db_name: str = DB_NAME,
+) -> Result:
+    """
+    Tüm sipariş geçmişinde bm25 sıralı arama (en alakalı önce).
+    limit=None → sınırsız. shipment_status verilirse son snapshot'ın
+    shipmentPackageStatus'una göre daraltılır (ör. "ReadyToShip").
+
+    Result.data = {
+        "results": [{"order_header_id", "orderNumber", "api_account_id",
+                     "status", "shipmentPackageStatus", "lastModifiedDate", "score"}, ...],
+        "match": str,
+    }
+    """
+    try:
+        match = build_match_query(query)
+        if not match:
+            return Result.ok("Boş arama.", close_dialog=False, data={"results": [], "match": match})
+
+        weights = ", ".join(str(float(w)) for w in ORDER_SEARCH_WEIGHTS)
+        where = [f"{ORDER_SEARCH_TABLE} MATCH ?"]
+        params: list = [match]
+
+        if shipment_status:
+            where.append('ol."shipmentPackageStatus" = ?')
+            params.append(shipment_status)
+
+        accounts = sorted({int(a) for a in account_ids or []})
+        if accounts:
+            where.append(f"ol.api_account_id IN ({_placeholders(len(accounts))})")
+            params.extend(accounts)
+
+        params.append(-1 if limit is None else int(limit))
+
+        sql = f"""
+        SELECT ol.order_header_id, ol."orderNumber", ol.api_account_id, ol.status,
+               ol."shipmentPackageStatus", ol."lastModifiedDate",
+               bm25({ORDER_SEARCH_TABLE}, {weights}) AS score
+        FROM {ORDER_SEARCH_TABLE}
+        JOIN orderlatest AS ol ON ol.order_header_id = {ORDER_SEARCH_TABLE}.rowid
+        WHERE {" AND ".join(where)}
+        ORDER BY score
+        LIMIT ?
+        """
+
+        engine = get_engine(db_name)
+        with engine.connect() as conn:
+            if not order_search_available(conn):
+                return Result.fail("Tam metin arama kullanılamıyor (FTS5 yok).", close_dialog=False)
+            rows = conn.exec_driver_sql(sql, tuple(params)).all()
+
+        results = [
+            {
+                "order_header_id": hid,
+                "orderNumber": order_no,
+                "api_account_id": acc,
+                "status": status,
+                "shipmentPackageStatus": pkg_status,
+                "lastModifiedDate": last_mod,
+                "score": score,
+            }
+            for hid, order_no, acc, status, pkg_status, last_mod, score in rows
+        ]
+
+        return Result.ok(
+            f"{len(results)} sipariş bulundu.",
+            close_dialog=False,
+            data={"results": results, "match": match},
+        )
+
+    except Exception as e:
+        return Result.fail(map_error_to_message(e), error=e, close_dialog=False)
@@ -1,17 +1,20 @@
 from Orders.api.trendyol_api import TrendyolApi
-from Core.utils.model_utils import create_records, get_records, get_engine,update_records
+from Core.utils.model_utils import create_records, get_records, get_engine, batch_iter, \
+    SQLITE_MAX_VARIABLES
 import asyncio
 from typing import Optional, Callable
-from Orders.models.trendyol.trendyol_models import OrderItem, OrderData, OrderHeader
+from Orders.models.trendyol.trendyol_models import OrderItem, OrderData, OrderHeader, OrderSyncState, OrderLatest
 from Account.models import ApiAccount
 from Feedback.processors.pipeline import Result, map_error_to_message
 from settings import DB_NAME
 from Orders.constants.trendyol_constants import ORDERDATA_UNIQ, ORDERITEM_UNIQ, ORDERDATA_NORMALIZER, \
-    ORDERITEM_NORMALIZER
+    ORDERITEM_NORMALIZER, PAGE_FETCH_CONCURRENCY, FETCH_ALL_CONCURRENCY, \
+    SYNC_SAFETY_OVERLAP_MS, SYNC_DEFAULT_HOURS_BACK
 from Orders.models.trendyol.trendyol_custom_queries import latest_ready_to_ship_query
+from Orders.processors.order_search import index_order_search
 from sqlmodel import Session, select
 from Orders.signals.signals import order_signals
-from sqlalchemy import func, or_
+from sqlalchemy import or_, update, text, bindparam, tuple_
 from sqlalchemy.orm import aliased
 from sqlalchemy.orm import selectinload
 from Core.utils.time_utils import time_for_now
@@ -55,28 +58,183 @@ async def normalize_order_data(order_data: dict, comp_api_account_id: int):
     return orders, items
 
 
+def load_known_snapshot_keys(snapshot_keys, db_name: str = DB_NAME) -> set:
+    """
+    (orderNumber, api_account_id, lastModifiedDate) üçlülerinden DB'de zaten
+    kayıtlı olanları döner. uq_orderno_lastmod_accountid index'i üzerinden
+    tam eşleşme; SQLite değişken limitine göre parçalı.
+    """
+    triples = sorted({
+        (str(no), acc, int(lm))
+        for no, acc, lm in snapshot_keys or []
+        if no and acc is not None and isinstance(lm, (int, float))
+    })
+    if not triples:
+        return set()
+
+    known: set = set()
+    engine = get_engine(db_name)
+    key_cols = tuple_(OrderData.orderNumber, OrderData.lastModifiedDate, OrderData.api_account_id)
+
+    with engine.connect() as conn:
+        for part in batch_iter(triples, SQLITE_MAX_VARIABLES // 3):
+            rows = conn.execute(
+                select(OrderData.orderNumber, OrderData.api_account_id, OrderData.lastModifiedDate)
+                .where(key_cols.in_([(no, lm, acc) for no, acc, lm in part]))
+            )
+            known.update((no, acc, lm) for no, acc, lm in rows)
+
+    return known
+
+
+def filter_known_snapshots(order_data_list: list, order_item_list: list, db_name: str = DB_NAME):
+    """
+    Normalize edilmiş listelerden DB'de zaten olan snapshot'ları ve SADECE
+    onlara ait item'ları çıkarır. Item'lar (orderNumber, api_account_id,
+    order_data_id) ile snapshot'a bağlanır; aynı paketin yeni bir snapshot'ı
+    batch'te varsa item'ları korunur.
+
+    Dönüş: (order_data_list, order_item_list, {"snapshots": n, "items": m})
+    """
+    known = load_known_snapshot_keys(
+        [(od.get("orderNumber"), od.get("api_account_id"), od.get("lastModifiedDate"))
+         for od in order_data_list],
+        db_name=db_name,
+    )
+    if not known:
+        return order_data_list, order_item_list, {"snapshots": 0, "items": 0}
+
+    kept_orders, skipped_pkgs, kept_pkgs = [], set(), set()
+    for od in order_data_list:
+        key = (str(od.get("orderNumber")), od.get("api_account_id"), od.get("lastModifiedDate"))
+        pkg = (key[0], key[1], od.get("id"))
+        if key in known:
+            skipped_pkgs.add(pkg)
+        else:
+            kept_pkgs.add(pkg)
+            kept_orders.append(od)
+
+    drop_pkgs = skipped_pkgs - kept_pkgs
+    kept_items = [
+        oi for oi in order_item_list
+        if (str(oi.get("orderNumber")), oi.get("api_account_id"), oi.get("order_data_id")) not in drop_pkgs
+    ]
+
+    return kept_orders, kept_items, {
+        "snapshots": len(order_data_list) - len(kept_orders),
+        "items": len(order_item_list) - len(kept_items),
+    }
+
+
 async def fetch_orders_for_status(api, status: str, comp_api_account_id: int,
                                   start_page: int, final_ep_time: int, start_ep_time: int,
-                                  progress_callback=None, total_steps=1, current_step_ref=None):
-    orders, items = [], []
-    page = start_page
+                                  progress_callback=None, total_steps=1, current_step_ref=None,
+                                  page_concurrency: int = PAGE_FETCH_CONCURRENCY,
+                                  page_callback: Optional[Callable[[dict], None]] = None,
+                                  skip_known: bool = True, db_name: str = DB_NAME):
+    """
+    İlk sayfayı çeker, totalPages öğrenildikten sonra kalan sayfaları
+    page_concurrency sınırı altında eşzamanlı çeker. Sayfalar sırasıyla işlenir.
 
-    while True:
-        res = await api.find_orders(status, final_ep_time, start_ep_time, page)
-        if not res.success:
-            return Result.fail(f"API hatası ({status}) → {res.message}",
-                               error=res.error, close_dialog=False)
+    page_callback verilirse her sayfa normalize edilir edilmez
+    {"order_data_list": [...], "order_item_list": [...]} olarak ona verilir
+    ve sonuçta biriktirilmez (DB'ye akış halinde gönderim için).
 
-        content = res.data.get("content", [])
-        if not content:
-            break
+    skip_known=True → DB'de (orderNumber, api_account_id, lastModifiedDate) ile
+    zaten kayıtlı snapshot'lar normalize / IPC öncesi atlanır ("skipped" sayıları).
+    """
+    orders, items = [], []
+    keys: list[tuple] = []
+    max_last_modified = [None]
+    skipped = {"snapshots": 0, "items": 0}
+
+    async def _consume(content: list):
+        keys.extend((str(od.get("orderNumber")), comp_api_account_id) for od in content)
 
+        for order_data in content:
+            lm = order_data.get("lastModifiedDate")
+            if isinstance(lm, (int, float)) and (max_last_modified[0] is None or lm > max_last_modified[0]):
+                max_last_modified[0] = int(lm)
+
+        if skip_known and content:
+            known = await asyncio.to_thread(
+                load_known_snapshot_keys,
+                [(od.get("orderNumber"), comp_api_account_id, od.get("lastModifiedDate")) for od in content],
+                db_name,
+            )
+            if known:
+                fresh = []
+                for od in content:
+                    if (str(od.get("orderNumber")), comp_api_account_id, od.get("lastModifiedDate")) in known:
+                        skipped["snapshots"] += 1
+                        skipped["items"] += len(od.get("lines") or [])
+                    else:
+                        fresh.append(od)
+                content = fresh
+
+        page_orders, page_items = [], []
         for order_data in content:
             norm_orders, norm_items = await normalize_order_data(order_data, comp_api_account_id)
-            orders.extend(norm_orders)
-            items.extend(norm_items)
+            page_orders.extend(norm_orders)
+            page_items.extend(norm_items)
 
-        page += 1
+        if not page_orders and not page_items:
+            return
+
+        if page_callback:
+            page_callback({"order_data_list": page_orders, "order_item_list": page_items})
+        else:
+            orders.extend(page_orders)
+            items.extend(page_items)
+
+    def _fail(res: Result) -> Result:
+        return Result.fail(f"API hatası ({status}) → {res.message}",
+                           error=res.error, close_dialog=False)
+
+    first_res = await api.find_orders(status, final_ep_time, start_ep_time, start_page)
+    if not first_res.success:
+        return _fail(first_res)
+
+    first_content = first_res.data.get("content", []) or []
+    total_pages = int(first_res.data.get("totalPages", 0) or 0)
+
+    if first_content:
+        await _consume(first_content)
+
+        if total_pages > 0:
+            # ✅ totalPages biliniyor → kalan sayfalar paralel, boş son istek yok
+            sem = asyncio.Semaphore(max(1, page_concurrency))
+
+            async def _fetch_page(page: int):
+                async with sem:
+                    return await api.find_orders(status, final_ep_time, start_ep_time, page)
+
+            tasks = [
+                asyncio.ensure_future(_fetch_page(p))
+                for p in range(start_page + 1, total_pages)
+            ]
+            try:
+                # sırayla bekle → sayfalar sıralı işlenir, indirme paralel sürer
+                for task in tasks:
+                    res = await task
+                    if not res.success:
+                        return _fail(res)
+                    await _consume(res.data.get("content", []) or [])
+            finally:
+                for task in tasks:
+                    task.cancel()
+        else:
+            # totalPages gelmediyse eski davranış: boş sayfaya kadar sırayla
+            page = start_page + 1
+            while True:
+                res = await api.find_orders(status, final_ep_time, start_ep_time, page)
+                if not res.success:
+                    return _fail(res)
+                content = res.data.get("content", []) or []
+                if not content:
+                    break
+                await _consume(content)
+                page += 1
 
     # ✅ Progress bildirimi buraya alındı
     if current_step_ref is not None:
@@ -87,7 +245,13 @@ async def fetch_orders_for_status(api, status: str, comp_api_account_id: int,
     return Result.ok(
         f"{status} için siparişler çekildi.",
         close_dialog=False,
-        data={"orders": orders, "items": items}
+        data={
+            "orders": orders,
+            "items": items,
+            "keys": keys,
+            "max_last_modified": max_last_modified[0],
+            "skipped": skipped,
+        }
     )
 
 
@@ -97,35 +261,110 @@ async def fetch_orders_all(
         start_ep_time: int,
         comp_api_account_list: list,
         start_page: int = 0,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        concurrency: int = FETCH_ALL_CONCURRENCY,
+        sync_windows: Optional[dict] = None,
+        chunk_callback: Optional[Callable[[dict], None]] = None,
 ) -> Result:
+    """
+    Tüm hesapların tüm statülerini aynı loop üzerinde, ortak bir semaphore
+    sınırı altında eşzamanlı çeker.
+
+    sync_windows verilirse her (api_account_id, status) kendi penceresini kullanır
+    (bkz. get_sync_windows); yoksa final_ep_time / start_ep_time ortak penceredir.
+
+    chunk_callback verilirse her sayfa normalize edilir edilmez ona gönderilir
+    (AsyncWorker → DBSaveStream) ve order_data_list / order_item_list boş döner.
+
+    Bir hesap hata verirse diğerleri etkilenmez:
+        Result.data = {
+            "order_data_list": [...],
+            "order_item_list": [...],
+            "errors": {api_account_id: "mesaj", ...},   # sadece hata veren hesaplar
+            "watermarks": [{"api_account_id", "status", "last_modified_date", "synced_until"}, ...],
+            "fetched_keys": [(orderNumber, api_account_id), ...],  # çekilen tüm siparişler
+            "skipped": {"snapshots": n, "items": m},  # DB'de zaten olduğu için atlananlar
+        }
+    watermarks sadece başarılı (hesap, statü) çekimleri içerir; DB kaydı başarılı
+    olduktan sonra save_sync_watermarks ile yazılmalıdır.
+    Tüm hesaplar hata verirse Result.fail döner.
+    """
     try:
         all_orders, all_items = [], []
+        errors: dict[int, str] = {}
+        watermarks: list[dict] = []
+        fetched_keys: list[tuple] = []
+        skipped = {"snapshots": 0, "items": 0}
+        sync_windows = sync_windows or {}
         total_steps = len(comp_api_account_list) * len(status_list)
         current_step_ref = [0]  # ✅ referans tutucu
+        sem = asyncio.Semaphore(max(1, concurrency))
 
+        async def _run(api, status: str, api_account_id: int):
+            window_from, window_to = sync_windows.get(
+                (api_account_id, status), (final_ep_time, start_ep_time)
+            )
+            async with sem:
+                try:
+                    res = await fetch_orders_for_status(api, status, api_account_id,
+                                                        start_page, window_from, window_to,
+                                                        page_callback=chunk_callback)
+                except Exception as e:
+                    res = Result.fail(map_error_to_message(e), error=e, close_dialog=False)
+
+            # ✅ Başarılı/başarısız her adım progress'e sayılır
+            current_step_ref[0] += 1
+            if progress_callback:
+                progress_callback(current_step_ref[0], total_steps)
+
+            return api_account_id, status, window_to, res
+
+        tasks = []
         for comp_api_account in comp_api_account_list:
             api = TrendyolApi(comp_api_account[1], comp_api_account[2], comp_api_account[3])
-            tasks = [
-                fetch_orders_for_status(api, status, comp_api_account[0],
-                                        start_page, final_ep_time, start_ep_time,
-                                        progress_callback, total_steps, current_step_ref)
-                for status in status_list
-            ]
-            results = await asyncio.gather(*tasks)
+            for status in status_list:
+                tasks.append(_run(api, status, comp_api_account[0]))
+
+        results = await asyncio.gather(*tasks)
+
+        for api_account_id, status, window_to, res in results:
+            if not res.success:
+                # aynı hesabın ilk hatası yeterli
+                errors.setdefault(api_account_id, res.message)
+                continue
+
+            all_orders.extend(res.data.get("orders", []))
+            all_items.extend(res.data.get("items", []))
+            fetched_keys.extend(res.data.get("keys", []))
+            for k, v in (res.data.get("skipped") or {}).items():
+                skipped[k] = skipped.get(k, 0) + v
+            watermarks.append({
+                "api_account_id": api_account_id,
+                "status": status,
+                "last_modified_date": res.data.get("max_last_modified"),
+                "synced_until": window_to,
+            })
 
-            for res in results:
-                if not res.success:
-                    return res
+        if comp_api_account_list and len(errors) == len(comp_api_account_list):
+            return Result.fail(
+                "Hiçbir hesaptan sipariş çekilemedi. " + " | ".join(errors.values()),
+                close_dialog=False,
+                data={"errors": errors},
+            )
 
-                all_orders.extend(res.data.get("orders", []))
-                all_items.extend(res.data.get("items", []))
+        msg = "Siparişler başarıyla çekildi."
+        if errors:
+            msg = f"Siparişler çekildi ({len(errors)} hesapta hata oluştu)."
 
         return Result.ok(
-            "Siparişler başarıyla çekildi.",
+            msg,
             data={
                 "order_data_list": all_orders,
                 "order_item_list": all_items,
+                "errors": errors,
+                "watermarks": watermarks,
+                "fetched_keys": fetched_keys,
+                "skipped": skipped,
             }
         )
 
@@ -136,7 +375,7 @@ async def fetch_orders_all(
 # Orders/processors/trendyol_pipeline.py
 
 from datetime import datetime, timezone, timedelta
-from Core.utils.model_utils import update_records
+from Core.utils.model_utils import update_records_bulk
 from Account.models import ApiAccount  # senin model yoluna göre
 
 TZ_GMT3 = timezone(timedelta(hours=3))
@@ -162,19 +401,181 @@ def update_last_used_at_for_accounts(comp_api_account_list: list, db_name: str =
         # Şu anki zamanı GMT+3 olarak al
         now_local = datetime.now(TZ_GMT3)
 
-        # Basit ve sağlam: tek tek güncelle (hesap sayısı çok büyük değil zaten)
-        for pk in account_pks:
-            update_records(
-                model=ApiAccount,
-                filters={"pk": pk},
-                update_data={"last_used_at": now_local},
+        # Tek UPDATE ... WHERE pk IN (...)
+        res = update_records_bulk(
+            model=ApiAccount,
+            filters={"pk": account_pks},
+            update_data={"last_used_at": now_local},
+            db_name=db_name,
+        )
+        if not res.success:
+            print(f"[last_used_at] update failed: {res.message}")
+
+    except Exception as e:
+        print(f"[last_used_at] update exception: {e}")
+
+
+
+def get_sync_windows(
+        comp_api_account_list: list,
+        status_list: list,
+        now_ms: int,
+        fallback_from_ms: Optional[dict] = None,
+        db_name: str = DB_NAME,
+) -> Result:
+    """
+    Her (api_account_id, status) için çekim penceresini OrderSyncState'ten hesaplar.
+
+    Pencere başlangıcı:
+        max(last_modified_date, synced_until) - SYNC_SAFETY_OVERLAP_MS
+    Kayıt yoksa fallback_from_ms[api_account_id] (örn. hesabın last_used_at'i),
+    o da yoksa SYNC_DEFAULT_HOURS_BACK saat öncesi.
+
+    Dönüş:
+        Result.data = {"windows": {(api_account_id, status): (from_ms, to_ms), ...}}
+    """
+    try:
+        fallback_from_ms = fallback_from_ms or {}
+        account_ids = [acc[0] for acc in comp_api_account_list]
+
+        state_map: dict[tuple, OrderSyncState] = {}
+        if account_ids:
+            res_state = get_records(
+                model=OrderSyncState,
                 db_name=db_name,
+                filters={"api_account_id": account_ids},
             )
+            if not res_state.success:
+                return res_state
+
+            for st in res_state.data.get("records", []) or []:
+                state_map[(st.api_account_id, st.status)] = st
+
+        default_from = now_ms - SYNC_DEFAULT_HOURS_BACK * 60 * 60 * 1000
+
+        windows: dict[tuple, tuple] = {}
+        for acc_id in account_ids:
+            for status in status_list:
+                st = state_map.get((acc_id, status))
+                marks = [
+                    v for v in (
+                        getattr(st, "last_modified_date", None),
+                        getattr(st, "synced_until", None),
+                    ) if v
+                ]
+                if marks:
+                    from_ms = max(marks) - SYNC_SAFETY_OVERLAP_MS
+                else:
+                    from_ms = fallback_from_ms.get(acc_id) or default_from
+
+                windows[(acc_id, status)] = (min(from_ms, now_ms), now_ms)
+
+        return Result.ok(
+            f"{len(windows)} senkron penceresi hesaplandı.",
+            close_dialog=False,
+            data={"windows": windows},
+        )
 
     except Exception as e:
-        print(f"[last_used_at] update exception: {e}")
+        return Result.fail(map_error_to_message(e), error=e, close_dialog=False)
 
 
+def save_sync_watermarks(watermarks: list[dict], db_name: str = DB_NAME) -> Result:
+    """
+    fetch_orders_all'ın döndürdüğü watermark'ları OrderSyncState'e yazar.
+    Değerler sadece ileri gider (mevcut kayıttan küçükse korunur).
+    Sadece sipariş kaydı başarıyla tamamlandıktan sonra çağrılmalıdır.
+    """
+    try:
+        if not watermarks:
+            return Result.ok("Yazılacak watermark yok.", close_dialog=False, data={"affected": 0})
+
+        account_ids = list({w["api_account_id"] for w in watermarks})
+        res_state = get_records(
+            model=OrderSyncState,
+            db_name=db_name,
+            filters={"api_account_id": account_ids},
+        )
+        if not res_state.success:
+            return res_state
+
+        existing = {
+            (st.api_account_id, st.status): st
+            for st in res_state.data.get("records", []) or []
+        }
+
+        def _max(a, b):
+            vals = [v for v in (a, b) if v is not None]
+            return max(vals) if vals else None
+
+        now = datetime.utcnow()
+        rows = []
+        for w in watermarks:
+            key = (w["api_account_id"], w["status"])
+            st = existing.get(key)
+            rows.append({
+                "api_account_id": key[0],
+                "status": key[1],
+                "last_modified_date": _max(w.get("last_modified_date"),
+                                           getattr(st, "last_modified_date", None)),
+                "synced_until": _max(w.get("synced_until"), getattr(st, "synced_until", None)),
+                "updated_at": now,
+            })
+
+        return create_records(
+            model=OrderSyncState,
+            data_list=rows,
+            db_name=db_name,
+            conflict_keys=["api_account_id", "status"],
+            mode="update",
+        )
+
+    except Exception as e:
+        return Result.fail(map_error_to_message(e), error=e, close_dialog=False)
+
+
+def _resolve_header_pks(conn, header_keys) -> dict[tuple, int]:
+    """Verilen bağlantı üzerinden (aynı transaction'daki yeni header'lar dahil) pk eşlemesi."""
+    pairs = sorted(
+        {(str(no), acc) for no, acc in header_keys or [] if no and acc is not None},
+        key=lambda k: (k[1], k[0]),
+    )
+
+    header_pk_map: dict[tuple, int] = {}
+    key_cols = tuple_(OrderHeader.orderNumber, OrderHeader.api_account_id)
+    for part in batch_iter(pairs, SQLITE_MAX_VARIABLES // 2):
+        rows = conn.execute(
+            select(OrderHeader.orderNumber, OrderHeader.api_account_id, OrderHeader.pk)
+            .where(key_cols.in_(part))
+        )
+        for order_no, acc_id, pk in rows:
+            header_pk_map[(order_no, acc_id)] = pk
+    return header_pk_map
+
+
+def resolve_header_pks(header_keys, db_name: str = DB_NAME) -> Result:
+    """
+    (orderNumber, api_account_id) çiftleri → OrderHeader.pk eşlemesi.
+    (orderNumber, api_account_id) IN (VALUES (?, ?), ...) ile sadece istenen
+    çiftler döner (IN × IN çapraz çarpım yok); parçalar SQLite değişken
+    limitinin altında kalır. Maliyet çift sayısıyla doğrusal.
+
+    Result.data = {"header_pk_map": {(orderNumber, api_account_id): pk}}
+    """
+    try:
+        engine = get_engine(db_name)
+        with engine.connect() as conn:
+            header_pk_map = _resolve_header_pks(conn, header_keys)
+
+        return Result.ok(
+            f"{len(header_pk_map)} header çözüldü.",
+            close_dialog=False,
+            data={"header_pk_map": header_pk_map},
+        )
+
+    except Exception as e:
+        return Result.fail(map_error_to_message(e), error=e, close_dialog=False)
+
 
 def save_orders_to_db(result: Result, db_name: str = DB_NAME) -> Result:
     """
@@ -184,6 +585,7 @@ def save_orders_to_db(result: Result, db_name: str = DB_NAME) -> Result:
       Result.data = {
          "changed": bool,   # ✅ DB'de gerçekten değişiklik oldu mu?
          "counts": { ... }  # (opsiyonel) debug amaçlı sayılar
+         "changed_keys": [[orderNumber, api_account_id], ...]  # UI'da yamalanacak siparişler
       }
     """
     try:
@@ -196,14 +598,25 @@ def save_orders_to_db(result: Result, db_name: str = DB_NAME) -> Result:
         order_data_list = result.data.get("order_data_list", []) or []
         order_item_list = result.data.get("order_item_list", []) or []
 
-        # Değişiklik oldu mu?
+        # Değişiklik oldu mu? Hangi siparişlerde?
         changed = False
+        changed_keys: set[tuple] = set()
+        search_header_ids: set[int] = set()  # arama index'i yenilenecek header'lar
         counts = {
             "headers_inserted": 0,
             "data_inserted": 0,
             "items_inserted": 0,
+            "snapshots_skipped": 0,
+            "items_skipped": 0,
         }
 
+        # 0️⃣ DB'de zaten olan snapshot'ları (ve sadece onlara ait item'ları) at
+        order_data_list, order_item_list, skipped = filter_known_snapshots(
+            order_data_list, order_item_list, db_name=db_name
+        )
+        counts["snapshots_skipped"] = skipped["snapshots"]
+        counts["items_skipped"] = skipped["items"]
+
         # 1️⃣ Önce OrderHeader upsert için ihtiyaç duyulan (orderNumber, api_account_id) set'i
         header_keys: set[tuple] = {
             (od.get("orderNumber"), od.get("api_account_id"))
@@ -219,102 +632,131 @@ def save_orders_to_db(result: Result, db_name: str = DB_NAME) -> Result:
                 data={
                     "changed": False,
                     "counts": counts,
+                    "changed_keys": [],
                 }
             )
 
-        # 1️⃣.1 Header kayıtlarını upsert et (sadece gerekli kombinasyonlar)
-        if header_keys:
-            res_headers = create_records(
-                model=OrderHeader,
-                data_list=[
-                    {"orderNumber": order_number, "api_account_id": api_account_id}
-                    for order_number, api_account_id in header_keys
-                ],
-                db_name=db_name,
-                conflict_keys=["orderNumber", "api_account_id"],
-                mode="ignore",
-            )
-            if not res_headers.success:
-                return res_headers
-
-            inserted = res_headers.data.get("inserted", 0) if res_headers.data else 0
-            counts["headers_inserted"] = inserted
-            if inserted > 0:
-                changed = True
-
-        # 2️⃣ Sadece ilgili header'ları çek (tüm tabloyu değil)
-        header_pk_map: dict[tuple, int] = {}
-
-        if header_keys:
-            order_numbers = {k[0] for k in header_keys}
-            api_account_ids = {k[1] for k in header_keys}
-
-            res_header_rows = get_records(
-                model=OrderHeader,
-                db_name=db_name,
-                filters={
-                    "orderNumber": list(order_numbers),
-                    "api_account_id": list(api_account_ids),
-                }
-            )
-            if not res_header_rows.success:
-                return res_header_rows
-
-            header_rows = res_header_rows.data.get("records", []) or []
-            header_pk_map = {
-                (h.orderNumber, h.api_account_id): h.pk
-                for h in header_rows
-            }
-
-        # 3️⃣ OrderData’ya order_header_id ekle
-        for od in order_data_list:
-            key = (od.get("orderNumber"), od.get("api_account_id"))
-            od["order_header_id"] = header_pk_map.get(key)
-
-        if order_data_list:
-            res_data = create_records(
-                model=OrderData,
-                data_list=order_data_list,
-                db_name=db_name,
-                conflict_keys=ORDERDATA_UNIQ,
-                mode="ignore",
-                normalizer=ORDERDATA_NORMALIZER,
-                chunk_size=1000,
-                drop_unknown=True,
-                rename_map={},
-            )
-            if not res_data.success:
-                return res_data
-
-            inserted = res_data.data.get("inserted", 0) if res_data.data else 0
-            counts["data_inserted"] = inserted
-            if inserted > 0:
-                changed = True
-
-        # 4️⃣ OrderItem’a order_header_id ekle
-        for oi in order_item_list:
-            key = (oi.get("orderNumber"), oi.get("api_account_id"))
-            oi["order_header_id"] = header_pk_map.get(key)
-
-        if order_item_list:
-            res_items = create_records(
-                model=OrderItem,
-                data_list=order_item_list,
-                db_name=db_name,
-                conflict_keys=ORDERITEM_UNIQ,
-                mode="ignore",
-                normalizer=ORDERITEM_NORMALIZER,
-                chunk_size=1000,
-                drop_unknown=True,
-                rename_map={"3pByTrendyol": "byTrendyol3"},
+        # 1️⃣.1 → 5️⃣ Chunk tek transaction'da yazılır: header, snapshot, OrderLatest,
+        # item ve arama satırlarından biri düşerse hepsi geri alınır. 0️⃣'daki atlama
+        # bu yüzden güvenli: DB'deki snapshot'ın item'ları ve işaretçisi de yazılmıştır.
+        engine = get_engine(db_name)
+        with engine.begin() as conn:
+
+            def _abort(res: Result) -> Result:
+                conn.rollback()
+                return res
+
+            # 1️⃣.1 Header kayıtlarını upsert et (sadece gerekli kombinasyonlar)
+            headers_inserted = 0
+            if header_keys:
+                res_headers = create_records(
+                    model=OrderHeader,
+                    data_list=[
+                        {"orderNumber": order_number, "api_account_id": api_account_id}
+                        for order_number, api_account_id in header_keys
+                    ],
+                    db_name=db_name,
+                    conflict_keys=["orderNumber", "api_account_id"],
+                    mode="ignore",
+                    conn=conn,
+                )
+                if not res_headers.success:
+                    return _abort(res_headers)
+
+                headers_inserted = res_headers.data.get("inserted", 0) if res_headers.data else 0
+
+            # 2️⃣ Sadece ilgili header'ları çek: tam (orderNumber, api_account_id) çiftleri
+            header_pk_map: dict[tuple, int] = _resolve_header_pks(conn, header_keys) if header_keys else {}
+
+            # 3️⃣ OrderData’ya order_header_id ekle
+            for od in order_data_list:
+                key = (od.get("orderNumber"), od.get("api_account_id"))
+                od["order_header_id"] = header_pk_map.get(key)
+
+            data_inserted = 0
+            touched: set = set()
+            if order_data_list:
+                res_data = create_records(
+                    model=OrderData,
+                    data_list=order_data_list,
+                    db_name=db_name,
+                    conflict_keys=ORDERDATA_UNIQ,
+                    mode="ignore",
+                    normalizer=ORDERDATA_NORMALIZER,
+                    chunk_size=1000,
+                    drop_unknown=True,
+                    rename_map={},
+                    conn=conn,
+                )
+                if not res_data.success:
+                    return _abort(res_data)
+
+                data_inserted = res_data.data.get("inserted", 0) if res_data.data else 0
+
+                # 3️⃣.1 Yeni snapshot gelen header'ların OrderLatest işaretçisini güncelle
+                if data_inserted > 0:
+                    touched = {
+                        od.get("order_header_id")
+                        for od in order_data_list
+                        if od.get("order_header_id") is not None
+                    }
+                    _upsert_order_latest(conn, touched)
+
+            # 4️⃣ OrderItem’a order_header_id ekle
+            for oi in order_item_list:
+                key = (oi.get("orderNumber"), oi.get("api_account_id"))
+                oi["order_header_id"] = header_pk_map.get(key)
+
+            items_inserted = 0
+            if order_item_list:
+                res_items = create_records(
+                    model=OrderItem,
+                    data_list=order_item_list,
+                    db_name=db_name,
+                    conflict_keys=ORDERITEM_UNIQ,
+                    mode="ignore",
+                    normalizer=ORDERITEM_NORMALIZER,
+                    chunk_size=1000,
+                    drop_unknown=True,
+                    rename_map={"3pByTrendyol": "byTrendyol3"},
+                    conn=conn,
+                )
+                if not res_items.success:
+                    return _abort(res_items)
+
+                items_inserted = res_items.data.get("inserted", 0) if res_items.data else 0
+
+            # 5️⃣ Tam metin arama satırları (son snapshot + item'lar), aynı transaction
+            if data_inserted > 0:
+                search_header_ids.update(touched)
+            if items_inserted > 0:
+                search_header_ids.update(
+                    oi["order_header_id"] for oi in order_item_list
+                    if oi.get("order_header_id") is not None
+                )
+            if search_header_ids:
+                index_order_search(conn, search_header_ids)
+
+        # Sayaçlar sadece commit sonrası
+        counts["headers_inserted"] = headers_inserted
+        counts["data_inserted"] = data_inserted
+        counts["items_inserted"] = items_inserted
+        if headers_inserted > 0:
+            changed = True
+
+        if data_inserted > 0:
+            changed = True
+            # ignore modunda hangi satırın girdiği bilinmez; bilinen snapshot'lar
+            # 0️⃣'da elendiği için kalanlar (üst küme) yeterli
+            changed_keys.update(header_keys)
+
+        if items_inserted > 0:
+            changed = True
+            changed_keys.update(
+                (oi.get("orderNumber"), oi.get("api_account_id"))
+                for oi in order_item_list
+                if oi.get("orderNumber") and oi.get("api_account_id") is not None
             )
-            if not res_items.success:
-                return res_items
-
-            inserted = res_items.data.get("inserted", 0) if res_items.data else 0
-            counts["items_inserted"] = inserted
-            if inserted > 0:
-                changed = True
 
         print("KAYIT TAMAMLANDI. changed =", changed, "counts =", counts)
 
@@ -327,6 +769,9 @@ def save_orders_to_db(result: Result, db_name: str = DB_NAME) -> Result:
             data={
                 "changed": changed,
                 "counts": counts,
+                "changed_keys": [
+                    [str(no), acc] for no, acc in sorted(changed_keys, key=lambda k: (k[1], str(k[0])))
+                ],
             }
         )
 
@@ -334,12 +779,149 @@ def save_orders_to_db(result: Result, db_name: str = DB_NAME) -> Result:
         return Result.fail(map_error_to_message(e), error=e)
 
 
+# OrderLatest: header başına en son snapshot (lastModifiedDate, eşitlikte pk).
+# order_header_id index'i üzerinden header başına tek nokta sorgusu; geçmişin
+# uzunluğundan bağımsız. Daha eski bir snapshot geç gelirse işaretçi geri gitmez.
+_ORDER_LATEST_UPSERT_SQL = """
+INSERT INTO orderlatest (
+    order_header_id, order_data_id, "orderNumber", api_account_id,
+    "lastModifiedDate", status, "shipmentPackageStatus"
+)
+SELECT od.order_header_id, od.pk, od."orderNumber", od.api_account_id,
+       od."lastModifiedDate", od.status, od."shipmentPackageStatus"
+FROM orderdata AS od
+WHERE od.order_header_id IN :header_ids
+  AND od.pk = (
+      SELECT x.pk FROM orderdata AS x
+      WHERE x.order_header_id = od.order_header_id
+      ORDER BY x."lastModifiedDate" DESC, x.pk DESC
+      LIMIT 1
+  )
+ON CONFLICT (order_header_id) DO UPDATE SET
+    order_data_id = excluded.order_data_id,
+    "orderNumber" = excluded."orderNumber",
+    api_account_id = excluded.api_account_id,
+    "lastModifiedDate" = excluded."lastModifiedDate",
+    status = excluded.status,
+    "shipmentPackageStatus" = excluded."shipmentPackageStatus"
+WHERE excluded."lastModifiedDate" >= orderlatest."lastModifiedDate"
+"""
+
+
+def _upsert_order_latest(conn, header_ids) -> int:
+    """Çağıranın transaction'ında OrderLatest upsert'ü; etkilenen satır sayısını döner."""
+    stmt = text(_ORDER_LATEST_UPSERT_SQL).bindparams(bindparam("header_ids", expanding=True))
+    ids = sorted({int(h) for h in header_ids if h is not None})
+    affected = 0
+    for part in batch_iter(ids, SQLITE_MAX_VARIABLES):
+        affected += conn.execute(stmt, {"header_ids": part}).rowcount or 0
+    return affected
+
+
+def mark_orders_processed(
+        order_keys: list,
+        *,
+        extracted: bool = False,
+        printed: bool = False,
+        db_name: str = DB_NAME,
+) -> Result:
+    """
+    Etiket çıktısı / yazdırma sonrası OrderHeader bayraklarını TOPLU işaretler.
+
+    order_keys: [(orderNumber, api_account_id), ...]
+    - extracted=True → is_extracted=True, extracted_at=şimdi (epoch ms)
+    - printed=True   → is_printed=True,   printed_at=şimdi (epoch ms)
+
+    Tek transaction; hesap başına UPDATE ... WHERE api_account_id = ? AND orderNumber IN (...)
+    (IN listesi SQLite değişken limitine göre parçalanır).
+    UI thread'inden değil SyncWorker içinden çağrılmalıdır.
+
+    Result.data:
+        {"affected": int, "order_keys": [(orderNumber, api_account_id), ...], "fields": {...}}
+    """
+    try:
+        now_ms = time_for_now()
+
+        fields = {}
+        if extracted:
+            fields.update({"is_extracted": True, "extracted_at": now_ms})
+        if printed:
+            fields.update({"is_printed": True, "printed_at": now_ms})
+        if not fields:
+            return Result.fail("İşaretlenecek bayrak belirtilmedi.", close_dialog=False)
+
+        by_account: dict = {}
+        for key in order_keys or []:
+            try:
+                order_no, acc_id = key
+            except (TypeError, ValueError):
+                continue
+            order_no = str(order_no or "").strip()
+            if order_no:
+                by_account.setdefault(acc_id, set()).add(order_no)
+
+        keys = [(no, acc) for acc, nums in by_account.items() for no in sorted(nums)]
+        if not keys:
+            return Result.ok(
+                "İşaretlenecek sipariş yok.",
+                close_dialog=False,
+                data={"affected": 0, "order_keys": [], "fields": fields},
+            )
+
+        affected = 0
+        engine = get_engine(db_name)
+        with engine.begin() as conn:
+            for acc_id, nums in by_account.items():
+                acc_cond = (
+                    OrderHeader.api_account_id.is_(None) if acc_id is None
+                    else OrderHeader.api_account_id == acc_id
+                )
+                chunk = SQLITE_MAX_VARIABLES - len(fields) - 1
+                for part in batch_iter(sorted(nums), chunk):
+                    stmt = (
+                        update(OrderHeader)
+                        .where(acc_cond, OrderHeader.orderNumber.in_(part))
+                        .values(**fields)
+                    )
+                    affected += conn.execute(stmt).rowcount or 0
+
+        return Result.ok(
+            f"{affected} sipariş işaretlendi.",
+            close_dialog=False,
+            data={"affected": affected, "order_keys": keys, "fields": fields},
+        )
+
+    except Exception as e:
+        return Result.fail(map_error_to_message(e), error=e, close_dialog=False)
+
+
 
 
 import copy
 
 
-def get_latest_ready_to_ship_orders() -> Result:
+def _load_latest_items(session: Session, header_ids) -> dict[int, list[OrderItem]]:
+    """
+    header_id → güncel OrderItem listesi. Aynı ürünün statü değişimleri ayrı satır
+    olarak tutulduğu için ürün kodu başına en son eklenen (en büyük pk) satır kalır.
+    """
+    latest: dict[tuple, OrderItem] = {}
+    for part in batch_iter(sorted(header_ids), SQLITE_MAX_VARIABLES):
+        stmt = (
+            select(OrderItem)
+            .where(OrderItem.order_header_id.in_(part))
+            .order_by(OrderItem.pk)
+        )
+        for oi in session.exec(stmt):
+            latest[(oi.order_header_id, oi.productCode)] = oi
+
+    items_by_header: dict[int, list[OrderItem]] = {}
+    for (hid, _code), oi in latest.items():
+        items_by_header.setdefault(hid, []).append(oi)
+    return items_by_header
+
+
+def get_latest_ready_to_ship_orders(order_keys=None, db_name: str = DB_NAME, with_items: bool = False) -> Result:
     """
     ReadyToShip siparişlerin son snapshot'ını OrderHeader JOIN ile döndürür.
     Runtime olarak OrderData instance'larına şu alanlar eklenir:
@@ -349,40 +931,27 @@ def get_latest_ready_to_ship_orders() -> Result:
         - printed_at
     Deepcopy KALDIRILMIŞTIR (runtime attribute'lar kaybolmasın diye).
     Dönen tüm OrderData nesneleri Session kapandığı için detached'tır → UI'da güvenlidir.
+
+    order_keys: [(orderNumber, api_account_id), ...] verilirse sadece bu siparişler
+    sorgulanır (UI'da diff tabanlı yama). Dönmeyen anahtar = artık ReadyToShip değil.
+
+    with_items=True → her siparişe `items` düz liste olarak eklenir: header başına
+    güncel item satırları (ürün kodu başına en son kayıt), tek toplu IN sorgusuyla.
     """
 
     try:
-        engine = get_engine(DB_NAME)
+        engine = get_engine(db_name)
         with Session(engine) as session:
 
-            # 1️⃣ Son snapshot subquery
-            subq = (
-                select(
-                    OrderData.api_account_id,
-                    OrderData.orderNumber,
-                    func.max(OrderData.lastModifiedDate).label("max_date"),
-                )
-                .group_by(OrderData.api_account_id, OrderData.orderNumber)
-                .subquery()
-            )
-
+            # 1️⃣ Son snapshot: OrderLatest işaretçisi (GROUP BY yok)
             OD = aliased(OrderData)
 
             # 2️⃣ Son snapshot + ReadyToShip + Header JOIN
             stmt = (
                 select(OD)
-                .join(
-                    subq,
-                    (OD.api_account_id == subq.c.api_account_id)
-                    & (OD.orderNumber == subq.c.orderNumber)
-                    & (OD.lastModifiedDate == subq.c.max_date),
-                )
-                .join(
-                    OrderHeader,
-                    (OrderHeader.api_account_id == OD.api_account_id)
-                    & (OrderHeader.orderNumber == OD.orderNumber),
-                )
-                .where(OD.shipmentPackageStatus == "ReadyToShip")
+                .join(OrderLatest, OrderLatest.order_data_id == OD.pk)
+                .join(OrderHeader, OrderHeader.pk == OrderLatest.order_header_id)
+                .where(OrderLatest.shipmentPackageStatus == "ReadyToShip")
                 .options(
                     selectinload(OD.api_account),  # logo için
                     selectinload(OD.header),  # extracted/printed için
@@ -390,7 +959,17 @@ def get_latest_ready_to_ship_orders() -> Result:
                 )
             )
 
-            rows: list[OrderData] = session.exec(stmt).all() or []
+            if order_keys is None:
+                rows: list[OrderData] = session.exec(stmt).all() or []
+            else:
+                pairs = sorted(
+                    {(str(no), acc) for no, acc in order_keys if no and acc is not None},
+                    key=lambda k: (k[1], k[0]),
+                )
+                key_cols = tuple_(OrderHeader.orderNumber, OrderHeader.api_account_id)
+                rows = []
+                for part in batch_iter(pairs, SQLITE_MAX_VARIABLES // 2):
+                    rows.extend(session.exec(stmt.where(key_cols.in_(part))).all())
 
             # 3️⃣ Runtime flag'leri ekle
             for od in rows:
@@ -406,6 +985,14 @@ def get_latest_ready_to_ship_orders() -> Result:
                     object.__setattr__(od, "extracted_at", None)
                     object.__setattr__(od, "printed_at", None)
 
+            # 3️⃣.1 Item'lar: header'lar için toplu IN (sipariş başına sorgu yok)
+            if with_items:
+                items_by_header = _load_latest_items(
+                    session, {od.order_header_id for od in rows if od.order_header_id is not None}
+                )
+                for od in rows:
+                    object.__setattr__(od, "items", items_by_header.get(od.order_header_id, []))
+
         # 4️⃣ Session kapandı → tüm objeler artık detached → UI için güvenli
         # deepcopy YOK → runtime flag'ler kaybolmaz
 
@@ -614,7 +1201,8 @@ def get_nonfinal_order_numbers(
 
     Dönüş:
         Result.data = {
-            "order_numbers": ["10627509219", "10703754325", ...]
+            "order_numbers": ["10627509219", "10703754325", ...],
+            "order_keys": [("10627509219", api_account_id), ...],  # sahibi olan hesapla
         }
 
     NOT:
@@ -627,43 +1215,27 @@ def get_nonfinal_order_numbers(
 
         engine = get_engine(DB_NAME)
         with Session(engine) as session:
-            # 1️⃣ Her header için en son OrderData.lastModifiedDate'i bul
-            subq = (
-                select(
-                    OrderData.order_header_id,
-                    func.max(OrderData.lastModifiedDate).label("max_last_modified"),
-                )
-                .group_by(OrderData.order_header_id)
-                .subquery()
-            )
-
-            # 2️⃣ Bu en güncel snapshot'ı OrderData ile join'le,
-            #    status final_statuses içinde OLMAYANları seç.
+            # OrderLatest: header başına en güncel snapshot'ın statüsü
             stmt = (
-                select(OrderHeader.orderNumber)
-                .join(subq, subq.c.order_header_id == OrderHeader.pk)
-                .join(
-                    OrderData,
-                    (OrderData.order_header_id == OrderHeader.pk)
-                    & (OrderData.lastModifiedDate == subq.c.max_last_modified),
-                )
-                .where(~OrderData.status.in_(final_statuses))  # 🔴 BURASI ÖNEMLİ: not_in DEĞİL!
+                select(OrderLatest.orderNumber, OrderLatest.api_account_id)
+                .where(~OrderLatest.status.in_(final_statuses))  # 🔴 BURASI ÖNEMLİ: not_in DEĞİL!
             )
 
             rows = session.exec(stmt).all()
 
         # OrderNumber'ları normalize et (str'e çevir, trimle, tekrarı at)
-        order_numbers_set = {
-            str(num).strip()
-            for num in rows
+        order_keys_set = {
+            (str(num).strip(), api_account_id)
+            for num, api_account_id in rows
             if num is not None and str(num).strip()
         }
-        order_numbers = sorted(order_numbers_set)
+        order_keys = sorted(order_keys_set, key=lambda k: (k[0], k[1] or 0))
+        order_numbers = sorted({k[0] for k in order_keys})
 
         return Result.ok(
             f"{len(order_numbers)} adet final olmayan sipariş bulundu.",
             close_dialog=False,
-            data={"order_numbers": order_numbers},
+            data={"order_numbers": order_numbers, "order_keys": order_keys},
         )
 
     except Exception as e:
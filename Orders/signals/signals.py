@@ -3,7 +3,13 @@ from PyQt6.QtCore import QObject, pyqtSignal
 
 class OrderSignals(QObject):
     # Siparişlerde ekleme/silme/güncelleme olursa tetiklenecek
-    orders_changed = pyqtSignal()
+    # payload = [(orderNumber, api_account_id), ...] → sadece bu satırlar yamalanır
+    # boş liste → hangi siparişlerin değiştiği bilinmiyor, tam yenileme
+    orders_changed = pyqtSignal(list)
+
+    # Sadece bayrakları değişen siparişler (etiket çıktısı / yazdırma sonrası)
+    # payload = ([(orderNumber, api_account_id), ...], {"is_extracted": True, ...})
+    orders_flags_changed = pyqtSignal(list, dict)
 
     # Siparişler UI'da yüklendiğinde tetiklenecek
     orders_loaded = pyqtSignal(list)  # payload = sipariş listesi
@@ -3,12 +3,11 @@
 # ============================================================
 from __future__ import annotations
 
-from PyQt6.QtWidgets import QListWidgetItem
-from PyQt6.QtCore import Qt
 from datetime import datetime, date
+from bisect import bisect_left, bisect_right
+import asyncio
 
 # Core utilities & base classes
-from Core.views.views import SwitchButton, ListSmartItemWidget
 from Core.threads.async_worker import AsyncWorker
 from Core.threads.sync_worker import SyncWorker
 from Core.utils.model_utils import get_engine
@@ -17,7 +16,7 @@ from Feedback.processors.pipeline import MessageHandler, Result, map_error_to_me
 from settings import MEDIA_ROOT
 from datetime import datetime, timezone
 from Orders.processors.trendyol_pipeline import update_last_used_at_for_accounts
-from Core.process.process_runner import DBSaveProcess  # DBSaveProcess'i buradan import ettiğini varsayıyorum
+from Core.process.process_runner import DBSaveProcess, DBSaveStream
 # ============================================================
 # 🧩 DOMAIN IMPORTS
 # ============================================================
@@ -25,12 +24,16 @@ from Orders.processors.trendyol_pipeline import (
     fetch_orders_all,
     save_orders_to_db,
     get_latest_ready_to_ship_orders,
-    get_nonfinal_order_numbers, normalize_order_data
+    get_nonfinal_order_numbers, normalize_order_data,
+    get_sync_windows,
+    save_sync_watermarks,
 )
-from Orders.constants.trendyol_constants import TRENDYOL_STATUS_LIST
+from Orders.constants.trendyol_constants import TRENDYOL_STATUS_LIST, NONFINAL_REFRESH_CONCURRENCY, \
+    READY_TO_SHIP_EAGER_ITEMS
 from Account.models import ApiAccount
 from Account.views.actions import collect_selected_companies, get_company_by_id
 
+from Orders.processors.order_search import search_orders
 from Orders.api.trendyol_api import TrendyolApi
 from Orders.signals.signals import order_signals
 
@@ -76,52 +79,23 @@ def format_order_summary(order) -> dict:
     }
 
 
-def build_order_list(list_widget, orders: list, interaction_cb=None, selection_cb=None) -> Result:
+def build_order_list(list_widget, orders: list) -> Result:
     """
     🧩 Bağlantılı: OrdersListWidget
-    Sipariş listesini QListWidget içine render eder.
-    Performans için setUpdatesEnabled kullanılır.
+    Filtreli sipariş listesini OrdersListModel'e verir (tek model reset).
+    Satır widget'ı yaratılmaz; delegate sadece görünen satırları boyar.
     """
     try:
-        list_widget.setUpdatesEnabled(False)
-        list_widget.clear()
+        model = list_widget.model()
+        model.set_orders(orders)
 
-        if not orders:
-            info_item = QListWidgetItem("Gösterilecek sipariş bulunamadı.")
-            info_item.setFlags(info_item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
-            list_widget.addItem(info_item)
+        count = model.rowCount()
+        if not count:
             return Result.ok("Liste boş, sipariş bulunamadı.", data={"count": 0})
-
-        added = 0
-        for order in orders:
-            display = format_order_summary(order)
-            switch = SwitchButton()
-
-            item_widget = ListSmartItemWidget(
-                title=display["title"],
-                subtitle=display["subtitle"],
-                extra=display["extra"],
-                identifier=display["identifier"],
-                icon_path=display["logo_path"],
-                optional_widget=switch,
-            )
-
-            if interaction_cb:
-                item_widget.interaction.connect(interaction_cb)
-            if selection_cb:
-                item_widget.selectionRequested.connect(selection_cb)
-
-            item = QListWidgetItem(list_widget)
-            item.setSizeHint(item_widget.sizeHint())
-            list_widget.setItemWidget(item, item_widget)
-            added += 1
-
-        return Result.ok(f"{added} sipariş başarıyla listelendi.", data={"count": added})
+        return Result.ok(f"{count} sipariş başarıyla listelendi.", data={"count": count})
 
     except Exception as e:
         return Result.fail(map_error_to_message(e), error=e)
-    finally:
-        list_widget.setUpdatesEnabled(True)
 
 
 def collect_selected_orders(list_widget) -> Result:
@@ -187,13 +161,15 @@ def extract_cargo_names(orders: list) -> list[str]:
 # Yani filtrelemeden önce DB'den verileri almak veya kargo listesini güncellemek gibi.
 # ============================================================
 
-def load_ready_to_ship_orders() -> Result:
+def load_ready_to_ship_orders(order_keys=None) -> Result:
     """
     ReadyToShip siparişleri pipeline’dan çeker ve UI’ye döndürür.
+    order_keys verilirse sadece o siparişler (diff tabanlı yama için).
+    READY_TO_SHIP_EAGER_ITEMS açıksa item'lar da toplu yüklenip eklenir.
     DEBUG: is_extracted ve is_printed ekrana yazılır.
     """
     try:
-        result = get_latest_ready_to_ship_orders()
+        result = get_latest_ready_to_ship_orders(order_keys, with_items=READY_TO_SHIP_EAGER_ITEMS)
         if not result.success:
             return result
 
@@ -211,13 +187,17 @@ def refresh_cargo_filter(combo_box, orders: list) -> Result:
     """
     🧩 Bağlantılı: OrdersManagerWindow._refresh_cargo_filter()
     Kargo firmalarını combobox’a doldurur (UI-safe).
+    Seçili kargo listede hâlâ varsa korunur (diff yamalarında filtre kaymasın).
     """
     try:
+        current = combo_box.currentText()
         combo_box.blockSignals(True)
         combo_box.clear()
         combo_box.addItem("Tümü")
         cargos = extract_cargo_names(orders)
         combo_box.addItems(cargos)
+        if current in cargos:
+            combo_box.setCurrentText(current)
         return Result.ok(f"{len(cargos)} kargo firması yüklendi.", close_dialog=False)
     except Exception as e:
         return Result.fail(map_error_to_message(e), error=e)
@@ -234,7 +214,7 @@ def refresh_cargo_filter(combo_box, orders: list) -> Result:
 
 
 async def _refresh_nonfinal_orders_async(
-        order_numbers: list[str],
+        order_keys: list,
         comp_api_account_list: list,
         progress_callback=None,
 ) -> Result:
@@ -242,6 +222,13 @@ async def _refresh_nonfinal_orders_async(
     Non-final (Delivered / Cancelled olmayan) siparişleri,
     orderNumber üzerinden Trendyol'dan tekrar çekip normalize eder.
 
+    order_keys: [(orderNumber, api_account_id), ...]
+        - Her sipariş SADECE sahibi olan hesaba sorulur.
+        - Sadece orderNumber (str) verilirse eski davranış: tüm hesaplara sorulur.
+
+    İstekler hesaplar arasında eşzamanlı çalışır; supplier bazlı limit
+    trendyol_scheduler tarafından uygulanır.
+
     Dönüş: save_orders_to_db ile uyumlu olacak şekilde
         Result.data = {
             "order_data_list": [...],
@@ -249,7 +236,26 @@ async def _refresh_nonfinal_orders_async(
         }
     """
     try:
-        if not order_numbers:
+        apis: dict = {}
+        for comp_api_account in comp_api_account_list:
+            api_account_id = comp_api_account[0]
+            supplier_id = comp_api_account[1]
+            username = comp_api_account[2]
+            password = comp_api_account[3]
+            apis[api_account_id] = TrendyolApi(supplier_id, username, password)
+
+        # (orderNumber, api_account_id) işleri
+        jobs: list[tuple] = []
+        for key in order_keys or []:
+            if isinstance(key, (list, tuple)):
+                order_no, api_account_id = key[0], key[1]
+                if api_account_id in apis:
+                    jobs.append((order_no, api_account_id))
+            else:
+                for api_account_id in apis:
+                    jobs.append((key, api_account_id))
+
+        if not jobs:
             return Result.ok(
                 "Güncellenecek non-final sipariş bulunamadı.",
                 close_dialog=False,
@@ -259,47 +265,25 @@ async def _refresh_nonfinal_orders_async(
         all_orders: list[dict] = []
         all_items: list[dict] = []
 
-        total_steps = max(len(order_numbers) * len(comp_api_account_list), 1)
-        current_step = 0
-
-        for comp_api_account in comp_api_account_list:
-            api_account_id = comp_api_account[0]
-            supplier_id = comp_api_account[1]
-            username = comp_api_account[2]
-            password = comp_api_account[3]
-
-            api = TrendyolApi(supplier_id, username, password)
-
-            for order_no in order_numbers:
-                res = await api.get_order_by_number(order_no)
-
-                if not res or not isinstance(res, Result):
-                    current_step += 1
-                    if progress_callback:
-                        progress_callback(current_step, total_steps)
-                    continue
+        total_steps = max(len(jobs), 1)
+        current_step = [0]
+        sem = asyncio.Semaphore(NONFINAL_REFRESH_CONCURRENCY)
 
-                if not res.success:
-                    current_step += 1
-                    if progress_callback:
-                        progress_callback(current_step, total_steps)
-                    continue
+        async def _refresh_one(order_no: str, api_account_id: int):
+            async with sem:
+                res = await apis[api_account_id].get_order_by_number(order_no)
 
-                content = res.data.get("content", []) or []
-                if not content:
-                    current_step += 1
-                    if progress_callback:
-                        progress_callback(current_step, total_steps)
-                    continue
-
-                for raw_order in content:
+            if res and isinstance(res, Result) and res.success:
+                for raw_order in res.data.get("content", []) or []:
                     norm_orders, norm_items = await normalize_order_data(raw_order, api_account_id)
                     all_orders.extend(norm_orders)
                     all_items.extend(norm_items)
 
-                current_step += 1
-                if progress_callback:
-                    progress_callback(current_step, total_steps)
+            current_step[0] += 1
+            if progress_callback:
+                progress_callback(current_step[0], total_steps)
+
+        await asyncio.gather(*(_refresh_one(no, acc_id) for no, acc_id in jobs))
 
         return Result.ok(
             f"{len(all_orders)} adet order_data, {len(all_items)} adet order_item normalize edildi.",
@@ -353,8 +337,10 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
         if not comp_api_account_list:
             return Result.fail("Seçili şirketler için API bilgisi bulunamadı.", close_dialog=False)
 
-        # 🔹 Pipeline genel state'i: en az bir aşamada DB değişti mi?
-        state = {"changed": False}
+        # 🔹 Pipeline genel state'i
+        #    synced_accounts: last_used_at'i ilerletilecek (hatasız çekilmiş) hesaplar
+        #    (orders_changed, değişen sipariş anahtarlarıyla DBSaveStream'den gelir)
+        state = {"synced_accounts": list(comp_api_account_list)}
 
         # 3️⃣ Tarih aralığı belirle (Trendyol → startDate / endDate)
         from datetime import datetime, timezone, timedelta
@@ -365,6 +351,7 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
         now_ms = int(now_dt.timestamp() * 1000)  # ms
 
         last_used_ms_list: list[int] = []
+        fallback_from_ms: dict[int, int] = {}  # senkron kaydı olmayan hesaplar için
 
         for acc in comp_api_account_list:
             last_used = acc[4] if isinstance(acc, (list, tuple)) and len(acc) >= 5 else None
@@ -401,6 +388,7 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
 
                 if ms_val is not None:
                     last_used_ms_list.append(ms_val)
+                    fallback_from_ms[acc[0]] = min(ms_val, now_ms)
 
             except Exception:
                 continue
@@ -415,6 +403,15 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
             start_ep_time = now_ms
             final_ep_time = now_ms - HOURS_BACK * 60 * 60 * 1000
 
+        # 🔁 (hesap, statü) bazlı artımlı pencereler (OrderSyncState watermark'ı)
+        res_windows = get_sync_windows(
+            comp_api_account_list,
+            TRENDYOL_STATUS_LIST,
+            now_ms,
+            fallback_from_ms=fallback_from_ms,
+        )
+        sync_windows = res_windows.data.get("windows", {}) if res_windows.success else {}
+
         # ─────────────────────────────
         # Progress helper’lar
         # ─────────────────────────────
@@ -451,28 +448,51 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
             final_ep_time,
             start_ep_time,
             comp_api_account_list,
-            parent=parent_widget
+            parent=parent_widget,
+            kwargs={"sync_windows": sync_windows},
+            emit_chunks=True,
         )
 
         parent_widget.api_worker.progress_changed.connect(
             lambda c, t: main_progress(c, t)
         )
 
+        # 🌊 Normalize edilen her API sayfası hemen DB worker'a akar (chunk başına commit)
+        parent_widget.db_stream = DBSaveStream(parent=parent_widget)
+        parent_widget.api_worker.chunk_ready.connect(parent_widget.db_stream.send)
+        parent_widget.db_stream.progress.connect(parent_widget.on_db_save_progress)
+
         def handle_api_result(main_res: Result):
             if not main_res.success:
+                # o ana kadar akan chunk'lar kaydedilir; watermark ilerletilmez
+                parent_widget.db_stream.close()
                 parent_widget.on_orders_failed(main_res, progress_target)
                 update_progress(progress_target, 0, 100)
                 # hata → buton OrdersTab.on_orders_failed içinde açılıyor
                 return
 
-            # 5️⃣ Ana sonucu DB'ye yaz (DBSaveProcess ile ayrı process)
-            payload_main = {
-                "order_data_list": main_res.data.get("order_data_list", []) or [],
-                "order_item_list": main_res.data.get("order_item_list", []) or [],
-            }
-
+            # ⚠️ Kısmi hata: hata veren hesapların last_used_at'i ilerletilmez
+            account_errors = main_res.data.get("errors") or {}
+            if account_errors:
+                supplier_ids = {acc[0]: acc[3] for acc in comp_api_account_list}
+                MessageHandler.show(
+                    parent_widget,
+                    Result.fail(
+                        "Bazı hesaplardan sipariş çekilemedi:\n" + "\n".join(
+                            f"• {supplier_ids.get(acc_id, acc_id)}: {msg}"
+                            for acc_id, msg in account_errors.items()
+                        ),
+                        close_dialog=False,
+                    ),
+                    only_errors=True,
+                )
+                state["synced_accounts"] = [
+                    acc for acc in comp_api_account_list
+                    if acc[0] not in account_errors
+                ]
 
-            parent_widget.db_process = DBSaveProcess(payload_main, parent=parent_widget)
+            # 5️⃣ Ana sonuç zaten chunk chunk DB worker'a aktı → stream'i kapat,
+            #    tüm chunk'lar commit edilince handle_db_result_main çalışır
 
             def handle_db_result_main(db_payload: dict):
                 if not db_payload.get("success"):
@@ -484,9 +504,9 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
                     return
 
                 data_dict = db_payload.get("data") or {}
-                main_changed = bool(data_dict.get("changed"))
-                if main_changed:
-                    state["changed"] = True
+                # 🔁 Kayıt başarılı → (hesap, statü) watermark'larını ilerlet
+                #    (başarısızlık Result.fail ile loglanır; sonraki sync pencereyi baştan çeker)
+                save_sync_watermarks(main_res.data.get("watermarks", []) or [])
 
                 db_res = Result.ok(
                     db_payload.get("message", "Siparişler başarıyla veritabanına kaydedildi."),
@@ -500,9 +520,7 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
                 try:
                     res_nonfinal = get_nonfinal_order_numbers()
                     if not res_nonfinal.success:
-                        update_last_used_at_for_accounts(comp_api_account_list)
-                        if state["changed"]:
-                            order_signals.orders_changed.emit()
+                        update_last_used_at_for_accounts(state["synced_accounts"])
                         update_progress(progress_target, 100, 100)
                         # ✅ pipeline burada bitti → butonu aç
                         try:
@@ -512,11 +530,16 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
                             pass
                         return
 
-                    order_numbers = res_nonfinal.data.get("order_numbers", []) or []
-                    if not order_numbers:
-                        update_last_used_at_for_accounts(comp_api_account_list)
-                        if state["changed"]:
-                            order_signals.orders_changed.emit()
+                    order_keys = res_nonfinal.data.get("order_keys", []) or []
+
+                    # Ana taramada find_orders sayfalarıyla zaten güncel gelenler atlanır
+                    fetched_keys = {
+                        tuple(k) for k in main_res.data.get("fetched_keys", []) or []
+                    }
+                    order_keys = [k for k in order_keys if tuple(k) not in fetched_keys]
+
+                    if not order_keys:
+                        update_last_used_at_for_accounts(state["synced_accounts"])
                         update_progress(progress_target, 100, 100)
                         # ✅ pipeline burada bitti → butonu aç
                         try:
@@ -529,7 +552,7 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
                     # 7️⃣ Non-final ASYNC Worker (API)
                     parent_widget.bg_api_worker = AsyncWorker(
                         _refresh_nonfinal_orders_async,
-                        order_numbers,
+                        order_keys,
                         comp_api_account_list,
                         parent=parent_widget
                     )
@@ -540,9 +563,7 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
 
                     def handle_bg_api(bg_res: Result):
                         if not bg_res or not isinstance(bg_res, Result) or not bg_res.success:
-                            update_last_used_at_for_accounts(comp_api_account_list)
-                            if state["changed"]:
-                                order_signals.orders_changed.emit()
+                            update_last_used_at_for_accounts(state["synced_accounts"])
                             update_progress(progress_target, 100, 100)
                             # ✅ ana kısım başarılı, non-final patlasa da pipeline bitti → butonu aç
                             try:
@@ -562,9 +583,7 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
 
                         def handle_bg_db(bg_db_payload: dict):
                             if not bg_db_payload.get("success"):
-                                update_last_used_at_for_accounts(comp_api_account_list)
-                                if state["changed"]:
-                                    order_signals.orders_changed.emit()
+                                update_last_used_at_for_accounts(state["synced_accounts"])
                                 update_progress(progress_target, 100, 100)
                                 # ✅ pipeline bitti → buton aç
                                 try:
@@ -574,14 +593,7 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
                                     pass
                                 return
 
-                            bg_data_dict = bg_db_payload.get("data") or {}
-                            bg_changed = bool(bg_data_dict.get("changed"))
-                            if bg_changed:
-                                state["changed"] = True
-
-                            update_last_used_at_for_accounts(comp_api_account_list)
-                            if state["changed"]:
-                                order_signals.orders_changed.emit()
+                            update_last_used_at_for_accounts(state["synced_accounts"])
                             update_progress(progress_target, 100, 100)
                             # ✅ TÜM SÜREÇ BAŞARIYLA BİTTİ → butonu aç
                             try:
@@ -598,9 +610,7 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
 
                 except Exception as e:
                     print(f"Non-final pipeline exception: {e}")
-                    update_last_used_at_for_accounts(comp_api_account_list)
-                    if state["changed"]:
-                        order_signals.orders_changed.emit()
+                    update_last_used_at_for_accounts(state["synced_accounts"])
                     update_progress(progress_target, 100, 100)
                     # ✅ non-final patladı ama ana iş tamam → buton aç
                     try:
@@ -610,8 +620,8 @@ def get_orders_from_companies(parent_widget, company_list_widget, progress_targe
                         pass
                     return
 
-            parent_widget.db_process.finished.connect(handle_db_result_main)
-            parent_widget.db_process.start()
+            parent_widget.db_stream.finished.connect(handle_db_result_main)
+            parent_widget.db_stream.close()
 
         parent_widget.api_worker.result_ready.connect(handle_api_result)
         parent_widget.api_worker.start()
@@ -687,40 +697,195 @@ def get_order_date(order) -> date | None:
     return None
 
 
-def filter_orders(orders: list, filters: dict) -> Result:
+# ------------------------------------------------------------
+# 🗂 Bellek içi filtre index'i
+# ------------------------------------------------------------
+# Her reload'da (orders listesi değişince) bir kez kurulur; her tuş vuruşunda
+# sadece küme kesişimi + bisect aralıkları + tek blob üzerinde str.find çalışır.
+# Metin alanları "\x00", siparişler "\x01" ile ayrılır → eşleşme alan/sipariş
+# sınırını aşamaz (eski "alan içinde geçiyor mu" davranışıyla aynı).
+
+_FIELD_SEP = "\x00"
+_ORDER_SEP = "\x01"
+_DATE_ATTRS = ("shipmentDate", "orderDate", "createdDate")
+
+
+def _loaded_items(order) -> list:
+    """
+    Sadece nesneye zaten bağlı item listesi (lazy load TETİKLENMEZ).
+    """
+    items = vars(order).get("items")
+    return items if isinstance(items, list) else []
+
+
+class _TextColumn:
+    """
+    Siparişler boyunca küçük harfli metinler: tek blob + sipariş başlangıç ofsetleri.
+    Nadir geçen aramada blob.find (C hızında) sadece eşleşmelere uğrar; çok geçen
+    aramada veya aday küme zaten küçükse metinler doğrudan taranır.
+    """
+
+    __slots__ = ("texts", "blob", "starts", "scan_limit")
+
+    def __init__(self, texts: list[str]):
+        self.texts = texts
+        self.starts: list[int] = []
+        offset = 0
+        for t in texts:
+            self.starts.append(offset)
+            offset += len(t) + 1
+        self.blob = _ORDER_SEP.join(texts)
+        self.scan_limit = max(1, len(texts) // 16)
+
+    def search(self, needle: str, candidates: set[int] | None = None) -> set[int]:
+        if not needle:
+            return set(range(len(self.texts))) if candidates is None else set(candidates)
+
+        texts = self.texts
+        if candidates is not None and len(candidates) <= self.scan_limit:
+            return {i for i in candidates if needle in texts[i]}
+
+        if self.blob.count(needle) > self.scan_limit:
+            scan = range(len(texts)) if candidates is None else candidates
+            return {i for i in scan if needle in texts[i]}
+
+        hits: set[int] = set()
+        starts = self.starts
+        blob = self.blob
+        n = len(starts)
+        k = blob.find(needle)
+        while k != -1:
+            pos = bisect_right(starts, k) - 1
+            hits.add(pos)
+            if pos + 1 >= n:
+                break
+            k = blob.find(needle, starts[pos + 1])  # aynı siparişte tekrar arama
+        return hits
+
+
+class OrderFilterIndex:
+    """
+    filter_orders için önceden hesaplanmış index.
+      - global / order_no / customer : küçük harfli metin blob'ları
+      - cargo                        : kargo adı → pozisyon kümesi
+      - pending / processed          : is_printed / is_extracted kovaları
+      - tarih                        : alan başına sıralı (ordinal, pozisyon) dizileri
+    """
+
+    def __init__(self, orders: list):
+        self.orders = orders
+        self.key_pos: dict[tuple, int] = {}
+        self.fts_hits: dict[str, frozenset] = {}  # sorgu → FTS5 isabet anahtarları
+
+        global_texts: list[str] = []
+        order_no_texts: list[str] = []
+        customer_texts: list[str] = []
+        self.cargo: dict = {}
+        self.pending: set[int] = set()
+        self.processed: set[int] = set()
+        dates: dict[str, list[tuple[int, int]]] = {attr: [] for attr in _DATE_ATTRS}
+
+        for i, o in enumerate(orders):
+            self.key_pos[(str(getattr(o, "orderNumber", "")), getattr(o, "api_account_id", None))] = i
+            order_no = str(getattr(o, "orderNumber", "")).lower()
+            cargo_name = getattr(o, "cargoProviderName", None)
+            customer = str(getattr(o, "customerFirstName", "")).lower()
+
+            fields = [order_no, str(getattr(o, "cargoProviderName", "")).lower(), customer]
+            for it in _loaded_items(o):
+                for attr in ("productName", "sku", "merchantSku", "barcode"):
+                    val = getattr(it, attr, None)
+                    if val:
+                        fields.append(str(val).lower())
+            global_texts.append(_FIELD_SEP.join(fields))
+            order_no_texts.append(order_no)
+            customer_texts.append(customer)
+
+            self.cargo.setdefault(cargo_name, set()).add(i)
+
+            if getattr(o, "is_printed", False) or getattr(o, "is_extracted", False):
+                self.processed.add(i)
+            else:
+                self.pending.add(i)
+
+            for attr in _DATE_ATTRS:
+                d = coerce_to_date(getattr(o, attr, None))
+                if d:
+                    dates[attr].append((d.toordinal(), i))
+
+        self.global_text = _TextColumn(global_texts)
+        self.order_no_text = _TextColumn(order_no_texts)
+        self.customer_text = _TextColumn(customer_texts)
+
+        self.dates: dict[str, tuple[list[int], list[int]]] = {}
+        for attr, pairs in dates.items():
+            pairs.sort()
+            self.dates[attr] = ([p[0] for p in pairs], [p[1] for p in pairs])
+
+    def full_text(self, query: str) -> set[int]:
+        """
+        order_search (FTS5) üzerinden: adres, barkod, takip no vb. alanlarda
+        önek eşleşmesi olan yüklü siparişler. Arama yoksa boş küme.
+        İsabetler sorgu başına fts_hits'te tutulur; aynı liste için tekrar sorgulanmaz.
+        """
+        keys = self.fts_hits.get(query)
+        if keys is None:
+            res = search_orders(query, limit=None, shipment_status="ReadyToShip")
+            if not res.success:
+                return set()
+            keys = frozenset(
+                (str(r["orderNumber"]), r["api_account_id"]) for r in res.data.get("results", [])
+            )
+            self.fts_hits[query] = keys
+        return self.positions(keys)
+
+    def positions(self, keys) -> set[int]:
+        """(orderNumber, api_account_id) anahtarlarından bu listedeki pozisyonlar."""
+        key_pos = self.key_pos
+        return {pos for k in keys if (pos := key_pos.get(k)) is not None}
+
+    def date_range(self, df: date, dt: date) -> set[int]:
+        """Üç tarih alanından herhangi biri [df, dt] içinde olanlar."""
+        lo_key, hi_key = df.toordinal(), dt.toordinal()
+        hits: set[int] = set()
+        for ordinals, positions in self.dates.values():
+            lo = bisect_left(ordinals, lo_key)
+            hi = bisect_right(ordinals, hi_key)
+            hits.update(positions[lo:hi])
+        return hits
+
+
+def filter_orders(orders: list, filters: dict, index: OrderFilterIndex | None = None) -> Result:
     """
     🧩 Bağlantılı: OrdersManagerWindow.apply_filters()
     Sipariş listesini filtre parametrelerine göre süzer.
+    index verilmezse (veya başka bir listeye aitse) kurulur ve
+    Result.data["index"] ile geri döner → çağıran bir sonraki filtrede tekrar kullanır.
     """
     try:
-        filtered = list(orders)
+        if index is None or index.orders is not orders:
+            index = OrderFilterIndex(orders)
+
+        candidates: set[int] | None = None  # None = hepsi
+
+        def narrow(hits: set[int]):
+            nonlocal candidates
+            candidates = hits if candidates is None else candidates & hits
 
         # 🟣 Yazdırma / çıkartma durumu filtresi
         #  - "pending"   → hem is_printed = False hem is_extracted = False
         #  - "processed" → is_printed = True veya is_extracted = True
         #  - "all"       → durum filtresi yok
         processed_mode = filters.get("processed_mode", "pending")
-
-        if processed_mode in ("pending", "processed"):
-            tmp = []
-            for o in filtered:
-                is_pr = bool(getattr(o, "is_printed", False))
-                is_ex = bool(getattr(o, "is_extracted", False))
-
-                if processed_mode == "pending":
-                    # Hiç işlenmemiş (ne yazdırılmış ne çıkartılmış)
-                    if not is_pr and not is_ex:
-                        tmp.append(o)
-                else:  # processed
-                    # En az bir işlem görmüş
-                    if is_pr or is_ex:
-                        tmp.append(o)
-            filtered = tmp
+        if processed_mode == "pending":
+            narrow(index.pending)
+        elif processed_mode == "processed":
+            narrow(index.processed)
 
         # ========================================================
-        # 🔍 Diğer filtreler (senin mevcut mantığın)
+        # 🔍 Diğer filtreler
         # ========================================================
-        gtxt = filters.get("global", "").lower()
+        gtxt = filters.get("global", "").lower().strip()
         order_no = filters.get("order_no", "").lower()
         cargo = filters.get("cargo")
         customer = filters.get("customer", "").lower()
@@ -728,49 +893,35 @@ def filter_orders(orders: list, filters: dict) -> Result:
         df = filters.get("date_from")
         dt = filters.get("date_to")
 
-        # --- Genel arama
-        if gtxt:
-            gtxt = gtxt.strip()
-            temp = []
-            for o in filtered:
-                items = getattr(o, "items", [])
-                in_items = any(
-                    gtxt in str(getattr(it, "productName", "")).lower()
-                    or gtxt in str(getattr(it, "productSku", "")).lower()
-                    for it in items
-                )
-                in_order = any(
-                    gtxt in str(getattr(o, f, "")).lower()
-                    for f in ("orderNumber", "cargoProviderName", "customerFirstName")
-                )
-                if in_items or in_order:
-                    temp.append(o)
-            filtered = temp
-
-        # --- Sipariş no
-        if order_no:
-            filtered = [o for o in filtered if order_no in str(getattr(o, "orderNumber", "")).lower()]
-
         # --- Kargo filtresi
         if cargo and cargo != "Tümü":
-            filtered = [o for o in filtered if getattr(o, "cargoProviderName", None) == cargo]
-
-        # --- Müşteri filtresi
-        if customer:
-            filtered = [o for o in filtered if customer in str(getattr(o, "customerFirstName", "")).lower()]
+            narrow(index.cargo.get(cargo, set()))
 
         # --- Tarih filtresi
         if date_enabled and df and dt:
-            tmp = []
-            for o in filtered:
-                for attr in ("shipmentDate", "orderDate", "createdDate"):
-                    d = coerce_to_date(getattr(o, attr, None))
-                    if d and df <= d <= dt:
-                        tmp.append(o)
-                        break
-            filtered = tmp
+            narrow(index.date_range(df, dt))
+
+        # --- Metin filtreleri (genel arama: sipariş no, kargo, müşteri, yüklü item'lar;
+        #     full_text=True ise + FTS5: adres, barkod, sku, takip no — Türkçe önek.
+        #     full_text_hits: DB'ye gitmeden önceki çalışmanın isabetleri — GUI thread)
+        if gtxt:
+            hits = index.global_text.search(gtxt, candidates)
+            if filters.get("full_text"):
+                hits |= index.full_text(gtxt)
+            elif filters.get("full_text_hits"):
+                hits |= index.positions(filters["full_text_hits"].get(gtxt, ()))
+            narrow(hits)
+        if order_no:
+            narrow(index.order_no_text.search(order_no, candidates))
+        if customer:
+            narrow(index.customer_text.search(customer, candidates))
+
+        if candidates is None:
+            filtered = list(orders)
+        else:
+            filtered = [orders[i] for i in sorted(candidates)]
 
-        return Result.ok("Filtre uygulandı.", data={"filtered": filtered})
+        return Result.ok("Filtre uygulandı.", data={"filtered": filtered, "index": index})
 
     except Exception as e:
         return Result.fail(map_error_to_message(e), error=e)
@@ -782,7 +933,8 @@ def start_filter_worker(parent_widget, list_widget, filters: dict) -> SyncWorker
     SyncWorker'ı başlatır, filtre işlemini arka planda yapar.
     UI donmadan sonucu parent’a bildirir.
     """
-    worker = SyncWorker(filter_orders, list_widget.orders, filters)
+    # Index aynı orders listesi için bir kez kurulur (reload / yama → yeni liste)
+    worker = SyncWorker(filter_orders, list_widget.orders, filters, list_widget.filter_index)
 
     def handle_result(result: Result):
         if not result.success:
@@ -790,6 +942,10 @@ def start_filter_worker(parent_widget, list_widget, filters: dict) -> SyncWorker
             parent_widget.selected_count_label.setText("⚠️ Filtreleme başarısız.")
             return
 
+        index = result.data.get("index")
+        if index is not None and index.orders is list_widget.orders:
+            list_widget.filter_index = index
+
         filtered = result.data.get("filtered", [])
         list_widget.apply_filter_result(filtered)
         list_widget.filtered_orders = filtered
@@ -5,18 +5,18 @@ from __future__ import annotations
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QGroupBox, QHBoxLayout,
-    QListWidget, QPushButton, QLineEdit, QComboBox, QGridLayout,
+    QListView, QPushButton, QLineEdit, QComboBox, QGridLayout,
     QDateEdit, QCheckBox, QFrame
 )
 
-from PyQt6.QtCore import Qt, QDate, QTimer, QRegularExpression, pyqtSignal
-from PyQt6.QtGui import QRegularExpressionValidator, QIcon
+from PyQt6.QtCore import Qt, QDate, QTimer, QRegularExpression, pyqtSignal, QAbstractListModel, QModelIndex
+from PyQt6.QtGui import QRegularExpressionValidator, QIcon, QPainter, QColor
 
 from datetime import datetime, date
 
 # Core widgets
 from Core.views.views import (
-    CircularProgressButton, PackageButton, SwitchButton, ListSmartItemWidget, ActionPulseButton
+    CircularProgressButton, PackageButton, SmartListItemDelegate, ActionPulseButton
 )
 from Core.threads.sync_worker import SyncWorker
 from settings import MEDIA_ROOT
@@ -30,6 +30,7 @@ from Orders.views.actions import (
     load_ready_to_ship_orders,
     extract_cargo_names,
     build_order_list,
+    format_order_summary,
     filter_orders,
     refresh_cargo_filter,
     start_filter_worker
@@ -46,72 +47,187 @@ import os
 # 🔹 1. OrdersListWidget — Sipariş Listeleme Bileşeni
 # ============================================================
 
-class OrdersListWidget(QListWidget):
+class OrdersListModel(QAbstractListModel):
     """
-    Siparişleri göstermek için optimize edilmiş özel liste widget'i.
+    Filtreli siparişler üzerinde düz liste modeli.
+    - Metinler format_order_summary ile satır ilk çizildiğinde hesaplanır, cache'lenir.
+    - Toggle = CheckStateRole ↔ order._selected
+    """
+
+    OrderRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._orders: list = []
+        self._display_cache: dict[int, dict] = {}
+
+    # --------------------------------------------------------
+    # 📥 Veri
+    # --------------------------------------------------------
+    def set_orders(self, orders: list):
+        self.beginResetModel()
+        self._orders = list(orders or [])
+        self._display_cache.clear()
+        self.endResetModel()
+
+    def orders(self) -> list:
+        return self._orders
+
+    def notify_all_changed(self, roles: list | None = None):
+        """Tüm satırlar (toplu seçim vb.) değişti; layout sabit, sadece repaint."""
+        if not self._orders:
+            return
+        self.dataChanged.emit(
+            self.index(0, 0),
+            self.index(len(self._orders) - 1, 0),
+            roles or [],
+        )
+
+    def patch_orders(self, keys: set, visible_by_key: dict, key_fn) -> None:
+        """
+        Sadece 'keys' içindeki siparişlerin satırlarını yamalar (model reset yok):
+          - hâlâ görünür → aynı satırda yeni nesne (dataChanged)
+          - artık görünmez → satır silinir
+          - listede olmayıp görünür → sona eklenir
+        Seçim ve kaydırma konumu korunur.
+        """
+        present: set = set()
+        for row in range(len(self._orders) - 1, -1, -1):
+            key = key_fn(self._orders[row])
+            if key not in keys:
+                continue
+            present.add(key)
+
+            fresh = visible_by_key.get(key)
+            if fresh is None:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._orders[row]
+                self._display_cache.clear()
+                self.endRemoveRows()
+            else:
+                self._orders[row] = fresh
+                self._display_cache.pop(row, None)
+                idx = self.index(row, 0)
+                self.dataChanged.emit(idx, idx, [])
+
+        added = [o for k, o in visible_by_key.items() if k not in present]
+        if added:
+            start = len(self._orders)
+            self.beginInsertRows(QModelIndex(), start, start + len(added) - 1)
+            self._orders.extend(added)
+            self.endInsertRows()
+
+    def _display(self, row: int) -> dict:
+        display = self._display_cache.get(row)
+        if display is None:
+            display = format_order_summary(self._orders[row])
+            self._display_cache[row] = display
+        return display
+
+    # --------------------------------------------------------
+    # 🧩 QAbstractListModel
+    # --------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._orders)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return (
+            Qt.ItemFlag.ItemIsEnabled
+            | Qt.ItemFlag.ItemIsSelectable
+            | Qt.ItemFlag.ItemIsUserCheckable
+        )
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._orders):
+            return None
+
+        row = index.row()
+        if role == self.OrderRole:
+            return self._orders[row]
+        if role == Qt.ItemDataRole.CheckStateRole:
+            selected = getattr(self._orders[row], "_selected", False)
+            return Qt.CheckState.Checked if selected else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._display(row)["title"]
+        if role == SmartListItemDelegate.SubtitleRole:
+            return self._display(row)["subtitle"]
+        if role == SmartListItemDelegate.ExtraRole:
+            return self._display(row)["extra"]
+        if role == SmartListItemDelegate.IconPathRole:
+            return self._display(row)["logo_path"]
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self._display(row)["extra"]
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole or not index.isValid():
+            return False
+        setattr(self._orders[index.row()], "_selected", SmartListItemDelegate.is_checked(value))
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+
+class OrdersListWidget(QListView):
+    """
+    Siparişleri göstermek için sanallaştırılmış liste (model/view).
     - Gösterildiğinde kendini otomatik yükler.
     - Sinyal geldiğinde yeniden yükler.
     - Filtreli sonuçları kendisi uygular.
-    - Sayfalama: page_size / current_page
+    - Sayfalama yok: tüm filtreli liste tek modelde, sadece görünen satırlar çizilir.
     - Seçimler model üzerinde tutulur: order._selected
     """
 
     # Seçim değişince dışarıya haber veriyoruz
     selection_changed = pyqtSignal()
+    # Diff tabanlı yama sonrası (satır eklendi / silindi / güncellendi)
+    rows_patched = pyqtSignal()
+
+    EMPTY_TEXT = "Gösterilecek sipariş bulunamadı."
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setSelectionMode(QListWidget.SelectionMode.NoSelection)
+        self.setSelectionMode(QListView.SelectionMode.SingleSelection)
+        self.setUniformItemSizes(True)  # satır yüksekliği tek kez ölçülür
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setMouseTracking(True)  # hover çizimi için
+
+        self._model = OrdersListModel(self)
+        self.setModel(self._model)
+        self.setItemDelegate(SmartListItemDelegate(self))
+        self._model.dataChanged.connect(self._on_model_data_changed)
 
         self.orders: list = []  # DB'den gelen RAW veri (tam liste)
         self.filtered_orders: list = []  # aktif filtre ile gelen sonuçlar (tam liste)
 
+        # 🗂 filter_orders index'i (self.orders'a bağlı; liste değişince yeniden kurulur)
+        self.filter_index = None
+
         # ⚡ Dahili durum filtresi:
         self.status_filter: str = "all"  # all | unprocessed | extracted | printed | both
 
-        # 🧾 Sayfalama
-        self.page_size: int = 20  # varsayılan: 20 kayıt/sayfa
-        self.current_page: int = 1  # 1-based
-
         # 🔧 Reload sonrası otomatik build yapalım mı?
         # OrdersManagerWindow bu flag'i False yapıyor; böylece ilk açılışta çift repaint olmaz.
         self.auto_build_on_reload: bool = True
 
-        # Siparişler değiştiğinde kendini yenile
-        order_signals.orders_changed.connect(self.reload_orders)
-
-    # --------------------------------------------------------
-    # 🧾 Sayfalama yardımcıları
-    # --------------------------------------------------------
-    def get_total_pages(self) -> int:
-        total = len(self.filtered_orders or [])
-        if total <= 0:
-            return 1
-        return (total + self.page_size - 1) // self.page_size
-
-    def set_page_size(self, size: int):
-        """Sayfa başına gösterilecek kayıt sayısı."""
-        if size <= 0:
-            return
-        self.page_size = size
-        self.current_page = 1
-        self._safe_build(self.filtered_orders)
-
-    def go_to_page(self, page: int):
-        """Belirli sayfaya git."""
-        total_pages = self.get_total_pages()
-        if page < 1:
-            page = 1
-        if page > total_pages:
-            page = total_pages
-        self.current_page = page
-        self._safe_build(self.filtered_orders)
+        # 🎚 Dış filtrenin (metin / kargo / tarih) yamalanan siparişlere uygulanışı.
+        # OrdersManagerWindow bağlar; None → dış filtre yok.
+        self.row_filter = None
 
-    def next_page(self):
-        self.go_to_page(self.current_page + 1)
+        # Siparişler değiştiğinde sadece değişenleri yamala (anahtar yoksa tam yenile)
+        order_signals.orders_changed.connect(self.on_orders_changed)
+        # Sadece bayrak değişimi → DB'ye gitmeden yerinde güncelle
+        order_signals.orders_flags_changed.connect(self.apply_order_flags)
 
-    def prev_page(self):
-        self.go_to_page(self.current_page - 1)
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._model.rowCount() == 0:
+            painter = QPainter(self.viewport())
+            painter.setPen(QColor("#6B7280"))
+            painter.drawText(self.viewport().rect(), Qt.AlignmentFlag.AlignCenter, self.EMPTY_TEXT)
+            painter.end()
 
     # ============================================================
     # 🔄 Yaşam Döngüsü
@@ -185,8 +301,10 @@ class OrdersListWidget(QListWidget):
                 MessageHandler.show(self, result, only_errors=True)
                 return
 
-            # RAW veriyi al
+            # RAW veriyi al (seçimler anahtar üzerinden yeni nesnelere taşınır)
+            previous = self.orders
             self.orders = result.data.get("records", []) or []
+            self._carry_selection(previous, self.orders)
 
             # Epoch tarihleri normalize et
             self._normalize_epoch_dates(self.orders)
@@ -194,9 +312,6 @@ class OrdersListWidget(QListWidget):
             # reload sonrasında dış filtrelerin base'i: tüm siparişler
             self.filtered_orders = list(self.orders)
 
-            # default sayfa
-            self.current_page = 1
-
             # 🔧 Bu widget için auto_build açıksa hemen build et,
             # kapalıysa sadece sinyal at, OrdersManagerWindow kendi filtresiyle build edecek.
             if getattr(self, "auto_build_on_reload", True):
@@ -208,6 +323,110 @@ class OrdersListWidget(QListWidget):
         self.reload_worker.result_ready.connect(handle_reload_result)
         self.reload_worker.start()
 
+    # ============================================================
+    # 🩹 Diff tabanlı yama (orders_changed)
+    # ============================================================
+    @staticmethod
+    def _order_key(order) -> tuple:
+        return str(getattr(order, "orderNumber", "")), getattr(order, "api_account_id", None)
+
+    def _carry_selection(self, old_orders: list, new_orders: list):
+        selected = {self._order_key(o) for o in old_orders or [] if getattr(o, "_selected", False)}
+        if not selected:
+            return
+        for o in new_orders:
+            if self._order_key(o) in selected:
+                setattr(o, "_selected", True)
+
+    def on_orders_changed(self, order_keys: list):
+        """
+        Değişen sipariş anahtarları geldiyse sadece onları DB'den çekip yamalar.
+        Anahtar yoksa (bilinmiyor) veya liste hiç yüklenmemişse tam yenileme.
+        """
+        keys = [(str(no), acc) for no, acc in order_keys or [] if no and acc is not None]
+        if not keys or not self.orders:
+            self.reload_orders()
+            return
+
+        self.patch_worker = SyncWorker(load_ready_to_ship_orders, keys)
+
+        def handle_patch_result(result: Result):
+            if not result.success:
+                MessageHandler.show(self, result, only_errors=True)
+                return
+            self.patch_orders(keys, result.data.get("records", []) or [])
+
+        self.patch_worker.result_ready.connect(handle_patch_result)
+        self.patch_worker.start()
+
+    def patch_orders(self, order_keys: list, fresh_orders: list):
+        """
+        order_keys: değişen siparişler; fresh_orders: bunların güncel ReadyToShip hali.
+        fresh_orders'ta olmayan anahtar → artık ReadyToShip değil → listeden çıkar.
+        """
+        keys = {(str(no), acc) for no, acc in order_keys or []}
+        if not keys:
+            return
+
+        fresh_by_key = {self._order_key(o): o for o in fresh_orders or []}
+        self._normalize_epoch_dates(list(fresh_by_key.values()))
+
+        old_by_key = {k: o for o in self.orders if (k := self._order_key(o)) in keys}
+        self._carry_selection(list(old_by_key.values()), list(fresh_by_key.values()))
+
+        # RAW liste: yerinde değiştir / çıkar, yenileri sona ekle
+        merged = []
+        for o in self.orders:
+            k = self._order_key(o)
+            if k not in keys:
+                merged.append(o)
+            elif k in fresh_by_key:
+                merged.append(fresh_by_key[k])
+        merged.extend(o for k, o in fresh_by_key.items() if k not in old_by_key)
+        self.orders = merged
+
+        self._patch_visible_rows(keys, list(fresh_by_key.values()))
+
+    def _patch_visible_rows(self, keys: set, candidates: list):
+        """Aday siparişlere aktif filtreleri uygular, sadece ilgili satırları yamalar."""
+        visible = list(candidates)
+        if self.row_filter is not None:
+            visible = self.row_filter(visible)
+        visible = self._apply_internal_status_filter(visible)
+
+        self._model.patch_orders(
+            keys,
+            {self._order_key(o): o for o in visible},
+            self._order_key,
+        )
+        self.filtered_orders = list(self._model.orders())
+        self.rows_patched.emit()
+
+    # ============================================================
+    # 🏷 Bayrak güncellemesi (is_extracted / is_printed)
+    # ============================================================
+    def apply_order_flags(self, order_keys: list, fields: dict):
+        """
+        mark_orders_processed sonrası: yüklü siparişlerde sadece ilgili
+        kayıtların bayraklarını günceller; sadece o satırlar filtreden geçirilir.
+        """
+        keys = {(str(no), acc) for no, acc in order_keys or []}
+        if not keys or not self.orders:
+            return
+
+        hits = [o for o in self.orders if self._order_key(o) in keys]
+        if not hits:
+            return
+
+        for o in hits:
+            for k, v in (fields or {}).items():
+                object.__setattr__(o, k, v)
+        self._normalize_epoch_dates(hits)
+        self._patch_visible_rows(keys, hits)
+
+        # liste aynı ama pending/processed kovaları değişti (FTS isabetleri yama sırasında kullanıldı)
+        self.filter_index = None
+
     # ============================================================
     # 🎚 DIŞTAN GELEN FİLTRE
     # ============================================================
@@ -218,7 +437,6 @@ class OrdersListWidget(QListWidget):
         """
         # Dış filtre sonucu bizim base listemiz olsun
         self.filtered_orders = list(filtered_orders or [])
-        self.current_page = 1
         self.set_status_filter(self.status_filter)
 
     # ============================================================
@@ -234,9 +452,6 @@ class OrdersListWidget(QListWidget):
         base = list(self.filtered_orders or [])
         final = self._apply_internal_status_filter(base)
         self.filtered_orders = final
-
-        # filtre değişince başa dön
-        self.current_page = 1
         self._safe_build(self.filtered_orders)
 
     def _apply_internal_status_filter(self, orders: list):
@@ -273,136 +488,48 @@ class OrdersListWidget(QListWidget):
         return result
 
     # ============================================================
-    # 🧰 Listeyi İnşa Et (Sayfalama + Seçim Sync)
+    # 🧰 Listeyi İnşa Et (model reset)
     # ============================================================
     def _safe_build(self, orders: list):
         """
-        'orders' = TAM filtreli liste.
-        Buradan sadece current_page / page_size kadarını render ederiz.
-        Seçimler order._selected üzerinden tutulur, UI ile sync edilir.
+        'orders' = TAM filtreli liste; modele tek seferde verilir.
+        Seçimler order._selected üzerinden okunur, ayrıca sync gerekmez.
         """
         try:
-            all_orders = list(orders or [])
-            total = len(all_orders)
-
-            # UI repaint yükünü azalt
-            self.setUpdatesEnabled(False)
-
-            # Eski widget'ları temizle
-            for i in range(self.count()):
-                widget = self.itemWidget(self.item(i))
-                if widget:
-                    widget.deleteLater()
-            self.clear()
-
-            if total == 0:
-                self.setUpdatesEnabled(True)
-                self.viewport().update()
-                return
-
-            # Sayfalama hesapları
-            page_size = max(1, int(getattr(self, "page_size", 20)))
-            total_pages = (total + page_size - 1) // page_size
-
-            if self.current_page < 1:
-                self.current_page = 1
-            if self.current_page > total_pages:
-                self.current_page = total_pages
-
-            start_idx = (self.current_page - 1) * page_size
-            end_idx = start_idx + page_size
-            show_list = all_orders[start_idx:end_idx]
-
-            result = build_order_list(
-                self,
-                show_list,
-                self.on_item_interaction,
-                self.clear_other_selections
-            )
-
+            result = build_order_list(self, orders)
             if not result.success:
-                self.setUpdatesEnabled(True)
-                self.viewport().update()
                 MessageHandler.show(self, result, only_errors=True)
                 return
-
-            # 🔁 UI'yi modeldeki seçime göre güncelle
-            for row, order in enumerate(show_list):
-                if getattr(order, "_selected", False):
-                    item = self.item(row)
-                    if not item:
-                        continue
-                    widget = self.itemWidget(item)
-                    if widget and hasattr(widget, "right_widget"):
-                        try:
-                            widget.right_widget.blockSignals(True)
-                            widget.right_widget.setChecked(True)
-                        finally:
-                            widget.right_widget.blockSignals(False)
-
-            self.setUpdatesEnabled(True)
-            self.viewport().update()
+            self.scrollToTop()
 
         except Exception as e:
-            self.setUpdatesEnabled(True)
-            self.viewport().update()
             msg = map_error_to_message(e)
             MessageHandler.show(self, Result.fail(msg, error=e), only_errors=True)
 
     # ============================================================
     # 🎯 Event Callbacks
     # ============================================================
-    def on_item_interaction(self, identifier, value: bool):
-        """
-        Toggle değiştiğinde seçim durumunu model üzerinde güncelle.
-        Mevcut sayfadaki tüm widget'ları okuyup filtered_orders içindeki ilgili kayda yansıtıyoruz.
-        """
-        all_orders = list(self.filtered_orders or [])
-        total = len(all_orders)
-        if total == 0:
+    def _on_model_data_changed(self, top_left, bottom_right, roles=None):
+        """Toggle (CheckStateRole) değişince dışarıya "seçim değişti" diye haber ver."""
+        if not roles or Qt.ItemDataRole.CheckStateRole in roles:
             self.selection_changed.emit()
-            return
-
-        page_size = max(1, int(getattr(self, "page_size", 20)))
-        total_pages = (total + page_size - 1) // page_size
-        if self.current_page < 1:
-            self.current_page = 1
-        if self.current_page > total_pages:
-            self.current_page = total_pages
-
-        start_idx = (self.current_page - 1) * page_size
-        end_idx = min(start_idx + page_size, total)
-
-        for row, idx in enumerate(range(start_idx, end_idx)):
-            order = all_orders[idx]
-            item = self.item(row)
-            if not item:
-                continue
-            widget = self.itemWidget(item)
-            if widget and hasattr(widget, "right_widget"):
-                checked = bool(widget.right_widget.isChecked())
-                setattr(order, "_selected", checked)
-
-        # Dışarıya "seçim değişti" diye haber ver
-        self.selection_changed.emit()
 
-    def clear_other_selections(self, keep_widget):
-        """Tek seçim modu için dursun, şu an kullanılmıyor."""
-        for i in range(self.count()):
-            widget = self.itemWidget(self.item(i))
-            if widget is not keep_widget and hasattr(widget, "set_selected"):
-                widget.set_selected(False)
+    def set_all_selected(self, selected: bool):
+        """Tüm filtreli siparişlerin seçimini değiştirir, tek repaint."""
+        for o in (self.filtered_orders or []):
+            setattr(o, "_selected", bool(selected))
+        self._model.notify_all_changed([Qt.ItemDataRole.CheckStateRole])
 
     def get_selected_orders(self) -> list:
         """
         Seçili siparişleri döndür.
-        - Tüm sayfalar / tüm filtreli liste üzerinden bakar.
+        - Tüm filtreli liste üzerinden bakar (görünür olmayan satırlar dahil).
         """
         return [o for o in (self.filtered_orders or []) if getattr(o, "_selected", False)]
 
 
 # ============================================================
-# 🔹 2. OrdersManagerWindow — Filtreleme + Sayfalama Penceresi
+# 🔹 2. OrdersManagerWindow — Filtreleme Penceresi
 # ============================================================
 
 class OrdersManagerWindow(QWidget):
@@ -426,7 +553,7 @@ class OrdersManagerWindow(QWidget):
         # === ANA LAYOUT YATAY ===
         main_layout = QHBoxLayout(self)
 
-        # SOL PANEL: filtreler + liste + sayaç + toplu seçim + sayfalama
+        # SOL PANEL: filtreler + liste + sayaç + toplu seçim
         left_panel = QVBoxLayout()
         main_layout.addLayout(left_panel, stretch=1)
 
@@ -469,8 +596,11 @@ class OrdersManagerWindow(QWidget):
         self.list_widget = OrdersListWidget(self)
         # İlk açılışta gereksiz çift repaint olmasın:
         self.list_widget.auto_build_on_reload = False
-        # Seçim değişince label + buton + sayfalama güncelle
+        # Seçim değişince label + buton güncelle
         self.list_widget.selection_changed.connect(self._on_selection_changed)
+        # Diff yamalarında da aynı filtreler geçerli olsun; yama sonrası kargo + label
+        self.list_widget.row_filter = self._filter_rows
+        self.list_widget.rows_patched.connect(self._on_rows_patched)
 
         # ============================================================
         # 🔍 Filtre Paneli
@@ -480,7 +610,7 @@ class OrdersManagerWindow(QWidget):
         filter_layout = QGridLayout(filter_box)
 
         self.global_search = QLineEdit()
-        self.global_search.setPlaceholderText("Genel Ara (müşteri, ürün, sipariş no, kargo...)")
+        self.global_search.setPlaceholderText("Genel Ara (müşteri, adres, ürün, barkod, sipariş no, takip no...)")
 
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Sipariş No Ara...")
@@ -581,41 +711,12 @@ class OrdersManagerWindow(QWidget):
         self.selected_count_label = QLabel("Seçili: 0 / Toplam: 0 (Filtreli: 0)")
         left_panel.addWidget(self.selected_count_label)
 
-        # ============================================================
-        # 📑 Sayfalama Paneli
-        # ============================================================
-        pagination_box = QGroupBox("Sayfalama")
-        pagination_box.setObjectName("SectionCard")
-        pagination_layout = QHBoxLayout(pagination_box)
-
-        self.prev_page_btn = QPushButton("◀")
-        self.next_page_btn = QPushButton("▶")
-        self.pagination_label = QLabel("Sayfa 0/1 | Toplam: 0 kayıt")
-
-        self.page_size_box = QComboBox()
-        self.page_size_box.addItems(["20", "50", "100"])
-        self.page_size_box.setCurrentText("20")
-
-        self.prev_page_btn.clicked.connect(self._on_prev_page)
-        self.next_page_btn.clicked.connect(self._on_next_page)
-        self.page_size_box.currentTextChanged.connect(self._on_page_size_changed)
-
-        pagination_layout.addWidget(self.prev_page_btn)
-        pagination_layout.addWidget(self.next_page_btn)
-        pagination_layout.addWidget(self.pagination_label)
-        pagination_layout.addStretch()
-        pagination_layout.addWidget(QLabel("Sayfa başına:"))
-        pagination_layout.addWidget(self.page_size_box)
-
-        left_panel.addWidget(pagination_box)
-
         # ============================================================
         # 🚚 Sipariş Yüklendiğinde
         # ============================================================
         order_signals.orders_loaded.connect(self._refresh_cargo_filter)
         order_signals.orders_loaded.connect(self._update_label)
         order_signals.orders_loaded.connect(self._update_action_button_state)
-        order_signals.orders_loaded.connect(lambda _orders: self._update_pagination_ui())
 
         # Sipariş her yüklendiğinde filtreyi otomatik uygula
         order_signals.orders_loaded.connect(lambda _orders: self._trigger_debounce())
@@ -717,7 +818,10 @@ class OrdersManagerWindow(QWidget):
     # ============================================================
     def _on_selection_changed(self):
         self._update_label()
-        self._update_pagination_ui()
+
+    def _on_rows_patched(self):
+        self._refresh_cargo_filter()
+        self._update_label()
 
     # ============================================================
     # 🔁 Butonun aktif/pasif olması (seçime göre)
@@ -740,46 +844,6 @@ class OrdersManagerWindow(QWidget):
         self.label_window.raise_()
         self.label_window.activateWindow()
 
-    # ============================================================
-    # 📑 Sayfalama UI Güncelleme
-    # ============================================================
-    def _update_pagination_ui(self):
-        total = len(self.list_widget.filtered_orders or [])
-        page_size = getattr(self.list_widget, "page_size", 20)
-
-        if total == 0:
-            total_pages = 1
-            current = 0
-        else:
-            total_pages = (total + page_size - 1) // page_size
-            current = getattr(self.list_widget, "current_page", 1)
-
-        self.pagination_label.setText(
-            f"Sayfa {current}/{total_pages} | Toplam: {total} kayıt"
-        )
-
-        self.prev_page_btn.setEnabled(current > 1)
-        self.next_page_btn.setEnabled(current < total_pages)
-
-    def _on_page_size_changed(self, text: str):
-        try:
-            size = int(text)
-        except ValueError:
-            size = 20
-        self.list_widget.set_page_size(size)
-        self._update_label()
-        self._update_pagination_ui()
-
-    def _on_prev_page(self):
-        self.list_widget.prev_page()
-        self._update_label()
-        self._update_pagination_ui()
-
-    def _on_next_page(self):
-        self.list_widget.next_page()
-        self._update_label()
-        self._update_pagination_ui()
-
     # ============================================================
     # Yardımcılar (filtre + label)
     # ============================================================
@@ -796,26 +860,45 @@ class OrdersManagerWindow(QWidget):
     def _trigger_debounce(self):
         self.filter_timer.start(350)
 
+    def _current_filters(self) -> dict:
+        return {
+            "global": self.global_search.text().strip(),
+            "order_no": self.search_input.text().strip(),
+            "cargo": self.cargo_filter.currentText(),
+            "customer": self.customer_input.text().strip(),
+            "date_enabled": self.date_filter_enable.isChecked(),
+            "date_from": self.date_from.date().toPyDate(),
+            "date_to": self.date_to.date().toPyDate(),
+            "processed_mode": self.processed_filter.currentData() or "pending",
+            "full_text": True,  # genel aramaya order_search (FTS5) sonuçlarını da kat
+        }
+
+    def _filter_rows(self, orders: list) -> list:
+        """
+        Yamalanan birkaç siparişe aktif filtreleri senkron uygular.
+        GUI thread'inde FTS5 sorgusu yapılmaz; son filtre çalışmasının isabetleri kullanılır.
+        """
+        index = self.list_widget.filter_index
+        filters = self._current_filters()
+        filters["full_text"] = False
+        filters["full_text_hits"] = index.fts_hits if index is not None else {}
+
+        res = filter_orders(orders, filters)
+        if not res.success:
+            MessageHandler.show(self, res, only_errors=True)
+            return list(orders)
+        return res.data.get("filtered", [])
+
     def apply_filters(self):
         try:
-            filters = {
-                "global": self.global_search.text().strip(),
-                "order_no": self.search_input.text().strip(),
-                "cargo": self.cargo_filter.currentText(),
-                "customer": self.customer_input.text().strip(),
-                "date_enabled": self.date_filter_enable.isChecked(),
-                "date_from": self.date_from.date().toPyDate(),
-                "date_to": self.date_to.date().toPyDate(),
-                "processed_mode": self.processed_filter.currentData() or "pending",
-            }
+            filters = self._current_filters()
 
             self.selected_count_label.setText("🔄 Filtre uygulanıyor...")
             self.filter_worker = start_filter_worker(self, self.list_widget, filters)
 
-            # Filtre bittiğinde label + sayfalama güncelle
+            # Filtre bittiğinde label güncelle
             def _after_filter(_res: Result):
                 self._update_label()
-                self._update_pagination_ui()
 
             self.filter_worker.result_ready.connect(_after_filter)
             self.filter_worker.start()
@@ -828,14 +911,9 @@ class OrdersManagerWindow(QWidget):
         selected = self.list_widget.get_selected_orders()
         total = len(self.list_widget.orders)
         filtered = len(self.list_widget.filtered_orders or [])
-        shown = self.list_widget.count()
-
-        extra = ""
-        if shown < filtered:
-            extra = f" | Gösterilen: {shown} (sayfa)"
 
         self.selected_count_label.setText(
-            f"Seçili: {len(selected)} / Toplam: {total} (Filtreli: {filtered}){extra}"
+            f"Seçili: {len(selected)} / Toplam: {total} (Filtreli: {filtered})"
         )
         self._update_action_button_state()
 
@@ -843,26 +921,16 @@ class OrdersManagerWindow(QWidget):
         """
         Tümünü Seç:
         - Tüm filtrelenmiş siparişlerde order._selected = True
-        - Tüm sayfalara yayılır (filtered_orders üzerinden).
+        - Görünmeyen satırlar dahil (filtered_orders üzerinden), model reset yok.
         """
-        for o in (self.list_widget.filtered_orders or []):
-            setattr(o, "_selected", True)
-
-        # Şu anki sayfayı yeniden çizip checkbox'ları güncelle
-        self.list_widget._safe_build(self.list_widget.filtered_orders)
-        self.list_widget.selection_changed.emit()
+        self.list_widget.set_all_selected(True)
 
     def deselect_all(self):
         """
         Seçimi Kaldır:
         - Tüm filtrelenmiş siparişlerin seçimini kaldırır.
         """
-        for o in (self.list_widget.filtered_orders or []):
-            if hasattr(o, "_selected"):
-                o._selected = False
-
-        self.list_widget._safe_build(self.list_widget.filtered_orders)
-        self.list_widget.selection_changed.emit()
+        self.list_widget.set_all_selected(False)
 
     def get_selected_orders(self):
         return self.list_widget.get_selected_orders()
@@ -1164,6 +1232,21 @@ class OrdersTab(QWidget):
             )
             self.lbl_status_hint.setText("Son durum: Hata alındı")
 
+    # ============================================================
+    # 🌊 DB kayıt akışı — ilerleme
+    # ============================================================
+    def on_db_save_progress(self, progress: dict):
+        """
+        DBSaveStream.progress: commit edilen chunk sayısını durum satırında gösterir.
+        Buton yüzdesi API aşamasına ait olduğu için ona dokunulmaz.
+        """
+        counts = progress.get("counts") or {}
+        self.lbl_status_hint.setText(
+            f"Son durum: Kaydediliyor ({progress.get('chunks_done', 0)}/"
+            f"{progress.get('chunks_sent', 0)} paket, "
+            f"{counts.get('data_inserted', 0)} yeni kayıt)"
+        )
+
     # ============================================================
     # ⚠️ Worker Callback — Hata Durumu
     # ============================================================
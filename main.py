@@ -3,25 +3,38 @@ from __future__ import annotations
 
 import sys
 
-from sqlmodel import SQLModel
-from Core.utils.model_utils import get_engine
-
-# License modelleri metadata'ya dahil olsun diye import (kullanmıyoruz ama create_all için şart)
-from License.models import LicenseActionLog, LocalLicenseState, FreemiusEventLog  # noqa: F401
-from Account.models import *
-from Orders.models.trendyol.trendyol_models import *
+from Core.utils.model_utils import dispose_engines
 
 
 
 def _run_db_save_worker_mode() -> None:
     """
-    Aynı EXE içerisinden ayrı process worker mode.
-    GUI açılmaz. stdin'den JSON alır, stdout'a JSON basar.
+    Aynı EXE içerisinden ayrı, kalıcı process worker mode.
+    GUI açılmaz. stdin'den satır satır JSON istek alır, stdout'a satır satır JSON cevap basar.
+    stdin kapanınca çıkar.
     """
     from Orders.processors.db_save_worker import main as worker_main
     worker_main()
 
 
+def _run_profile_startup_mode() -> int:
+    """
+    --profile-startup: ilk pencere gösterilene kadar geçen süreyi aşama aşama
+    ve (geliştirme ortamında) -X importtime ile modül başına raporlar.
+    Pencere ilk event loop turunda kapanır.
+    """
+    from Core.utils.startup_profiler import PhaseTimer, run_with_importtime
+
+    code = run_with_importtime(__file__, ["--profile-startup"])
+    if code is not None:
+        return code
+
+    timer = PhaseTimer()
+    code = _start_gui(timer)
+    print(timer.report())
+    return code
+
+
 def _cli_router() -> bool:
     """
     True dönerse program GUI açmadan çıkacak demektir.
@@ -29,31 +42,77 @@ def _cli_router() -> bool:
     if "--db-save-worker" in sys.argv:
         _run_db_save_worker_mode()
         return True
+    if "--profile-startup" in sys.argv:
+        raise SystemExit(_run_profile_startup_mode())
     return False
 
 
 def _bootstrap_db() -> None:
     """
-    DB tablolarını hazırlar. Worker modda da lazım olabilir.
+    DB şemasını hazırlar. PRAGMA user_version güncelse DDL çalışmaz.
+    Worker mod bunu çağırmaz (GUI açılışta şemayı hazırlamış olur).
     """
-    SQLModel.metadata.create_all(get_engine("orders.db"))
+    from sqlmodel import SQLModel
+    from Core.utils.migration_utils import ensure_schema
+    from Orders.models.trendyol.trendyol_migrations import ORDER_MIGRATIONS
 
+    # Modeller metadata'ya dahil olsun diye import (create_all için şart)
+    from License.models import LicenseActionLog, LocalLicenseState, FreemiusEventLog  # noqa: F401
+    from Account.models import ApiAccount  # noqa: F401
+    from Orders.models.trendyol import trendyol_models  # noqa: F401
 
-def main() -> int:
-    # 1) CLI router (GUI öncesi!)
-    if _cli_router():
-        return 0
+    res = ensure_schema(SQLModel.metadata, ORDER_MIGRATIONS, "orders.db")
+    if not res.success:
+        print(f"[bootstrap] şema hazırlanamadı: {res.message}")
+
+
+def _start_gui(timer=None) -> int:
+    """
+    timer verilirse (PhaseTimer) aşamalar ölçülür ve ilk event loop turunda çıkılır.
+    """
+    def mark(name: str):
+        if timer is not None:
+            timer.mark(name)
 
-    # 2) Normal GUI flow
     _bootstrap_db()
+    mark("DB bootstrap")
 
     from PyQt6.QtWidgets import QApplication
+    mark("PyQt6 import")
+
     from Main_interface.views import MainInterface
+    mark("UI modülleri import")
 
     app = QApplication(sys.argv)
+    mark("QApplication")
+
     window = MainInterface()
+    mark("MainInterface()")
+
     window.show()
-    return app.exec()
+    if timer is not None:
+        from PyQt6.QtCore import QTimer
+
+        def _first_frame():
+            mark("show + ilk event loop turu")
+            app.quit()
+
+        QTimer.singleShot(0, _first_frame)
+
+    code = app.exec()
+
+    # WAL checkpoint + havuz kapatma
+    dispose_engines()
+    return code
+
+
+def main() -> int:
+    # 1) CLI router (GUI öncesi!)
+    if _cli_router():
+        return 0
+
+    # 2) Normal GUI flow
+    return _start_gui()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,32 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+import pytest
+
+# Proje kökü (settings, Core, Orders ...) import yolunda olsun
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def orders_db(tmp_path):
+    """
+    Geçici orders.db: create_all + ORDER_MIGRATIONS (ensure_schema).
+    get_engine db_name'i DEFAULT_DATABASE_DIR'e ekler; mutlak yol olduğu için tmp_path'e düşer.
+    """
+    from sqlmodel import SQLModel
+    from Core.utils.migration_utils import ensure_schema
+    from Core.utils.model_utils import dispose_engines
+    from Account.models import ApiAccount  # noqa: F401  (FK hedefi metadata'da olsun)
+    from Orders.models.trendyol import trendyol_models  # noqa: F401
+    from Orders.models.trendyol.trendyol_migrations import ORDER_MIGRATIONS
+
+    db_name = str(tmp_path / "orders.db")
+    res = ensure_schema(SQLModel.metadata, ORDER_MIGRATIONS, db_name)
+    assert res.success, res.message
+
+    yield db_name
+
+    dispose_engines(checkpoint=False)
@@ -0,0 +1,63 @@
+# tests/test_query_plans.py
+# Sıcak sorguların EXPLAIN QUERY PLAN'ı hedeflenen index'i kullanıyor mu?
+from sqlalchemy import bindparam, text, tuple_
+from sqlalchemy.dialects import sqlite
+from sqlmodel import select
+
+from Core.utils.migration_utils import explain_query_plan
+from Orders.models.trendyol.trendyol_custom_queries import latest_ready_to_ship_query
+from Orders.models.trendyol.trendyol_models import OrderData, OrderHeader, OrderItem
+from Orders.processors.trendyol_pipeline import _ORDER_LATEST_UPSERT_SQL
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def _uses_index(plan: list[str], index_name: str) -> bool:
+    return any(index_name in detail for detail in plan)
+
+
+def test_known_snapshot_lookup_uses_unique_index(orders_db):
+    # load_known_snapshot_keys
+    key_cols = tuple_(OrderData.orderNumber, OrderData.lastModifiedDate, OrderData.api_account_id)
+    stmt = (
+        select(OrderData.orderNumber, OrderData.api_account_id, OrderData.lastModifiedDate)
+        .where(key_cols.in_([("100", 1700000000000, 1), ("101", 1700000000001, 1)]))
+    )
+    plan = explain_query_plan(_sql(stmt), db_name=orders_db)
+    assert _uses_index(plan, "sqlite_autoindex_orderdata_1"), plan
+
+
+def test_header_pk_resolution_uses_unique_index(orders_db):
+    # _resolve_header_pks
+    key_cols = tuple_(OrderHeader.orderNumber, OrderHeader.api_account_id)
+    stmt = (
+        select(OrderHeader.orderNumber, OrderHeader.api_account_id, OrderHeader.pk)
+        .where(key_cols.in_([("100", 1), ("101", 2)]))
+    )
+    plan = explain_query_plan(_sql(stmt), db_name=orders_db)
+    assert _uses_index(plan, "sqlite_autoindex_orderheader_1"), plan
+
+
+def test_order_latest_upsert_uses_header_lastmod_index(orders_db):
+    # _upsert_order_latest (save_orders_to_db): header başına en son snapshot
+    stmt = text(_ORDER_LATEST_UPSERT_SQL).bindparams(
+        bindparam("header_ids", value=[1, 2, 3], expanding=True)
+    )
+    plan = explain_query_plan(_sql(stmt), db_name=orders_db)
+    assert _uses_index(plan, "ix_orderdata_header_lastmod"), plan
+
+
+def test_ready_to_ship_filter_runs_on_orderlatest(orders_db):
+    # get_latest_ready_to_ship_orders: statü filtresi orderlatest index'inde
+    plan = explain_query_plan(_sql(latest_ready_to_ship_query()), db_name=orders_db)
+    assert _uses_index(plan, "ix_orderlatest_shipmentPackageStatus"), plan
+    assert not any("SCAN" in d and "orderdata" in d.lower() for d in plan), plan
+
+
+def test_latest_items_lookup_uses_header_index(orders_db):
+    # _load_latest_items
+    stmt = select(OrderItem).where(OrderItem.order_header_id.in_([1, 2, 3])).order_by(OrderItem.pk)
+    plan = explain_query_plan(_sql(stmt), db_name=orders_db)
+    assert _uses_index(plan, "ix_orderitem_order_header_id"), plan